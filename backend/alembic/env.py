@@ -13,6 +13,8 @@ from app.modules.questions.models import Question, Answer  # noqa: F401
 from app.modules.result.models import UserResult  # noqa: F401
 from app.modules.ai_feedback.models import AIFeedback  # noqa: F401
 from app.modules.system_feedback.models import SystemFeedback  # noqa: F401
+from app.modules.analytics.models import AnalyticsRollupState  # noqa: F401
+from app.shared.job_store import BackgroundJob  # noqa: F401
 
 # Load Alembic configuration and set up logging
 config = context.config
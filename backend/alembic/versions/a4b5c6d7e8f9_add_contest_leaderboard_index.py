@@ -0,0 +1,43 @@
+"""materialize contest scores on participants for an indexed leaderboard
+
+Revision ID: a4b5c6d7e8f9
+Revises: f3a4b5c6d7e8
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4b5c6d7e8f9"
+down_revision: Union[str, Sequence[str], None] = "f3a4b5c6d7e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("contest_participants", sa.Column("score", sa.Float(), nullable=True))
+    op.add_column("contest_participants", sa.Column("completed_at", sa.DateTime(), nullable=True))
+    op.execute(
+        """
+        UPDATE contest_participants AS cp
+        SET score = COALESCE(ur.score, 0), completed_at = ur.completed_at
+        FROM user_results AS ur
+        WHERE cp.result_id = ur.result_id
+        """
+    )
+    op.create_index(
+        "ix_contest_participants_leaderboard",
+        "contest_participants",
+        ["contest_id", sa.text("score DESC"), "completed_at", "joined_at", "user_id"],
+        postgresql_where=sa.text("score IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contest_participants_leaderboard", table_name="contest_participants")
+    op.drop_column("contest_participants", "completed_at")
+    op.drop_column("contest_participants", "score")
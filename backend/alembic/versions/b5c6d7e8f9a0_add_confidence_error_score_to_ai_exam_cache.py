@@ -0,0 +1,51 @@
+"""store ai_exam_cache confidence_error_score as a column for SQL analytics
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5c6d7e8f9a0"
+down_revision: Union[str, Sequence[str], None] = "a4b5c6d7e8f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("ai_exam_cache", sa.Column("confidence_error_score", sa.Float(), nullable=True))
+    op.create_index("ix_user_results_completed_at", "user_results", ["completed_at"])
+
+    # Backfill in the database: payloads are never loaded into the migration.
+    # Malformed JSON or a non-numeric score yields NULL, like
+    # app.modules.ai_exam.models.extract_confidence_error_score.
+    op.execute(
+        """
+        CREATE FUNCTION pg_temp.confidence_error_score(payload text) RETURNS double precision AS $$
+        BEGIN
+            RETURN (payload::jsonb ->> 'confidence_error_score')::double precision;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql IMMUTABLE
+        """
+    )
+    op.execute(
+        """
+        UPDATE ai_exam_cache
+        SET confidence_error_score = pg_temp.confidence_error_score(result_json)
+        WHERE result_json IS NOT NULL AND result_json LIKE '%confidence_error_score%'
+        """
+    )
+    op.execute("DROP FUNCTION pg_temp.confidence_error_score(text)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_results_completed_at", table_name="user_results")
+    op.drop_column("ai_exam_cache", "confidence_error_score")
@@ -0,0 +1,62 @@
+"""add daily analytics rollup tables
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6d7e8f9a0b1"
+down_revision: Union[str, Sequence[str], None] = "b5c6d7e8f9a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the first refresh (Celery beat or `manage.py refresh-analytics`);
+    # until then the overview is computed from the raw tables.
+    op.create_table(
+        "analytics_daily_levels",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("level", sa.String(length=8), nullable=False),
+        sa.Column("exams_published", sa.Integer(), nullable=False),
+        sa.Column("exams_unpublished", sa.Integer(), nullable=False),
+        sa.Column("takes", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "level"),
+    )
+    op.create_table(
+        "analytics_daily_ratings",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("source", sa.String(length=8), nullable=False),
+        sa.Column("rating_score", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "source", "rating_score"),
+    )
+    op.create_table(
+        "analytics_daily_quality",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("confidence_error_sum", sa.Float(), nullable=False),
+        sa.Column("confidence_error_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+    op.create_table(
+        "analytics_rollup_state",
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.Column("rolled_through", sa.Date(), nullable=False),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_rollup_state")
+    op.drop_table("analytics_daily_quality")
+    op.drop_table("analytics_daily_ratings")
+    op.drop_table("analytics_daily_levels")
@@ -0,0 +1,62 @@
+"""add derived jlpt_level to exams for question-bank filtering
+
+Revision ID: f3a4b5c6d7e8
+Revises: e2f3a4b5c6d7
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a4b5c6d7e8"
+down_revision: Union[str, Sequence[str], None] = "e2f3a4b5c6d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same rule as app.modules.exam.models.detect_jlpt_level, frozen for this revision.
+JLPT_LEVEL_PATTERN = re.compile(r"(?<![A-Z0-9])\[?(N[1-5])\]?(?![A-Z0-9])", re.IGNORECASE)
+
+
+def _detect_level(title, description):
+    for text in (title, description):
+        match = JLPT_LEVEL_PATTERN.search(text or "")
+        if match:
+            return match.group(1).upper()
+    return None
+
+
+def upgrade() -> None:
+    op.add_column("exams", sa.Column("jlpt_level", sa.String(2), nullable=True))
+    op.create_index("ix_exams_jlpt_level", "exams", ["jlpt_level"])
+    op.create_index("ix_questions_exam_id_mondai_group", "questions", ["exam_id", "mondai_group"])
+
+    exams = sa.table(
+        "exams",
+        sa.column("exam_id"),
+        sa.column("title", sa.String),
+        sa.column("description", sa.Text),
+        sa.column("jlpt_level", sa.String),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(exams.c.exam_id, exams.c.title, exams.c.description)).all()
+    levels = [
+        {"id": row.exam_id, "level": level}
+        for row in rows
+        if (level := _detect_level(row.title, row.description)) is not None
+    ]
+    if levels:
+        bind.execute(
+            exams.update().where(exams.c.exam_id == sa.bindparam("id")).values(jlpt_level=sa.bindparam("level")),
+            levels,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_questions_exam_id_mondai_group", table_name="questions")
+    op.drop_index("ix_exams_jlpt_level", table_name="exams")
+    op.drop_column("exams", "jlpt_level")
@@ -11,7 +11,7 @@ celery_app = Celery(
     "pbl5_japanese_audio",
     broker=broker_url,
     backend=result_backend,
-    include=["app.modules.ai_exam.tasks"],
+    include=["app.modules.ai_exam.tasks", "app.modules.test.tasks", "app.modules.analytics.tasks"],
 )
 
 celery_app.conf.update(
@@ -22,4 +22,11 @@ celery_app.conf.update(
     timezone="Asia/Ho_Chi_Minh",
     enable_utc=False,
     task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    # Needs a beat process: celery -A app.core.celery_app beat
+    beat_schedule={
+        "refresh-analytics-rollups": {
+            "task": "app.modules.analytics.refresh_rollups",
+            "schedule": settings.ANALYTICS_ROLLUP_INTERVAL_SECONDS,
+        },
+    },
 )
@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from functools import lru_cache
 from typing import Optional, List
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
@@ -23,6 +24,7 @@ class Settings(BaseSettings):
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000"]
     API_PREFIX: str = "/api"
     FRONTEND_URL: str = "http://localhost:5173"
+    PUBLIC_API_URL: Optional[str] = None  # base of URLs the API hands out for its own files
 
     # Database settings
     DB_NAME: Optional[str] = None
@@ -67,6 +69,47 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: Optional[str] = os.getenv("CELERY_BROKER_URL")
     CELERY_RESULT_BACKEND: Optional[str] = os.getenv("CELERY_RESULT_BACKEND")
     CELERY_TASK_ALWAYS_EAGER: bool = False
+    # Job progress events: "memory" (same process) or "redis" (separate Celery workers).
+    PROGRESS_CHANNEL_BACKEND: str = "memory"
+    # Background job status: "memory" (single API worker), "redis" or "postgres" (shared).
+    JOB_STORE_BACKEND: str = "memory"
+    JOB_STORE_TTL_SECONDS: int = 86400
+    JOB_STORE_MAX_ENTRIES: int = 2048
+
+    # AI exam pipeline
+    AI_EXAM_ASR_BATCH_SIZE: int = 16
+    AI_EXAM_ASR_WORKERS: int = 0  # 0 = transcribe in-process
+    AI_EXAM_ASR_THREADS_PER_WORKER: int = 1
+    AI_EXAM_GENDER_MODE: str = "turns"  # turns | full | off
+    AI_EXAM_SEGMENT_CACHE_PATH: str = ".storage/asr_segment_cache.sqlite3"  # empty = disabled
+    AI_EXAM_SEGMENT_CACHE_MAX_MB: int = 256
+    # Where POST /ai/generate-exam runs the pipeline: "background" (API process)
+    # or "celery" (workers; needs shared BLOB_STORE_DIR, progress channel and job store).
+    AI_EXAM_PIPELINE_BACKEND: str = "background"
+    # Uploads handed to Celery workers; must be shared between API and workers.
+    BLOB_STORE_DIR: str = ".storage/blobs"
+    # Decoded question clips reused by the exam and random-exam merge endpoints.
+    AUDIO_CLIP_CACHE_DIR: str = ".storage/clip_cache"
+    AUDIO_CLIP_CACHE_MAX_MB: int = 1024
+    # Question clips cut locally during AI generation and served at /api/ai/clips.
+    # Needs PUBLIC_API_URL, and a clip store shared by every API host and worker.
+    AI_EXAM_LOCAL_CLIPS: bool = False
+    AI_EXAM_CLIP_ENCODE_WORKERS: int = 4
+    AUDIO_CLIP_STORE_DIR: str = ".storage/clips"
+
+    # Random exams: in-process question-bank index. Writes made by this process
+    # update it immediately; the TTL bounds staleness from other processes.
+    QUESTION_BANK_INDEX_TTL_SECONDS: int = 300
+
+    # Test taking: per-process cache of serialized exam payloads.
+    EXAM_PAYLOAD_CACHE_MAX_MB: int = 64
+
+    # Arena: leaderboard entries embedded in every contest response.
+    CONTEST_LEADERBOARD_PREVIEW_SIZE: int = 50
+
+    # Admin analytics: daily rollups refreshed by Celery beat; later days are read live.
+    ANALYTICS_ROLLUP_INTERVAL_SECONDS: int = 300
+    ANALYTICS_ROLLUP_REVISIT_DAYS: int = 1
 
     # n8n Automation Settings
     N8N_WEBHOOK_URL: Optional[str] = os.getenv("N8N_WEBHOOK_URL")
@@ -88,6 +131,12 @@ class Settings(BaseSettings):
     AI_PHOTO_N_ITER: int = 1
     AI_PHOTO_USE_NEGATIVE_PROMPT: bool = False
 
+    @model_validator(mode="after")
+    def _check_local_clips(self) -> "Settings":
+        if self.AI_EXAM_LOCAL_CLIPS and not self.PUBLIC_API_URL:
+            raise ValueError("AI_EXAM_LOCAL_CLIPS requires PUBLIC_API_URL")
+        return self
+
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
@@ -35,6 +35,7 @@ from app.modules.ai_feedback.models import AIFeedback  # noqa: F401
 from app.modules.system_feedback.models import SystemFeedback  # noqa: F401
 from app.modules.arena.models import Contest, ContestParticipant  # noqa: F401
 from app.modules.notifications.models import Notification  # noqa: F401
+from app.modules.analytics.models import AnalyticsRollupState  # noqa: F401
 
 settings = get_settings()
 logger = setup_logger(__name__)
@@ -0,0 +1,281 @@
+"""Streaming bell detection for long exam recordings.
+
+``StreamingBellDetector`` resamples the recording block by block to a low
+detection rate and runs overlap-save FFT correlation against every bell
+template in one pass. Peaks are tracked incrementally, so working memory
+depends on the block size and template length rather than on the recording
+duration.
+
+Decoded templates and their spectra are kept in a process-wide
+``BellTemplateCache`` so each worker only pays for them once.
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from scipy import fft as sp_fft
+from scipy import signal
+
+
+class _StreamingPeakTracker:
+    """Incremental ``scipy.signal.find_peaks(x, height=max(x) * ratio, distance=d)``.
+
+    Values arrive in consecutive chunks. Only local maxima that can still
+    clear the final threshold are kept. The threshold is a ratio of the
+    global maximum, so anything below ``ratio * running_max`` is dropped.
+    """
+
+    def __init__(self, height_ratio: float, distance: float, max_tail: int = 4096):
+        self.height_ratio = height_ratio
+        self.distance = distance
+        self.max_tail = max_tail
+        self.running_max = -np.inf
+        self._tail = np.empty(0, dtype=np.float64)
+        self._tail_start = 0
+        self._positions = np.empty(0, dtype=np.int64)
+        self._heights = np.empty(0, dtype=np.float64)
+
+    def push(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        values = np.asarray(values, dtype=np.float64)
+        self.running_max = max(self.running_max, float(values.max()))
+        floor = self.height_ratio * self.running_max
+
+        window = np.concatenate([self._tail, values])
+        window_start = self._tail_start
+        peaks, _ = signal.find_peaks(window)
+        heights = window[peaks]
+        keep = heights >= floor
+        positions = np.concatenate([self._positions, peaks[keep] + window_start])
+        heights = np.concatenate([self._heights, heights[keep]])
+        survivors = heights >= floor
+        self._positions = positions[survivors]
+        self._heights = heights[survivors]
+
+        # Carry the trailing plateau plus its left neighbour: a peak there is
+        # only confirmed once a lower sample arrives in the next chunk.
+        changes = np.flatnonzero(window != window[-1])
+        run_start = int(changes[-1]) + 1 if len(changes) else 0
+        tail_from = max(run_start - 1, 0)
+        if len(window) - tail_from > self.max_tail and window[-1] < floor:
+            tail_from = len(window) - 2
+        self._tail = window[tail_from:].copy()
+        self._tail_start = window_start + tail_from
+
+    def finalize(self) -> np.ndarray:
+        threshold = self.height_ratio * self.running_max
+        keep = self._heights >= threshold
+        positions = self._positions[keep]
+        heights = self._heights[keep]
+
+        distance = math.ceil(self.distance)
+        selected = np.ones(len(positions), dtype=bool)
+        for index in np.argsort(heights)[::-1]:
+            if not selected[index]:
+                continue
+            left = index - 1
+            while left >= 0 and positions[index] - positions[left] < distance:
+                selected[left] = False
+                left -= 1
+            right = index + 1
+            while right < len(positions) and positions[right] - positions[index] < distance:
+                selected[right] = False
+                right += 1
+        return positions[selected]
+
+
+@dataclass(frozen=True)
+class BellTemplateSet:
+    """Unit-energy bell templates at one sample rate, plus their correlation spectra."""
+
+    sample_rate: int
+    templates: tuple[np.ndarray, ...]
+    fft_size: Optional[int] = None
+    spectra: tuple[np.ndarray, ...] = ()
+
+
+def plan_fft_size(template_lengths: Sequence[int], sample_rate: int, block_sec: float) -> int:
+    block_size = max(1, int(block_sec * sample_rate))
+    return sp_fft.next_fast_len(block_size + max(template_lengths) - 1, real=True)
+
+
+class BellTemplateCache:
+    """Per-process cache of decoded bell templates and their FFTs.
+
+    Templates are keyed by ``(paths, sample_rate)`` and spectra by
+    ``(paths, sample_rate, fft_size)``. Templates are scaled to unit energy.
+    That scales every correlation by a constant, so ratio thresholds and peak
+    positions are unchanged.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates: dict[tuple, tuple[np.ndarray, ...]] = {}
+        self._spectra: dict[tuple, tuple[np.ndarray, ...]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _load(path: Path, sample_rate: int) -> np.ndarray:
+        import librosa
+
+        waveform, _ = librosa.load(str(path), sr=sample_rate, mono=True)
+        waveform = waveform.astype(np.float64)
+        norm = float(np.linalg.norm(waveform))
+        if norm > 0:
+            waveform /= norm
+        waveform.setflags(write=False)
+        return waveform
+
+    def get(
+        self, paths: Sequence[Path], sample_rate: int, block_sec: Optional[float] = None
+    ) -> BellTemplateSet:
+        """Templates at ``sample_rate``; with ``block_sec``, also their overlap-save spectra."""
+        template_key = (tuple(str(path) for path in paths), int(sample_rate))
+        with self._lock:
+            templates = self._templates.get(template_key)
+            if templates is None:
+                self.misses += 1
+                templates = tuple(self._load(path, sample_rate) for path in paths)
+                self._templates[template_key] = templates
+            else:
+                self.hits += 1
+
+            if block_sec is None:
+                return BellTemplateSet(sample_rate=sample_rate, templates=templates)
+
+            fft_size = plan_fft_size(
+                [len(template) for template in templates], sample_rate, block_sec
+            )
+            spectrum_key = (*template_key, fft_size)
+            spectra = self._spectra.get(spectrum_key)
+            if spectra is None:
+                self.misses += 1
+                spectra = tuple(np.conj(sp_fft.rfft(template, fft_size)) for template in templates)
+                for spectrum in spectra:
+                    spectrum.setflags(write=False)
+                self._spectra[spectrum_key] = spectra
+            else:
+                self.hits += 1
+            return BellTemplateSet(
+                sample_rate=sample_rate, templates=templates, fft_size=fft_size, spectra=spectra
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "template_entries": len(self._templates),
+                "spectrum_entries": len(self._spectra),
+                "sample_rates": sorted({key[1] for key in self._templates}),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._spectra.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+bell_template_cache = BellTemplateCache()
+
+
+class StreamingBellDetector:
+    """Find template peaks in a block stream with overlap-save correlation."""
+
+    def __init__(
+        self,
+        template_set: BellTemplateSet,
+        threshold_percent: float,
+        min_distance_sec: float,
+    ):
+        self.detection_sample_rate = template_set.sample_rate
+        self.template_lengths = [len(template) for template in template_set.templates]
+        self.fft_size = template_set.fft_size
+        self.hop = self.fft_size - max(self.template_lengths) + 1
+        self.template_spectra = template_set.spectra
+        self.threshold_percent = threshold_percent
+        self.min_distance_sec = min_distance_sec
+
+    def _correlate_block(self, block: np.ndarray) -> list[np.ndarray]:
+        spectrum = sp_fft.rfft(block, self.fft_size)
+        return [
+            sp_fft.irfft(spectrum * template_spectrum, self.fft_size)
+            for template_spectrum in self.template_spectra
+        ]
+
+    def detect(self, blocks: Iterable[np.ndarray], sample_rate: int) -> list[list[float]]:
+        """Return peak times in seconds for each template, in template order.
+
+        ``blocks`` yields consecutive mono float chunks at ``sample_rate``.
+        """
+        import soxr
+
+        trackers = [
+            _StreamingPeakTracker(
+                self.threshold_percent, self.detection_sample_rate * self.min_distance_sec
+            )
+            for _ in self.template_spectra
+        ]
+        resampler = None
+        if sample_rate != self.detection_sample_rate:
+            resampler = soxr.ResampleStream(
+                sample_rate, self.detection_sample_rate, 1, dtype="float32"
+            )
+
+        pending = np.empty(0, dtype=np.float64)
+
+        def feed(chunk: np.ndarray) -> None:
+            nonlocal pending
+            pending = np.concatenate([pending, chunk])
+            while len(pending) >= self.fft_size:
+                for tracker, correlation in zip(
+                    trackers, self._correlate_block(pending[: self.fft_size])
+                ):
+                    tracker.push(correlation[: self.hop])
+                pending = pending[self.hop :]
+
+        for block in blocks:
+            block = np.asarray(block, dtype=np.float32)
+            feed(resampler.resample_chunk(block) if resampler is not None else block)
+        if resampler is not None:
+            feed(resampler.resample_chunk(np.empty(0, dtype=np.float32), last=True))
+
+        if len(pending):
+            for tracker, template_length, correlation in zip(
+                trackers, self.template_lengths, self._correlate_block(pending)
+            ):
+                tracker.push(correlation[: max(0, len(pending) - template_length + 1)])
+
+        return [
+            [float(peak) / self.detection_sample_rate for peak in tracker.finalize()]
+            for tracker in trackers
+        ]
+
+
+def iter_sample_blocks(samples: np.ndarray, block_size: int) -> Iterable[np.ndarray]:
+    for start in range(0, len(samples), block_size):
+        yield samples[start : start + block_size]
+
+
+def iter_file_blocks(audio_path: str, block_sec: float) -> tuple[Iterable[np.ndarray], int]:
+    """Open ``audio_path`` with soundfile and return ``(mono_blocks, sample_rate)``."""
+    import soundfile as sf
+
+    info = sf.info(audio_path)
+    block_size = max(1, int(block_sec * info.samplerate))
+
+    def blocks() -> Iterable[np.ndarray]:
+        for block in sf.blocks(audio_path, blocksize=block_size, dtype="float32", always_2d=True):
+            yield block[:, 0] if block.shape[1] == 1 else block.mean(axis=1)
+
+    return blocks(), int(info.samplerate)
@@ -0,0 +1,95 @@
+"""Local per-question clip materialization.
+
+Each question's audio is cut from the decoded bell segment that is already in
+memory during generation. The clips are encoded to MP3 in a thread pool
+(ffmpeg does the work in subprocesses) and stored under a hash of their PCM
+and encoder settings. Regenerating the same audio therefore reuses the
+stored clips. Playback and merges then read the pre-cut bytes, with no
+Cloudinary ``start_offset``/``end_offset`` transcode per request.
+"""
+
+import hashlib
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Sequence
+
+from app.shared.blob_store import LocalBlobStore
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CLIP_FORMAT_VERSION = 1
+
+
+class ClipMaterializer:
+    def __init__(self, store: LocalBlobStore, workers: int = 4, bitrate: str = "128k"):
+        self.store = store
+        self.workers = max(1, workers)
+        self.bitrate = bitrate
+
+    def clip_key(self, samples: "np.ndarray", sample_rate: int) -> str:
+        import numpy as np
+
+        digest = hashlib.sha256(
+            f"v{CLIP_FORMAT_VERSION}:mp3:{self.bitrate}:{sample_rate}:".encode("ascii")
+        )
+        digest.update(np.ascontiguousarray(samples, dtype=np.float32).tobytes())
+        return digest.hexdigest()
+
+    def encode_mp3(self, samples: "np.ndarray", sample_rate: int) -> bytes:
+        import numpy as np
+
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-f",
+                "f32le",
+                "-ar",
+                str(sample_rate),
+                "-ac",
+                "1",
+                "-i",
+                "pipe:0",
+                "-c:a",
+                "libmp3lame",
+                "-b:a",
+                self.bitrate,
+                "-f",
+                "mp3",
+                "pipe:1",
+            ],
+            input=np.ascontiguousarray(samples, dtype=np.float32).tobytes(),
+            capture_output=True,
+            timeout=120,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Failed to encode clip: {result.stderr.decode('utf-8', errors='replace')}"
+            )
+        return result.stdout
+
+    def _materialize_one(self, key: str, samples: "np.ndarray", sample_rate: int) -> str:
+        if not self.store.exists(key):
+            self.store.put(self.encode_mp3(samples, sample_rate), key=key)
+        return key
+
+    def materialize(self, clips: Sequence[tuple["np.ndarray", int]]) -> list[str]:
+        """Store every ``(samples, sample_rate)`` clip and return their keys in input order."""
+        keys = [self.clip_key(samples, sample_rate) for samples, sample_rate in clips]
+        pending = {}
+        for key, (samples, sample_rate) in zip(keys, clips):
+            if key not in pending and not self.store.exists(key):
+                pending[key] = (samples, sample_rate)
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                list(
+                    pool.map(lambda item: self._materialize_one(item[0], *item[1]), pending.items())
+                )
+        logger.info("Materialized %s clip(s), %s newly encoded.", len(keys), len(pending))
+        return keys
@@ -0,0 +1,64 @@
+"""Draft exams saved from finished AI generation jobs."""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.ai_exam.schemas import AIExamResult
+from app.modules.exam.models import Exam
+from app.modules.questions.bulk import AnswerDraft, QuestionDraft, insert_exam_questions
+
+
+def build_draft_title(jlpt_level: str, exam_title: str, filename: str) -> str:
+    return f"[Tạm thời] [{jlpt_level}] Đề thi AI"
+
+
+async def create_exam_draft_from_ai_result(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    jlpt_level: str,
+    exam_title: str,
+    filename: str,
+    audio_id: Optional[uuid.UUID],
+    result: AIExamResult,
+) -> Exam:
+    exam = Exam(
+        creator_id=user_id,
+        title=build_draft_title(jlpt_level, exam_title, filename),
+        description=None,
+        time_limit=60,
+        audio_id=audio_id,
+        current_step=3,
+        is_published=False,
+    )
+    db.add(exam)
+    await db.flush()
+
+    await insert_exam_questions(
+        db,
+        exam.exam_id,
+        [
+            QuestionDraft(
+                mondai_group=question.mondai_group,
+                question_number=question.question_number,
+                audio_clip_url=question.audio_url,
+                question_text=question.question_text,
+                image_url=question.image_url,
+                script_text=question.script_text,
+                explanation=getattr(question, "explanation", None) or "",
+                raw_transcript=question.source_transcript,
+                hide_question_text=bool(getattr(question, "hide_question_text", False)),
+                difficulty=question.difficulty,
+                answers=[
+                    AnswerDraft(
+                        content=answer.content, is_correct=answer.is_correct, order_index=index
+                    )
+                    for index, answer in enumerate(question.answers)
+                ],
+            )
+            for question in result.questions
+        ],
+    )
+    return exam
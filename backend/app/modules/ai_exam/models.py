@@ -1,13 +1,26 @@
+import json
 import uuid
+from typing import Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
 from app.db.base import Base
 
 
+def extract_confidence_error_score(result_json: Optional[str]) -> Optional[float]:
+    """``confidence_error_score`` of a stored ``AIExamResult`` payload, if it has one."""
+    if not result_json:
+        return None
+    try:
+        value = json.loads(result_json).get("confidence_error_score")
+        return float(value) if value is not None else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
 class AIExamCache(Base):
     __tablename__ = "ai_exam_cache"
 
@@ -26,6 +39,7 @@ class AIExamCache(Base):
     cloudinary_public_id = Column(String(255), nullable=True)
     cloudinary_format = Column(String(20), nullable=True)
     result_json = Column(Text, nullable=True)
+    confidence_error_score = Column(Float, nullable=True)  # Derived from result_json
     progress_message = Column(Text, nullable=True)
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -33,3 +47,8 @@ class AIExamCache(Base):
 
     audio = relationship("Audio")
     user = relationship("User", foreign_keys=[user_id])
+
+    @validates("result_json")
+    def _sync_confidence_error_score(self, key, value):
+        self.confidence_error_score = extract_confidence_error_score(value)
+        return value
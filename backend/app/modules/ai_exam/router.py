@@ -1,32 +1,49 @@
 import uuid
 import json
+import asyncio
 import hashlib
 import logging
 from typing import Optional
 from pathlib import Path
 
-from fastapi import APIRouter, UploadFile, File, Form, BackgroundTasks, HTTPException, Depends
+from fastapi import (
+    APIRouter,
+    UploadFile,
+    File,
+    Form,
+    BackgroundTasks,
+    HTTPException,
+    Depends,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import AsyncSessionLocal, get_db
-from app.core.security import get_current_user
+from app.core.config import get_settings
+from app.core.security import RoleChecker, get_current_user
 from app.modules.users.models import User
 from app.modules.audio.models import Audio
 from app.modules.ai_exam.models import AIExamCache
-from app.modules.exam.models import Exam
-from app.modules.questions.models import Question, Answer
 from app.modules.ai_exam.schemas import (
     AIGenerateRequest, AIGenerateResponse, AIJobStatusResponse,
     AIExamResult, MondaiCountConfig
 )
-from app.modules.ai_exam.service import AIExamService
+from app.modules.ai_exam.bell_detection import bell_template_cache
+from app.modules.ai_exam.drafts import create_exam_draft_from_ai_result
+from app.modules.ai_exam.service import GENDER_MODES, AIExamService
+from app.modules.ai_exam.speaker_gender import gender_inference_stats
+from app.shared.clip_store import get_clip_store, parse_clip_name, public_clip_url
+from app.shared.job_store import JobRegistry
+from app.shared.progress_channel import get_progress_channel, is_terminal, stream_job_events
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 logger = logging.getLogger(__name__)
 
-_jobs: dict[str, AIJobStatusResponse] = {}
+_jobs = JobRegistry("ai_exam", AIJobStatusResponse)
 
 # Eagerly load the AI Service and its ASR model at server startup
 try:
@@ -66,6 +83,7 @@ def _compute_cache_key(
     mondai_config: Optional[list],
     model_name: str,
     pipeline_version: str,
+    gender_mode: str = "turns",
 ) -> str:
     key_payload = {
         "content_hash": content_hash,
@@ -74,6 +92,9 @@ def _compute_cache_key(
         "model_name": model_name,
         "pipeline_version": pipeline_version,
     }
+    # Only non-default modes change the key, so existing cache rows stay valid.
+    if gender_mode != "turns":
+        key_payload["gender_mode"] = gender_mode
     raw_key = json.dumps(key_payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
     return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
 
@@ -87,62 +108,132 @@ def _job_from_result(job_id: str, result: AIExamResult, progress_message: str) -
     )
 
 
-def _build_draft_title(jlpt_level: str, exam_title: str, filename: str) -> str:
-    return f"[Tạm thời] [{jlpt_level}] Đề thi AI"
+def _with_public_clip_urls(job: AIJobStatusResponse) -> AIJobStatusResponse:
+    """Results keep host-relative clip paths; clients get absolute URLs."""
+    if job.result is None:
+        return job
+    questions = [
+        question.model_copy(update={"audio_url": public_clip_url(question.audio_url)})
+        for question in job.result.questions
+    ]
+    return job.model_copy(update={"result": job.result.model_copy(update={"questions": questions})})
+
+
+def _job_event(job: AIJobStatusResponse) -> dict:
+    return job.model_dump(mode="json", exclude={"result"})
+
+
+async def _set_job(job: AIJobStatusResponse) -> None:
+    """Persist a state transition and push it to subscribers."""
+    await _jobs.put(job.job_id, job)
+    await get_progress_channel().publish_async(job.job_id, _job_event(job))
+
+
+async def _find_rederivable_cache(
+    db: AsyncSession,
+    content_hash: str,
+    model_name: str,
+    pipeline_version: str,
+) -> Optional[AIExamCache]:
+    """Latest completed row for the same audio and pipeline, produced with default ASR settings."""
+    rows = await db.execute(
+        select(AIExamCache)
+        .where(
+            AIExamCache.content_hash == content_hash,
+            AIExamCache.status == "completed",
+            AIExamCache.ai_model == model_name,
+            AIExamCache.pipeline_version == pipeline_version,
+            AIExamCache.result_json.is_not(None),
+        )
+        .order_by(AIExamCache.updated_at.desc())
+    )
+    for row in rows.scalars():
+        # Rows for non-default speaker_gender modes carry a different key; their
+        # transcripts are not interchangeable with a default-mode request.
+        default_key = _compute_cache_key(
+            content_hash,
+            row.jlpt_level,
+            json.loads(row.mondai_config_json or "[]"),
+            model_name,
+            pipeline_version,
+        )
+        if row.cache_key == default_key:
+            return row
+    return None
 
 
-async def _create_exam_draft_from_ai_result(
+async def _rederive_from_cache(
     db: AsyncSession,
+    svc: AIExamService,
+    source: AIExamCache,
     *,
-    user_id: int,
+    cache: Optional[AIExamCache],
+    cache_key: str,
+    content_hash: str,
+    filename: str,
     jlpt_level: str,
+    mondai_config: Optional[list],
+    user_id: int,
     exam_title: str,
-    filename: str,
-    audio_id: Optional[uuid.UUID],
-    result: AIExamResult,
-) -> Exam:
-    exam = Exam(
-        creator_id=user_id,
-        title=_build_draft_title(jlpt_level, exam_title, filename),
-        description=None,
-        time_limit=60,
-        audio_id=audio_id,
-        current_step=3,
-        is_published=False,
-    )
-    db.add(exam)
-    await db.flush()
-
-    for question in result.questions:
-        db_question = Question(
-            exam_id=exam.exam_id,
-            mondai_group=question.mondai_group,
-            question_number=question.question_number,
-            audio_clip_url=question.audio_url,
-            question_text=question.question_text,
-            image_url=question.image_url,
-            script_text=question.script_text,
-            explanation=getattr(question, "explanation", None) or "",
-            raw_transcript=question.source_transcript,
-            hide_question_text=bool(getattr(question, "hide_question_text", False)),
-            difficulty=question.difficulty,
+) -> Optional[AIExamResult]:
+    """Rebuild steps 5-7 from ``source``'s stored transcripts; persist them under ``cache_key``."""
+    try:
+        result = await asyncio.to_thread(
+            svc.rederive,
+            AIExamResult.model_validate_json(source.result_json),
+            jlpt_level,
+            mondai_config,
+            source.cloudinary_public_id,
+            source.cloudinary_format,
         )
-        db.add(db_question)
-        await db.flush()
-
-        for index, answer in enumerate(question.answers):
-            db.add(
-                Answer(
-                    question_id=db_question.question_id,
-                    content=answer.content,
-                    image_url=None,
-                    is_correct=answer.is_correct,
-                    order_index=index,
-                )
-            )
+    except ValueError as exc:
+        logger.info("Cannot re-derive from cache %s: %s", source.cache_id, exc)
+        return None
 
-    await db.flush()
-    return exam
+    audio = await db.get(Audio, source.audio_id) if source.audio_id else None
+    if audio is not None:
+        result.audio_id = str(audio.audio_id)
+        result.audio_file_url = audio.file_url
+    result.confidence_error_score = 0.10
+
+    if cache is None:
+        cache = AIExamCache(cache_key=cache_key, content_hash=content_hash, user_id=user_id)
+        db.add(cache)
+    cache.source_filename = filename
+    cache.jlpt_level = jlpt_level
+    cache.mondai_config_json = _normalize_mondai_config(mondai_config)
+    cache.audio_id = audio.audio_id if audio is not None else None
+    cache.status = "completed"
+    cache.job_id = None
+    cache.progress_message = (
+        f"Done! Re-derived {len(result.questions)} questions from stored transcripts."
+    )
+    cache.error_message = None
+    cache.ai_model = svc.model_name
+    cache.pipeline_version = svc.pipeline_version
+    cache.cloudinary_public_id = source.cloudinary_public_id
+    cache.cloudinary_format = source.cloudinary_format
+    if cache.user_id is None:
+        cache.user_id = user_id
+
+    draft_exam = await create_exam_draft_from_ai_result(
+        db,
+        user_id=user_id,
+        jlpt_level=jlpt_level,
+        exam_title=exam_title,
+        filename=filename,
+        audio_id=audio.audio_id if audio is not None else None,
+        result=result,
+    )
+    result.draft_exam_id = str(draft_exam.exam_id)
+    cache.result_json = result.model_dump_json()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request stored the same key first; fall back to the normal path.
+        await db.rollback()
+        return None
+    return result
 
 
 async def _run_pipeline(
@@ -155,24 +246,26 @@ async def _run_pipeline(
     mondai_config: Optional[list],
     user_id: Optional[int] = None,
     exam_title: str = "",
+    gender_mode: Optional[str] = None,
 ):
     """Background task: run split-first AI pipeline and update job store."""
     from app.shared.upload import upload_audio_bytes
     from app.modules.notifications.service import create_notification
 
-    job = _jobs.get(job_id)
+    job = await _jobs.get(job_id)
     if not job:
         return
 
     try:
         job.status = "processing"
+        job.progress_message = "Step 1/7: Uploading raw audio to Cloudinary..."
+        await _set_job(job)
 
         def set_progress(message: str) -> None:
-            current = _jobs.get(job_id)
-            if current:
-                current.progress_message = message
+            # Steps are pushed only; the job store is written on state transitions.
+            job.progress_message = message
+            get_progress_channel().publish(job_id, _job_event(job))
 
-        set_progress("Step 1/7: Uploading raw audio to Cloudinary...")
         cloudinary_res = await upload_audio_bytes(
             audio_bytes,
             filename,
@@ -183,7 +276,6 @@ async def _run_pipeline(
 
         svc = get_service()
 
-        import asyncio
         result: AIExamResult = await asyncio.to_thread(
             svc.generate,
             audio_bytes,
@@ -193,6 +285,7 @@ async def _run_pipeline(
             public_id,
             fmt,
             set_progress,
+            gender_mode=gender_mode,
         )
 
         async with AsyncSessionLocal() as db:
@@ -234,7 +327,7 @@ async def _run_pipeline(
             cache.cloudinary_format = fmt
             result.confidence_error_score = 0.10
             if user_id:
-                draft_exam = await _create_exam_draft_from_ai_result(
+                draft_exam = await create_exam_draft_from_ai_result(
                     db,
                     user_id=user_id,
                     jlpt_level=jlpt_level,
@@ -251,6 +344,7 @@ async def _run_pipeline(
         job.status = "done"
         job.progress_message = f"Done! Generated {len(result.questions)} questions and saved a draft exam."
         job.result = result
+        await _set_job(job)
 
         if user_id:
             title_display = exam_title or filename
@@ -274,6 +368,7 @@ async def _run_pipeline(
         job.status = "failed"
         job.error = str(exc)
         job.progress_message = "Pipeline failed."
+        await _set_job(job)
 
         if user_id:
             await create_notification(
@@ -296,6 +391,7 @@ async def generate_exam_from_audio(
     file: UploadFile = File(..., description="Full JLPT listening audio file (mp3/wav)"),
     jlpt_level: str = Form("N2", description="JLPT level: N5/N4/N3/N2/N1"),
     title: str = Form("", description="Exam title"),
+    speaker_gender: str = Form("turns", description="Speaker gender inference: turns/full/off"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -312,6 +408,15 @@ async def generate_exam_from_audio(
             detail=f"File must be audio (mp3/wav/ogg). Got: {file.content_type}"
         )
 
+    if speaker_gender not in GENDER_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"speaker_gender must be one of {', '.join(GENDER_MODES)}. "
+                f"Got: {speaker_gender}"
+            ),
+        )
+
     audio_bytes = await file.read()
     filename = file.filename or "audio.mp3"
     svc = get_service()
@@ -323,6 +428,7 @@ async def generate_exam_from_audio(
         mondai_config,
         svc.model_name,
         svc.pipeline_version,
+        speaker_gender,
     )
 
     cache_result = await db.execute(select(AIExamCache).where(AIExamCache.cache_key == cache_key))
@@ -336,10 +442,12 @@ async def generate_exam_from_audio(
             if existing_audio is None:
                 result.audio_id = None
                 result.audio_file_url = None
-        _jobs[job_id] = _job_from_result(
-            job_id,
-            result,
-            "Duplicate audio detected. Reused cached AI result.",
+        await _set_job(
+            _job_from_result(
+                job_id,
+                result,
+                "Duplicate audio detected. Reused cached AI result.",
+            )
         )
         return AIGenerateResponse(
             job_id=job_id,
@@ -347,14 +455,46 @@ async def generate_exam_from_audio(
             progress_message="Duplicate audio detected. Reused cached AI result.",
         )
 
-    if cache and cache.status == "processing" and cache.job_id and cache.job_id in _jobs:
-        active_job = _jobs[cache.job_id]
+    active_job = None
+    if cache and cache.status == "processing" and cache.job_id:
+        active_job = await _jobs.get(cache.job_id)
+    if active_job:
         return AIGenerateResponse(
             job_id=cache.job_id,
             status=active_job.status,
             progress_message="Duplicate audio is already being processed. Reusing active job.",
         )
 
+    if speaker_gender == "turns":
+        source = await _find_rederivable_cache(
+            db, content_hash, svc.model_name, svc.pipeline_version
+        )
+        if source is not None:
+            result = await _rederive_from_cache(
+                db,
+                svc,
+                source,
+                cache=cache,
+                cache_key=cache_key,
+                content_hash=content_hash,
+                filename=filename,
+                jlpt_level=jlpt_level,
+                mondai_config=mondai_config,
+                user_id=current_user.id,
+                exam_title=title,
+            )
+            if result is not None:
+                job_id = str(uuid.uuid4())
+                message = (
+                    "Same audio already transcribed. Re-derived questions for the new settings."
+                )
+                await _set_job(_job_from_result(job_id, result, message))
+                return AIGenerateResponse(job_id=job_id, status="done", progress_message=message)
+            cache_result = await db.execute(
+                select(AIExamCache).where(AIExamCache.cache_key == cache_key)
+            )
+            cache = cache_result.scalar_one_or_none()
+
     if cache is None:
         cache = AIExamCache(
             cache_key=cache_key,
@@ -389,24 +529,46 @@ async def generate_exam_from_audio(
     cache.error_message = None
     await db.commit()
 
-    _jobs[job_id] = AIJobStatusResponse(
-        job_id=job_id,
-        status="pending",
-        progress_message="Job queued. Starting pipeline...",
+    await _set_job(
+        AIJobStatusResponse(
+            job_id=job_id,
+            status="pending",
+            progress_message="Job queued. Starting pipeline...",
+        )
     )
 
-    background_tasks.add_task(
-        _run_pipeline,
+    job_args = dict(
         job_id=job_id,
         cache_id=str(cache.cache_id),
         content_hash=content_hash,
-        audio_bytes=audio_bytes,
         filename=filename,
         jlpt_level=jlpt_level,
         mondai_config=mondai_config,
         user_id=current_user.id,
         exam_title=title,
+        gender_mode=speaker_gender,
     )
+    if get_settings().AI_EXAM_PIPELINE_BACKEND == "celery":
+        from app.modules.ai_exam.tasks import enqueue_generate_exam
+
+        try:
+            await asyncio.to_thread(enqueue_generate_exam, audio_bytes, **job_args)
+        except Exception as exc:
+            logger.error("Failed to queue AI job %s: %s", job_id, exc, exc_info=True)
+            cache.status = "failed"
+            cache.error_message = str(exc)
+            await db.commit()
+            await _set_job(
+                AIJobStatusResponse(
+                    job_id=job_id,
+                    status="failed",
+                    progress_message="Pipeline failed.",
+                    error=str(exc),
+                )
+            )
+            raise HTTPException(status_code=503, detail="AI generation queue is unavailable")
+    else:
+        background_tasks.add_task(_run_pipeline, audio_bytes=audio_bytes, **job_args)
 
     return AIGenerateResponse(
         job_id=job_id,
@@ -415,25 +577,27 @@ async def generate_exam_from_audio(
     )
 
 
-@router.get(
-    "/job/{job_id}",
-    response_model=AIJobStatusResponse,
-    summary="Poll AI generation job status",
-)
-async def get_job_status(
-    job_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Poll the status of an AI exam generation job."""
-    job = _jobs.get(job_id)
+async def _load_job_status(db: AsyncSession, job_id: str) -> Optional[AIJobStatusResponse]:
+    """Current job state: job store plus latest step event, then the cache row."""
+    # Step progress is only published; the store and the row change on state transitions.
+    latest = await get_progress_channel().latest_async(job_id)
+    job = await _jobs.get(job_id)
     if job:
-        return job
+        if job.status not in ("pending", "processing") or latest is None:
+            return job
+        if not is_terminal(latest):
+            job.status = latest["status"]
+            job.progress_message = latest["progress_message"]
+            return job
+        # Finished in a Celery worker, which records the outcome on the cache row only.
+
+    if latest is not None and not is_terminal(latest):
+        return AIJobStatusResponse.model_validate(latest)
 
     cache_result = await db.execute(select(AIExamCache).where(AIExamCache.job_id == job_id))
     cache = cache_result.scalar_one_or_none()
     if cache is None:
-        raise HTTPException(status_code=404, detail="Job not found")
+        return None
 
     if cache.status == "completed" and cache.result_json:
         result = AIExamResult.model_validate_json(cache.result_json)
@@ -462,17 +626,100 @@ async def get_job_status(
     )
 
 
+@router.get(
+    "/job/{job_id}",
+    response_model=AIJobStatusResponse,
+    summary="Poll AI generation job status",
+)
+async def get_job_status(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Poll the status of an AI exam generation job."""
+    job = await _load_job_status(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _with_public_clip_urls(job)
+
+
+async def _load_job_event(job_id: str) -> Optional[dict]:
+    async with AsyncSessionLocal() as db:
+        job = await _load_job_status(db, job_id)
+    return _job_event(job) if job else None
+
+
+@router.get(
+    "/job/{job_id}/events",
+    summary="Stream AI generation job progress (Server-Sent Events)",
+)
+async def stream_job_status(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Push progress events until the job is done or failed.
+
+    Fetch `GET /job/{job_id}` for the result.
+    """
+    if await _load_job_status(db, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def event_stream():
+        async for event in stream_job_events(
+            get_progress_channel(), job_id, lambda: _load_job_event(job_id)
+        ):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: progress\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/job/{job_id}/ws")
+async def job_status_websocket(
+    websocket: WebSocket,
+    job_id: str,
+    token: str = "",
+    db: AsyncSession = Depends(get_db),
+):
+    """WebSocket variant of `/job/{job_id}/events`; browsers pass the access token as `?token=`."""
+    try:
+        await get_current_user(token=token, db=db)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    if await _load_job_status(db, job_id) is None:
+        await websocket.close(code=1008, reason="Job not found")
+        return
+
+    await websocket.accept()
+    try:
+        async for event in stream_job_events(
+            get_progress_channel(), job_id, lambda: _load_job_event(job_id)
+        ):
+            if event is not None:
+                await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 @router.delete(
     "/job/{job_id}",
     status_code=204,
-    summary="Remove a completed/failed job from memory",
+    summary="Remove a completed/failed job from the job store",
 )
 async def delete_job(
     job_id: str,
     current_user: User = Depends(get_current_user),
 ):
-    if job_id in _jobs:
-        del _jobs[job_id]
+    await _jobs.delete(job_id)
 
 
 @router.get(
@@ -507,3 +754,57 @@ async def list_my_jobs(
             "updated_at": cache.updated_at.isoformat() if cache.updated_at else None,
         })
     return {"jobs": jobs}
+
+
+@router.get(
+    "/clips/{clip_name}",
+    summary="Serve a locally cut question clip",
+)
+async def get_question_clip(clip_name: str):
+    """Clips are immutable and content-addressed, so they are public and cacheable forever."""
+    key = parse_clip_name(clip_name)
+    if key is None or not get_clip_store().exists(key):
+        raise HTTPException(status_code=404, detail="Clip not found")
+    return FileResponse(
+        get_clip_store().path(key),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+@router.get(
+    "/bell-cache/stats",
+    summary="Bell template cache statistics for this worker",
+)
+async def get_bell_cache_stats(
+    admin: User = Depends(RoleChecker(["admin"])),
+):
+    """Return hit/miss counters of the per-process bell template cache."""
+    return bell_template_cache.stats()
+
+
+@router.get(
+    "/asr/gender-stats",
+    summary="Speaker gender classifier usage for this worker",
+)
+async def get_gender_inference_stats(
+    admin: User = Depends(RoleChecker(["admin"])),
+):
+    """Return how many utterances were labelled and how many classifier calls were saved."""
+    return gender_inference_stats.stats()
+
+
+@router.get(
+    "/asr/segment-cache/stats",
+    summary="Segment transcript cache statistics for this worker",
+)
+async def get_segment_cache_stats(
+    admin: User = Depends(RoleChecker(["admin"])),
+):
+    """Return hit/miss counters and on-disk size of the segment transcript cache."""
+    from app.modules.ai_exam.segment_cache import get_segment_transcript_cache
+
+    cache = get_segment_transcript_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -58,6 +58,13 @@ class AISplitSegment(BaseModel):
     end_time: float
     transcript: str
     refined_transcript: Optional[str] = None
+    # ASR-derived fields kept so steps 5-7 can be re-run without the audio.
+    timestamped_transcript: Optional[str] = None
+    introduction: Optional[str] = None
+    script_text: Optional[str] = None
+    question_texts: List[str] = []
+    spoken_question_number: Optional[int] = None
+    announced_mondai_number: Optional[int] = None
 
 
 class AIExamResult(BaseModel):
@@ -0,0 +1,263 @@
+"""Segment-level ASR transcript cache.
+
+Whole-exam results in ``AIExamCache`` are keyed by the upload's sha256. A
+re-encoded MP3, or the same audio with a different ``mondai_config``, misses
+that cache and re-runs every ASR call. This cache is keyed by a
+decode-stable fingerprint of each bell segment's PCM, so those requests only
+re-run structuring and question building.
+
+The fingerprint follows Haitsma-Kalker: one bit per band pair and frame, the
+sign of the band-energy difference's change over time. Bits from frames
+more than 30 dB below the loudest frame are noise, so those frames are
+masked out. Re-encoding flips roughly 10-15% of the remaining bits.
+Unrelated audio flips half or more. Lookups read candidates with a similar duration and
+accept the nearest one under ``max_bit_error``.
+
+Entries live in a local SQLite file. Once the total payload exceeds
+``max_bytes``, the least recently used rows are evicted.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_CACHE_VERSION = 1
+FINGERPRINT_RATE = 8000
+FINGERPRINT_FRAME = 1024
+FINGERPRINT_HOP = 400
+FINGERPRINT_BAND_EDGES = np.geomspace(300.0, 3400.0, 18)
+FINGERPRINT_ACTIVE_RATIO = 1e-3
+DURATION_TOLERANCE_MS = 250
+
+# (text, gender, utterance_start_ms relative to the segment start)
+UtteranceResult = tuple[str, str, int]
+
+
+@dataclass(frozen=True)
+class SegmentFingerprint:
+    duration_ms: int
+    bits: np.ndarray  # bool, shape (frames, bands - 1)
+    active: np.ndarray  # bool, shape (frames,)
+
+    @property
+    def duration_bucket(self) -> int:
+        return round(self.duration_ms / 1000)
+
+
+def segment_fingerprint(samples: np.ndarray, sample_rate: int) -> SegmentFingerprint:
+    import soxr
+
+    samples = np.asarray(samples, dtype=np.float32)
+    duration_ms = int(len(samples) * 1000 / sample_rate)
+    if sample_rate != FINGERPRINT_RATE:
+        samples = soxr.resample(samples, sample_rate, FINGERPRINT_RATE)
+    bands = len(FINGERPRINT_BAND_EDGES) - 1
+    if len(samples) < FINGERPRINT_FRAME + FINGERPRINT_HOP:
+        return SegmentFingerprint(
+            duration_ms, np.zeros((0, bands - 1), dtype=bool), np.zeros(0, dtype=bool)
+        )
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FINGERPRINT_FRAME)[::FINGERPRINT_HOP]
+    power = np.abs(np.fft.rfft(frames * np.hanning(FINGERPRINT_FRAME), axis=1)) ** 2
+    edges = np.searchsorted(
+        np.fft.rfftfreq(FINGERPRINT_FRAME, 1 / FINGERPRINT_RATE), FINGERPRINT_BAND_EDGES
+    )
+    energy = np.add.reduceat(power, edges[:-1], axis=1)[:, :bands]
+    band_difference = np.diff(energy, axis=1)
+    frame_energy = energy.sum(axis=1)
+    active = frame_energy[1:] >= FINGERPRINT_ACTIVE_RATIO * max(float(frame_energy.max()), 1e-12)
+    return SegmentFingerprint(duration_ms, np.diff(band_difference, axis=0) > 0, active)
+
+
+def bit_error_rate(left: SegmentFingerprint, right: SegmentFingerprint) -> float:
+    """Share of differing bits over frames active in either print.
+
+    Frames active in only one print count as errors.
+    """
+    frames = min(len(left.bits), len(right.bits))
+    if frames == 0:
+        return 0.0 if len(left.bits) == len(right.bits) else 1.0
+    both = left.active[:frames] & right.active[:frames]
+    either = left.active[:frames] | right.active[:frames]
+    if not either.any():
+        return 0.0
+    bands = left.bits.shape[1]
+    differing = np.count_nonzero(left.bits[:frames][both] != right.bits[:frames][both])
+    differing += bands * int(np.count_nonzero(either & ~both))
+    return float(differing / (bands * np.count_nonzero(either)))
+
+
+class SegmentTranscriptCache:
+    """SQLite-backed transcript cache with fuzzy fingerprint lookup and LRU size eviction."""
+
+    def __init__(self, path: Path, max_bytes: int = 256 * 1024 * 1024, max_bit_error: float = 0.25):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_bit_error = max_bit_error
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS segment_transcripts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    version TEXT NOT NULL,
+                    duration_bucket INTEGER NOT NULL,
+                    duration_ms INTEGER NOT NULL,
+                    frames INTEGER NOT NULL,
+                    fingerprint BLOB NOT NULL,
+                    active_mask BLOB NOT NULL,
+                    utterances TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_segment_transcripts_lookup "
+                "ON segment_transcripts (version, duration_bucket)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_segment_transcripts_lru "
+                "ON segment_transcripts (last_used)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+
+    @staticmethod
+    def cache_version(model_version: str, gender_mode: str) -> str:
+        return f"v{SEGMENT_CACHE_VERSION}:{model_version}:gender={gender_mode}"
+
+    def get(self, fingerprint: SegmentFingerprint, version: str) -> Optional[list[UtteranceResult]]:
+        bucket = fingerprint.duration_bucket
+        bands = fingerprint.bits.shape[1]
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, duration_ms, frames, fingerprint, active_mask, utterances "
+                "FROM segment_transcripts WHERE version = ? AND duration_bucket BETWEEN ? AND ?",
+                (version, bucket - 1, bucket + 1),
+            ).fetchall()
+
+            best: Optional[tuple[float, int, str]] = None
+            for row_id, duration_ms, frames, bits_blob, active_blob, utterances in rows:
+                if abs(duration_ms - fingerprint.duration_ms) > DURATION_TOLERANCE_MS:
+                    continue
+                stored = SegmentFingerprint(
+                    duration_ms,
+                    np.unpackbits(np.frombuffer(bits_blob, dtype=np.uint8), count=frames * bands)
+                    .astype(bool)
+                    .reshape(frames, bands),
+                    np.unpackbits(np.frombuffer(active_blob, dtype=np.uint8), count=frames).astype(
+                        bool
+                    ),
+                )
+                error = bit_error_rate(fingerprint, stored)
+                if error <= self.max_bit_error and (best is None or error < best[0]):
+                    best = (error, row_id, utterances)
+
+            if best is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE segment_transcripts SET last_used = ? WHERE id = ?", (time.time(), best[1])
+            )
+
+        with self._lock:
+            self.hits += 1
+        return [(text, gender, int(start_ms)) for text, gender, start_ms in json.loads(best[2])]
+
+    def put(
+        self, fingerprint: SegmentFingerprint, version: str, utterances: Sequence[UtteranceResult]
+    ) -> None:
+        bits_blob = np.packbits(fingerprint.bits.ravel()).tobytes()
+        active_blob = np.packbits(fingerprint.active).tobytes()
+        payload = json.dumps([list(utterance) for utterance in utterances], ensure_ascii=False)
+        size_bytes = len(bits_blob) + len(active_blob) + len(payload.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO segment_transcripts "
+                "(version, duration_bucket, duration_ms, frames, fingerprint, active_mask, "
+                "utterances, size_bytes, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    version,
+                    fingerprint.duration_bucket,
+                    fingerprint.duration_ms,
+                    len(fingerprint.bits),
+                    bits_blob,
+                    active_blob,
+                    payload,
+                    size_bytes,
+                    time.time(),
+                ),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM segment_transcripts"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for row_id, size_bytes in conn.execute(
+            "SELECT id, size_bytes FROM segment_transcripts ORDER BY last_used ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM segment_transcripts WHERE id = ?", (row_id,))
+            total -= size_bytes
+            evicted += 1
+        logger.info("Evicted %s segment transcript(s) from %s.", evicted, self.path)
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            entries, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM segment_transcripts"
+            ).fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "size_bytes": total,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_segment_cache: Optional[SegmentTranscriptCache] = None
+
+
+def get_segment_transcript_cache() -> Optional[SegmentTranscriptCache]:
+    """Process-wide cache built from settings; ``None`` when disabled."""
+    global _segment_cache
+    if _segment_cache is None:
+        from app.core.config import BACKEND_DIR, get_settings
+
+        settings = get_settings()
+        if not settings.AI_EXAM_SEGMENT_CACHE_PATH or settings.AI_EXAM_SEGMENT_CACHE_MAX_MB <= 0:
+            return None
+        path = Path(settings.AI_EXAM_SEGMENT_CACHE_PATH)
+        if not path.is_absolute():
+            path = BACKEND_DIR / path
+        _segment_cache = SegmentTranscriptCache(
+            path, max_bytes=settings.AI_EXAM_SEGMENT_CACHE_MAX_MB * 1024 * 1024
+        )
+    return _segment_cache
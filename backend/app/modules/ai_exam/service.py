@@ -1,13 +1,11 @@
 import io
 import logging
-import os
 import re
-import shutil
-import tempfile
 from collections import OrderedDict
 from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Callable, Optional, Sequence
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional, Sequence
+from app.core.config import get_settings
 from app.core.memory.planner import MIAPlanner
 
 from app.modules.ai_exam.schemas import (
@@ -19,8 +17,15 @@ from app.modules.ai_exam.schemas import (
     AITimestampQuestion,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from app.modules.ai_exam.bell_detection import BellTemplateCache, StreamingBellDetector
+    from app.modules.ai_exam.segment_cache import SegmentTranscriptCache
+
 logger = logging.getLogger(__name__)
 PIPELINE_VERSION = "ai-exam-cache-v7-reazon-local-mondai-timeline-aware"
+MODEL_NAME = "reazonspeech-local"
 REPO_ROOT = Path(__file__).resolve().parents[4]
 REAZON_SPLIT_DIR = REPO_ROOT / "R&D" / "Reazon" / "Spilit"
 BELL_SOUND_PATH = REAZON_SPLIT_DIR / "Bell_sound.mp3"
@@ -29,6 +34,12 @@ MAX_MONDAI = 5
 MAX_QUESTIONS_PER_SEGMENT = 1
 SHORT_OPTION_SEGMENT_MIN_SECONDS = 25.0
 SHORT_OPTION_SEGMENT_MAX_SECONDS = 35.0
+BELL_DETECTION_SAMPLE_RATE = 8000
+ASR_SAMPLE_RATE = 16000
+ASR_PAD_SECONDS = 0.9
+ASR_BATCH_SIZE = 16
+MIN_UTTERANCE_MS = 300
+GENDER_MODES = ("turns", "full", "off")
 
 QUESTION_NUMBER_PATTERNS = [
     (re.compile(r"^(?:れい|レイ|例)(?:$|[。、「」『』\s]|を|で|は|の|だ|です)"), 0),
@@ -526,13 +537,64 @@ def _format_jlpt_master(chunks_data: Sequence[dict]) -> str:
     return "\n".join(output).strip()
 
 
+def _audio_source(audio: "bytes | BinaryIO") -> BinaryIO:
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return io.BytesIO(audio)
+    audio.seek(0)
+    return audio
+
+
+def decode_audio(audio_bytes: "bytes | BinaryIO", suffix: str = ".mp3") -> tuple["np.ndarray", int]:
+    """Decode an upload once into a mono float32 buffer at its native sample rate.
+
+    ``audio_bytes`` may also be a seekable binary file or a read-only ``mmap``,
+    which is decoded in place without copying the encoded bytes.
+    """
+    import numpy as np
+
+    try:
+        import soundfile as sf
+
+        samples, sample_rate = sf.read(_audio_source(audio_bytes), dtype="float32", always_2d=True)
+        mono = samples[:, 0] if samples.shape[1] == 1 else samples.mean(axis=1)
+        return np.ascontiguousarray(mono, dtype=np.float32), int(sample_rate)
+    except Exception:
+        from pydub import AudioSegment
+
+        audio = AudioSegment.from_file(
+            _audio_source(audio_bytes), format=(suffix or ".mp3").lstrip(".")
+        )
+        samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+        if audio.channels > 1:
+            samples = samples.reshape(-1, audio.channels).mean(axis=1)
+        samples /= float(1 << (8 * audio.sample_width - 1))
+        return samples.astype(np.float32, copy=False), audio.frame_rate
+
+
+def encode_wav(samples: "np.ndarray", sample_rate: int) -> bytes:
+    """Encode a float buffer as 16-bit PCM WAV; only used when audio has to be persisted."""
+    import soundfile as sf
+
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+def _ms_to_frame(ms: int, sample_rate: int) -> int:
+    return int(ms * sample_rate / 1000)
+
+
+def _frames_to_ms(frame_count: int, sample_rate: int) -> int:
+    return int(round(frame_count * 1000 / sample_rate))
+
+
 @dataclass
 class SplitAudioChunk:
     segment_index: int
     file_name: str
     start_ms: int
     end_ms: int
-    audio_bytes: bytes
+    audio_bytes: bytes = b""
     transcript: str = ""
     timestamped_transcript: str = ""
     refined_transcript: str = ""
@@ -541,6 +603,22 @@ class SplitAudioChunk:
     question_texts: list[str] = field(default_factory=list)
     spoken_question_number: Optional[int] = None
     announced_mondai_number: Optional[int] = None
+    samples: Optional["np.ndarray"] = field(default=None, repr=False)
+    sample_rate: int = 0
+
+    def pcm(self) -> tuple["np.ndarray", int]:
+        """Return ``(samples, sample_rate)``, decoding ``audio_bytes`` only if no buffer is attached."""
+        if self.samples is None:
+            self.samples, self.sample_rate = decode_audio(
+                self.audio_bytes, Path(self.file_name).suffix or ".wav"
+            )
+        return self.samples, self.sample_rate
+
+    def wav_bytes(self) -> bytes:
+        if not self.audio_bytes:
+            samples, sample_rate = self.pcm()
+            self.audio_bytes = encode_wav(samples, sample_rate)
+        return self.audio_bytes
 
 
 @dataclass
@@ -567,7 +645,12 @@ class BellAudioSplitter:
         trap_window_sec: float = 4.0,
         trim_before_next_bell_ms: int = 100,
         min_segment_length_ms: int = 1500,
+        detection_sample_rate: int = BELL_DETECTION_SAMPLE_RATE,
+        detection_block_sec: float = 30.0,
+        template_cache: Optional["BellTemplateCache"] = None,
     ):
+        from app.modules.ai_exam.bell_detection import bell_template_cache
+
         self.bell1_path = bell1_path
         self.bell2_path = bell2_path
         self.threshold_percent = threshold_percent
@@ -575,22 +658,93 @@ class BellAudioSplitter:
         self.trap_window_sec = trap_window_sec
         self.trim_before_next_bell_ms = trim_before_next_bell_ms
         self.min_segment_length_ms = min_segment_length_ms
+        self.detection_sample_rate = detection_sample_rate
+        self.detection_block_sec = detection_block_sec
+        self.template_cache = template_cache or bell_template_cache
 
     def _ensure_assets(self) -> None:
         missing = [str(path) for path in (self.bell1_path, self.bell2_path) if not path.exists()]
         if missing:
             raise RuntimeError(f"Bell sample file not found: {', '.join(missing)}")
 
+    def _select_valid_bells(
+        self, bell1_times_sec: Sequence[float], bell2_times_sec: Sequence[float]
+    ) -> list[int]:
+        valid_bell_times_ms: list[int] = []
+        for bell_time in bell1_times_sec:
+            if any(
+                abs(bell_time - trap_time) < self.trap_window_sec for trap_time in bell2_times_sec
+            ):
+                continue
+            bell_ms = int(bell_time * 1000)
+            if (
+                valid_bell_times_ms
+                and bell_ms - valid_bell_times_ms[-1] < self.min_segment_length_ms
+            ):
+                continue
+            valid_bell_times_ms.append(bell_ms)
+        return valid_bell_times_ms
+
+    def _build_detector(self) -> "StreamingBellDetector":
+        from app.modules.ai_exam.bell_detection import StreamingBellDetector
+
+        self._ensure_assets()
+        template_set = self.template_cache.get(
+            (self.bell1_path, self.bell2_path),
+            self.detection_sample_rate,
+            block_sec=self.detection_block_sec,
+        )
+        return StreamingBellDetector(
+            template_set,
+            threshold_percent=self.threshold_percent,
+            min_distance_sec=self.min_distance_sec,
+        )
+
+    def warm_template_cache(self) -> None:
+        self._ensure_assets()
+        self.template_cache.get(
+            (self.bell1_path, self.bell2_path),
+            self.detection_sample_rate,
+            block_sec=self.detection_block_sec,
+        )
+
+    def template_cache_stats(self) -> dict:
+        return self.template_cache.stats()
+
     def find_question_starts(self, audio_path: str) -> list[int]:
-        import librosa
+        """Detect valid bells while streaming ``audio_path`` from disk in blocks."""
+        from app.modules.ai_exam.bell_detection import iter_file_blocks, iter_sample_blocks
+
+        detector = self._build_detector()
+        try:
+            blocks, sample_rate = iter_file_blocks(audio_path, self.detection_block_sec)
+        except Exception:
+            samples, sample_rate = decode_audio(
+                Path(audio_path).read_bytes(), Path(audio_path).suffix
+            )
+            blocks = iter_sample_blocks(samples, int(self.detection_block_sec * sample_rate))
+        bell1_times_sec, bell2_times_sec = detector.detect(blocks, sample_rate)
+        return self._select_valid_bells(bell1_times_sec, bell2_times_sec)
+
+    def find_question_starts_in_samples(self, main_audio: "np.ndarray", sr: int) -> list[int]:
+        """Detect valid bells in a decoded buffer, correlating it block by block."""
+        from app.modules.ai_exam.bell_detection import iter_sample_blocks
+
+        detector = self._build_detector()
+        blocks = iter_sample_blocks(main_audio, max(1, int(self.detection_block_sec * sr)))
+        bell1_times_sec, bell2_times_sec = detector.detect(blocks, sr)
+        return self._select_valid_bells(bell1_times_sec, bell2_times_sec)
+
+    def _find_question_starts_full_length(self, main_audio: "np.ndarray", sr: int) -> list[int]:
+        """Reference detector: full-length correlation at the native sample rate."""
         import numpy as np
         from scipy import signal
 
         self._ensure_assets()
 
-        main_audio, sr = librosa.load(audio_path, sr=None, mono=True)
-        bell1_audio, _ = librosa.load(str(self.bell1_path), sr=sr, mono=True)
-        bell2_audio, _ = librosa.load(str(self.bell2_path), sr=sr, mono=True)
+        bell1_audio, bell2_audio = self.template_cache.get(
+            (self.bell1_path, self.bell2_path), sr
+        ).templates
 
         corr2 = signal.correlate(main_audio, bell2_audio, mode="valid", method="fft")
         thresh2 = float(np.max(corr2)) * self.threshold_percent
@@ -602,83 +756,76 @@ class BellAudioSplitter:
         peaks1, _ = signal.find_peaks(corr1, height=thresh1, distance=sr * self.min_distance_sec)
         bell1_times_sec = [peak / sr for peak in peaks1]
 
-        valid_bell_times_ms: list[int] = []
-        for bell_time in bell1_times_sec:
-            if any(abs(bell_time - trap_time) < self.trap_window_sec for trap_time in bell2_times_sec):
-                continue
-            bell_ms = int(bell_time * 1000)
-            if valid_bell_times_ms and bell_ms - valid_bell_times_ms[-1] < self.min_segment_length_ms:
-                continue
-            valid_bell_times_ms.append(bell_ms)
-
-        return valid_bell_times_ms
-
-    def _build_full_audio_segment(self, audio_path: str) -> SplitAudioChunk:
-        from pydub import AudioSegment
+        return self._select_valid_bells(bell1_times_sec, bell2_times_sec)
 
-        audio = AudioSegment.from_file(audio_path)
-        if len(audio) < self.min_segment_length_ms:
+    def _build_full_audio_segment(self, samples: "np.ndarray", sample_rate: int) -> SplitAudioChunk:
+        duration_ms = _frames_to_ms(len(samples), sample_rate)
+        if duration_ms < self.min_segment_length_ms:
             raise RuntimeError("Audio is too short to process.")
 
-        buffer = io.BytesIO()
-        audio.export(buffer, format="wav")
         return SplitAudioChunk(
             segment_index=1,
             file_name="segment_01.wav",
             start_ms=0,
-            end_ms=len(audio),
-            audio_bytes=buffer.getvalue(),
+            end_ms=duration_ms,
+            samples=samples,
+            sample_rate=sample_rate,
         )
 
-    def split_audio(self, audio_bytes: bytes, suffix: str = ".mp3") -> list[SplitAudioChunk]:
-        from pydub import AudioSegment
-
-        with tempfile.NamedTemporaryFile(suffix=suffix or ".mp3", delete=False) as tmp:
-            tmp.write(audio_bytes)
-            tmp_path = tmp.name
+    def split_audio(
+        self, audio_bytes: "bytes | BinaryIO", suffix: str = ".mp3"
+    ) -> list[SplitAudioChunk]:
+        samples, sample_rate = decode_audio(audio_bytes, suffix or ".mp3")
+        return self.split_samples(samples, sample_rate)
+
+    def split_samples(self, samples: "np.ndarray", sample_rate: int) -> list[SplitAudioChunk]:
+        """Cut a decoded recording at valid bells; each segment is a view into ``samples``."""
+        bell_times_ms = self.find_question_starts_in_samples(samples, sample_rate)
+        if not bell_times_ms:
+            logger.warning(
+                "No valid bell timestamps found in audio. Falling back to a single full-length segment."
+            )
+            return [self._build_full_audio_segment(samples, sample_rate)]
 
-        try:
-            bell_times_ms = self.find_question_starts(tmp_path)
-            if not bell_times_ms:
+        duration_ms = _frames_to_ms(len(samples), sample_rate)
+        segments: list[SplitAudioChunk] = []
+        for index, start_ms in enumerate(bell_times_ms):
+            next_start_ms = (
+                bell_times_ms[index + 1] if index + 1 < len(bell_times_ms) else duration_ms
+            )
+            end_ms = (
+                next_start_ms - self.trim_before_next_bell_ms
+                if index + 1 < len(bell_times_ms)
+                else next_start_ms
+            )
+            end_ms = max(end_ms, start_ms)
+            if end_ms - start_ms < self.min_segment_length_ms:
                 logger.warning(
-                    "No valid bell timestamps found in audio. Falling back to a single full-length segment."
+                    "Skipping split segment %s because it is too short: %.2fs",
+                    index + 1,
+                    (end_ms - start_ms) / 1000.0,
                 )
-                return [self._build_full_audio_segment(tmp_path)]
-
-            audio = AudioSegment.from_file(tmp_path)
-            segments: list[SplitAudioChunk] = []
-            for index, start_ms in enumerate(bell_times_ms):
-                next_start_ms = bell_times_ms[index + 1] if index + 1 < len(bell_times_ms) else len(audio)
-                end_ms = next_start_ms - self.trim_before_next_bell_ms if index + 1 < len(bell_times_ms) else next_start_ms
-                end_ms = max(end_ms, start_ms)
-                if end_ms - start_ms < self.min_segment_length_ms:
-                    logger.warning(
-                        "Skipping split segment %s because it is too short: %.2fs",
-                        index + 1,
-                        (end_ms - start_ms) / 1000.0,
-                    )
-                    continue
-
-                chunk = audio[start_ms:end_ms]
-                buffer = io.BytesIO()
-                chunk.export(buffer, format="wav")
-                segments.append(
-                    SplitAudioChunk(
-                        segment_index=len(segments) + 1,
-                        file_name=f"segment_{len(segments) + 1:02d}.wav",
-                        start_ms=start_ms,
-                        end_ms=end_ms,
-                        audio_bytes=buffer.getvalue(),
-                    )
+                continue
+
+            segments.append(
+                SplitAudioChunk(
+                    segment_index=len(segments) + 1,
+                    file_name=f"segment_{len(segments) + 1:02d}.wav",
+                    start_ms=start_ms,
+                    end_ms=end_ms,
+                    samples=samples[
+                        _ms_to_frame(start_ms, sample_rate) : _ms_to_frame(end_ms, sample_rate)
+                    ],
+                    sample_rate=sample_rate,
                 )
+            )
 
-            if not segments:
-                raise RuntimeError("Bell timestamps were detected, but no usable audio segments were produced.")
+        if not segments:
+            raise RuntimeError(
+                "Bell timestamps were detected, but no usable audio segments were produced."
+            )
 
-            return segments
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        return segments
 
 
 class ReazonTranscriber:
@@ -686,8 +833,19 @@ class ReazonTranscriber:
 
     NOISE_PATTERN = re.compile(r"(ピン|パン|プッ|ピッ|プ|ピ)")
 
-    def __init__(self, model_version: str = "reazonspeech-k2-v2"):
+    def __init__(
+        self,
+        model_version: str = "reazonspeech-k2-v2",
+        batch_size: int = ASR_BATCH_SIZE,
+        gender_mode: str = "turns",
+        gender_batch_size: int = 8,
+        segment_cache: Optional["SegmentTranscriptCache"] = None,
+    ):
         self.model_version = model_version
+        self.batch_size = batch_size
+        self.gender_mode = gender_mode
+        self.gender_batch_size = gender_batch_size
+        self.segment_cache = segment_cache
         self._model = None
         self._gender_classifier = None
         self._gender_classifier_attempted = False
@@ -727,137 +885,391 @@ class ReazonTranscriber:
         text = re.sub(r"\s+", "", text)
         return text.strip()
 
-    def _predict_gender(self, audio_path: str) -> str:
+    def _predict_genders(self, waveforms: Sequence["np.ndarray"]) -> list[str]:
+        """Classify 16 kHz utterances in one batched pipeline call."""
+        if not waveforms:
+            return []
         self._load_gender_classifier()
         if self._gender_classifier is None:
-            return "Unknown"
+            return ["Unknown"] * len(waveforms)
         try:
-            prediction = self._gender_classifier(audio_path)
-            top_label = prediction[0]["label"].lower()
-            return "男" if top_label == "male" else "女"
+            predictions = self._gender_classifier(
+                [{"raw": waveform, "sampling_rate": ASR_SAMPLE_RATE} for waveform in waveforms],
+                batch_size=self.gender_batch_size,
+            )
+            if len(waveforms) == 1 and predictions and isinstance(predictions[0], dict):
+                predictions = [predictions]
+            return [
+                "男" if prediction[0]["label"].lower() == "male" else "女"
+                for prediction in predictions
+            ]
         except Exception as exc:
-            logger.warning("Gender classification failed for %s: %s", audio_path, exc)
-            return "Unknown"
+            logger.warning("Gender classification failed: %s", exc)
+            return ["Unknown"] * len(waveforms)
 
-    def transcribe(self, audio_bytes: bytes, suffix: str = ".wav", base_offset_ms: int = 0) -> dict:
-        try:
-            from pydub import AudioSegment
-            from pydub.silence import detect_nonsilent, split_on_silence
-            from reazonspeech.k2.asr import audio_from_path, transcribe
-        except ImportError as exc:
-            raise RuntimeError(f"Missing dependency: {exc}") from exc
+    def _predict_gender(self, waveform: "np.ndarray") -> str:
+        return self._predict_genders([waveform])[0]
 
-        if self._model is None:
-            self._load_model()
+    def _assign_genders(
+        self,
+        per_segment_waveforms: Sequence[Sequence["np.ndarray"]],
+        gender_mode: str,
+    ) -> list[list[str]]:
+        """Label every kept utterance, running the classifier once per speaker turn in ``turns`` mode."""
+        from app.modules.ai_exam.speaker_gender import (
+            estimate_pitch_hz,
+            gender_inference_stats,
+            group_speaker_turns,
+        )
 
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            tmp.write(audio_bytes)
-            tmp_path = tmp.name
+        utterance_count = sum(len(waveforms) for waveforms in per_segment_waveforms)
+        labels = [["Unknown"] * len(waveforms) for waveforms in per_segment_waveforms]
+        if gender_mode == "off":
+            gender_inference_stats.record(utterance_count, 0, 0, utterance_count)
+            return labels
 
-        try:
-            audio = AudioSegment.from_file(tmp_path)
-            silence_thresh = audio.dBFS - 14 if audio.dBFS != float("-inf") else -50
-            keep_silence = 150
-            chunks = split_on_silence(
-                audio,
-                min_silence_len=400,
-                silence_thresh=silence_thresh,
-                keep_silence=keep_silence,
-            )
-            raw_ranges = detect_nonsilent(
-                audio,
-                min_silence_len=400,
-                silence_thresh=silence_thresh,
+        turns: list[tuple[int, list[int]]] = []
+        for segment_position, waveforms in enumerate(per_segment_waveforms):
+            if gender_mode == "full":
+                turns.extend((segment_position, [index]) for index in range(len(waveforms)))
+                continue
+            pitches = [estimate_pitch_hz(waveform, ASR_SAMPLE_RATE) for waveform in waveforms]
+            turns.extend((segment_position, turn) for turn in group_speaker_turns(pitches))
+
+        # The longest utterance in a turn gives the classifier the most evidence.
+        representatives = [
+            max((per_segment_waveforms[segment_position][index] for index in turn), key=len)
+            for segment_position, turn in turns
+        ]
+        predictions = self._predict_genders(representatives)
+        for (segment_position, turn), gender in zip(turns, predictions):
+            for index in turn:
+                labels[segment_position][index] = gender
+
+        classifier_calls = len(turns) if self._gender_classifier is not None else 0
+        gender_inference_stats.record(
+            utterance_count, classifier_calls, utterance_count - len(turns), 0
+        )
+        return labels
+
+    def _split_utterances(
+        self, samples: "np.ndarray", sample_rate: int
+    ) -> list[tuple["np.ndarray", int]]:
+        """Split one bell segment on silence into ``(utterance_view, utterance_start_ms)`` pairs.
+
+        Utterance audio follows ``pydub.silence.split_on_silence`` (overlapping
+        padding is split at the midpoint) while the start timestamp is clamped
+        to the neighbouring non-silent ranges.
+        """
+        from app.modules.ai_exam.vad import (
+            detect_nonsilent_ranges,
+            dbfs,
+            duration_ms,
+            pad_ranges,
+            to_pcm16,
+        )
+
+        pcm16 = to_pcm16(samples)
+        length_ms = duration_ms(len(pcm16), sample_rate)
+        segment_dbfs = dbfs(pcm16)
+        silence_thresh = segment_dbfs - 14 if segment_dbfs != float("-inf") else -50
+        keep_silence = 150
+        raw_ranges = detect_nonsilent_ranges(
+            pcm16,
+            sample_rate,
+            min_silence_len=400,
+            silence_thresh=silence_thresh,
+        )
+        if not raw_ranges:
+            if length_ms < MIN_UTTERANCE_MS:
+                return []
+            return [(samples, 0)]
+
+        audio_ranges = pad_ranges(raw_ranges, keep_silence, length_ms)
+        utterances: list[tuple["np.ndarray", int]] = []
+        for index, (start_ms, end_ms) in enumerate(raw_ranges):
+            audio_start_ms, audio_end_ms = audio_ranges[index]
+            if audio_end_ms - audio_start_ms < MIN_UTTERANCE_MS:
+                continue
+            chunk_start_ms = max(0, start_ms - keep_silence)
+            if index > 0:
+                chunk_start_ms = max(chunk_start_ms, raw_ranges[index - 1][1])
+            utterances.append(
+                (
+                    samples[
+                        _ms_to_frame(audio_start_ms, sample_rate) : _ms_to_frame(
+                            audio_end_ms, sample_rate
+                        )
+                    ],
+                    chunk_start_ms,
+                )
             )
-            chunk_ranges: list[tuple[int, int]] = []
-            for index, (start_ms, end_ms) in enumerate(raw_ranges):
-                next_start_ms = raw_ranges[index + 1][0] if index + 1 < len(raw_ranges) else None
-                prev_end_ms = raw_ranges[index - 1][1] if index > 0 else None
-                adjusted_start_ms = max(0, start_ms - keep_silence)
-                adjusted_end_ms = min(len(audio), end_ms + keep_silence)
-                if prev_end_ms is not None:
-                    adjusted_start_ms = max(adjusted_start_ms, prev_end_ms)
-                if next_start_ms is not None:
-                    adjusted_end_ms = min(adjusted_end_ms, next_start_ms)
-                chunk_ranges.append((adjusted_start_ms, adjusted_end_ms))
-            if not chunks:
-                chunks = [audio]
-            if not chunk_ranges:
-                chunk_ranges = [(0, len(audio))]
-
-            chunk_dir = tempfile.mkdtemp(prefix="reazon_chunks_")
-            chunks_data: list[dict] = []
-            raw_parts: list[str] = []
-            timeline_parts: list[str] = []
-            fallback_cursor_ms = 0
+        return utterances
+
+    @staticmethod
+    def _to_model_rate(samples: "np.ndarray", sample_rate: int) -> "np.ndarray":
+        import numpy as np
+
+        if sample_rate != ASR_SAMPLE_RATE:
+            import librosa
+
+            samples = librosa.resample(samples, orig_sr=sample_rate, target_sr=ASR_SAMPLE_RATE)
+        return np.asarray(samples, dtype=np.float32)
+
+    def _decode_waveforms(self, waveforms: Sequence, batch_size: int) -> list[Optional[str]]:
+        """Decode 16 kHz waveforms with the k2 model, ``batch_size`` streams per call.
+
+        Waveforms are sorted by length before batching so each batch pads to a
+        similar duration. Returns texts in input order; ``None`` marks a failed decode.
+        """
+        import numpy as np
+
+        pad = np.zeros(int(ASR_PAD_SECONDS * ASR_SAMPLE_RATE), dtype=np.float32)
+        order = sorted(range(len(waveforms)), key=lambda index: len(waveforms[index]))
+        texts: list[Optional[str]] = [None] * len(waveforms)
+        batch_size = max(1, batch_size)
+
+        for batch_start in range(0, len(order), batch_size):
+            batch_indices = order[batch_start : batch_start + batch_size]
+            streams = []
+            for index in batch_indices:
+                stream = self._model.create_stream()
+                stream.accept_waveform(
+                    ASR_SAMPLE_RATE, np.concatenate([pad, waveforms[index], pad])
+                )
+                streams.append(stream)
             try:
-                for index, chunk in enumerate(chunks):
-                    if len(chunk) < 300:
-                        fallback_cursor_ms += len(chunk)
-                        continue
-                    chunk_path = os.path.join(chunk_dir, f"chunk_{index}.wav")
-                    chunk.export(chunk_path, format="wav")
+                if len(streams) == 1:
+                    self._model.decode_stream(streams[0])
+                else:
+                    self._model.decode_streams(streams)
+                decoded = list(zip(batch_indices, streams))
+            except Exception as exc:
+                logger.warning(
+                    "Batch decode of %s utterances failed, retrying one by one: %s",
+                    len(streams),
+                    exc,
+                )
+                decoded = []
+                for index, stream in zip(batch_indices, streams):
                     try:
-                        audio_content = audio_from_path(chunk_path)
-                        result = transcribe(self._model, audio_content)
-                        text = self._clean_text(result.text if result else "")
-                        if not text:
-                            fallback_cursor_ms += len(chunk)
-                            continue
-                        gender = self._predict_gender(chunk_path)
-                        raw_parts.append(text)
-                        chunks_data.append({"text": text, "gender": gender})
-                        if index < len(chunk_ranges):
-                            chunk_start_ms = chunk_ranges[index][0]
-                        else:
-                            chunk_start_ms = fallback_cursor_ms
-                        timestamp = _format_transcript_timestamp((base_offset_ms + chunk_start_ms) / 1000.0)
-                        timeline_parts.append(f"{timestamp}: {text}")
-                    except Exception as exc:
-                        logger.warning("Chunk %s transcription error: %s", index, exc)
-                    finally:
-                        fallback_cursor_ms += len(chunk)
-                        if os.path.exists(chunk_path):
-                            os.remove(chunk_path)
-            finally:
-                shutil.rmtree(chunk_dir, ignore_errors=True)
-
-            raw_text = "".join(raw_parts)
-            formatted_text = _format_jlpt_master(chunks_data) or raw_text
-            introduction, script_text, question_texts, spoken_number, announced_mondai_number = _parse_formatted_segment(
+                        self._model.decode_stream(stream)
+                        decoded.append((index, stream))
+                    except Exception as inner_exc:
+                        logger.warning("Utterance %s transcription error: %s", index, inner_exc)
+            for index, stream in decoded:
+                texts[index] = stream.result.text
+        return texts
+
+    def _build_transcript_result(
+        self, utterance_results: Sequence[tuple[str, str, int]], base_offset_ms: int
+    ) -> dict:
+        chunks_data: list[dict] = []
+        raw_parts: list[str] = []
+        timeline_parts: list[str] = []
+        for text, gender, chunk_start_ms in utterance_results:
+            raw_parts.append(text)
+            chunks_data.append({"text": text, "gender": gender})
+            timestamp = _format_transcript_timestamp((base_offset_ms + chunk_start_ms) / 1000.0)
+            timeline_parts.append(f"{timestamp}: {text}")
+
+        raw_text = "".join(raw_parts)
+        formatted_text = _format_jlpt_master(chunks_data) or raw_text
+        introduction, script_text, question_texts, spoken_number, announced_mondai_number = (
+            _parse_formatted_segment(
                 formatted_text,
                 raw_text,
             )
-            return {
-                "raw_text": raw_text,
-                "timestamped_raw_text": "\n".join(timeline_parts).strip(),
-                "formatted_text": formatted_text,
-                "introduction": introduction,
-                "script_text": script_text,
-                "question_texts": question_texts,
-                "spoken_question_number": spoken_number,
-                "announced_mondai_number": announced_mondai_number,
-            }
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        )
+        return {
+            "raw_text": raw_text,
+            "timestamped_raw_text": "\n".join(timeline_parts).strip(),
+            "formatted_text": formatted_text,
+            "introduction": introduction,
+            "script_text": script_text,
+            "question_texts": question_texts,
+            "spoken_question_number": spoken_number,
+            "announced_mondai_number": announced_mondai_number,
+        }
+
+    def transcribe_batch(
+        self,
+        segments: Sequence[tuple["np.ndarray", int, int]],
+        batch_size: Optional[int] = None,
+        gender_mode: Optional[str] = None,
+    ) -> list[dict]:
+        """Transcribe many bell segments with one pooled set of k2 decode calls.
+
+        ``segments`` holds ``(samples, sample_rate, base_offset_ms)`` tuples.
+        Every silence-split utterance from every segment is decoded together in
+        batches of ``batch_size`` and the texts are mapped back to their
+        segment and timestamp. Results are returned in input order.
+
+        ``gender_mode`` overrides the transcriber default: ``"turns"`` runs the
+        classifier once per pitch-grouped speaker turn, ``"full"`` once per
+        utterance, and ``"off"`` never.
+
+        With a ``segment_cache``, segments whose PCM fingerprint matches a
+        stored transcript for the same model version and gender mode skip
+        the model entirely.
+        """
+        gender_mode = gender_mode or self.gender_mode
+        if gender_mode not in GENDER_MODES:
+            raise ValueError(
+                f"Unknown gender_mode {gender_mode!r}; expected one of {GENDER_MODES}."
+            )
+        batch_size = self.batch_size if batch_size is None else batch_size
+
+        per_segment: list[Optional[list[tuple[str, str, int]]]] = [None] * len(segments)
+        fingerprints: list = [None] * len(segments)
+        cache_version = None
+        if self.segment_cache is not None:
+            from app.modules.ai_exam.segment_cache import segment_fingerprint
+
+            cache_version = self.segment_cache.cache_version(self.model_version, gender_mode)
+            for segment_position, (samples, sample_rate, _) in enumerate(segments):
+                try:
+                    fingerprints[segment_position] = segment_fingerprint(samples, sample_rate)
+                    per_segment[segment_position] = self.segment_cache.get(
+                        fingerprints[segment_position],
+                        cache_version,
+                    )
+                except Exception as exc:
+                    logger.warning("Segment transcript cache lookup failed: %s", exc)
+
+        pending = [position for position, cached in enumerate(per_segment) if cached is None]
+        if pending:
+            transcribed = self._transcribe_utterances(
+                [segments[position] for position in pending],
+                batch_size,
+                gender_mode,
+            )
+            for position, utterance_results in zip(pending, transcribed):
+                per_segment[position] = utterance_results
+                if fingerprints[position] is not None:
+                    try:
+                        self.segment_cache.put(
+                            fingerprints[position], cache_version, utterance_results
+                        )
+                    except Exception as exc:
+                        logger.warning("Segment transcript cache store failed: %s", exc)
+        if self.segment_cache is not None:
+            logger.info(
+                "Segment transcript cache: %s/%s segments reused.",
+                len(segments) - len(pending),
+                len(segments),
+            )
+
+        return [
+            self._build_transcript_result(utterance_results, base_offset_ms)
+            for utterance_results, (_, _, base_offset_ms) in zip(per_segment, segments)
+        ]
+
+    def _transcribe_utterances(
+        self,
+        segments: Sequence[tuple["np.ndarray", int, int]],
+        batch_size: int,
+        gender_mode: str,
+    ) -> list[list[tuple[str, str, int]]]:
+        """Return ``(text, gender, utterance_start_ms)`` lists per segment, decoding every utterance together."""
+        if self._model is None:
+            self._load_model()
+
+        owners: list[tuple[int, int]] = []
+        waveforms: list = []
+        for segment_position, (samples, sample_rate, _) in enumerate(segments):
+            for utterance, chunk_start_ms in self._split_utterances(samples, sample_rate):
+                owners.append((segment_position, chunk_start_ms))
+                waveforms.append(self._to_model_rate(utterance, sample_rate))
+
+        texts = self._decode_waveforms(waveforms, batch_size)
+
+        kept: list[list[tuple[str, int]]] = [[] for _ in segments]
+        kept_waveforms: list[list["np.ndarray"]] = [[] for _ in segments]
+        for (segment_position, chunk_start_ms), waveform, text in zip(owners, waveforms, texts):
+            text = self._clean_text(text or "")
+            if not text:
+                continue
+            kept[segment_position].append((text, chunk_start_ms))
+            kept_waveforms[segment_position].append(waveform)
+
+        genders = self._assign_genders(kept_waveforms, gender_mode)
+        return [
+            [
+                (text, gender, chunk_start_ms)
+                for (text, chunk_start_ms), gender in zip(segment_kept, segment_genders)
+            ]
+            for segment_kept, segment_genders in zip(kept, genders)
+        ]
+
+    def transcribe(self, audio_bytes: bytes, suffix: str = ".wav", base_offset_ms: int = 0) -> dict:
+        """Transcribe one encoded segment, decoding its utterances one model call at a time."""
+        samples, sample_rate = decode_audio(audio_bytes, suffix)
+        return self.transcribe_batch([(samples, sample_rate, base_offset_ms)], batch_size=1)[0]
+
+
+def _load_segment_cache() -> Optional["SegmentTranscriptCache"]:
+    from app.modules.ai_exam.segment_cache import get_segment_transcript_cache
+
+    try:
+        return get_segment_transcript_cache()
+    except Exception as exc:
+        logger.warning("Segment transcript cache disabled: %s", exc)
+        return None
 
 
 class AIExamService:
     """Split by bell first, then transcribe each cut with local ReazonSpeech formatting."""
 
     def __init__(self):
+        settings = get_settings()
         self._splitter = BellAudioSplitter()
-        self._reazon = ReazonTranscriber()
+        self._reazon = ReazonTranscriber(
+            batch_size=settings.AI_EXAM_ASR_BATCH_SIZE,
+            gender_mode=settings.AI_EXAM_GENDER_MODE,
+            segment_cache=_load_segment_cache(),
+        )
+        self._asr_pool = None
+        self._clip_materializer = None
+        if settings.AI_EXAM_LOCAL_CLIPS:
+            from app.modules.ai_exam.clips import ClipMaterializer
+            from app.shared.clip_store import get_clip_store
+
+            self._clip_materializer = ClipMaterializer(
+                get_clip_store(),
+                workers=settings.AI_EXAM_CLIP_ENCODE_WORKERS,
+            )
         try:
-            self._reazon._load_model()
+            self._splitter.warm_template_cache()
         except Exception as exc:
-            logger.warning("Failed to eagerly load ReazonSpeech model: %s", exc)
+            logger.warning("Failed to warm bell template cache: %s", exc)
+        if settings.AI_EXAM_ASR_WORKERS > 0:
+            from app.modules.ai_exam.transcription_pool import ReazonProcessPool
+
+            self._asr_pool = ReazonProcessPool(
+                workers=settings.AI_EXAM_ASR_WORKERS,
+                threads_per_worker=settings.AI_EXAM_ASR_THREADS_PER_WORKER,
+                model_version=self._reazon.model_version,
+                batch_size=settings.AI_EXAM_ASR_BATCH_SIZE,
+            )
+            try:
+                self._asr_pool.warm_up()
+            except Exception as exc:
+                logger.warning(
+                    "Failed to start ReazonSpeech worker pool, transcribing in-process: %s", exc
+                )
+                self._asr_pool.shutdown()
+                self._asr_pool = None
+        if self._asr_pool is None:
+            try:
+                self._reazon._load_model()
+            except Exception as exc:
+                logger.warning("Failed to eagerly load ReazonSpeech model: %s", exc)
         self.planner = MIAPlanner()
 
     def generate(
         self,
-        audio_bytes: bytes,
+        audio_bytes: "bytes | BinaryIO",
         filename: str,
         jlpt_level: str = "N2",
         mondai_config: Optional[list] = None,
@@ -865,6 +1277,7 @@ class AIExamService:
         cloudinary_format: Optional[str] = "mp3",
         progress_callback: Optional[Callable[[str], None]] = None,
         user_id: Optional[int] = None,
+        gender_mode: Optional[str] = None,
     ) -> AIExamResult:
         self._notify(progress_callback, "Step 2/7: Detecting bell timestamps...")
         split_segments = self._splitter.split_audio(audio_bytes, suffix=Path(filename).suffix or ".mp3")
@@ -874,21 +1287,65 @@ class AIExamService:
         split_segments = list(split_segments)
 
         self._notify(progress_callback, "Step 4/7: ReazonSpeech transcribing split audio...")
-        for segment in split_segments:
-            transcript_result = self._reazon.transcribe(
-                segment.audio_bytes,
-                suffix=".wav",
-                base_offset_ms=segment.start_ms,
+        self._transcribe_segments(split_segments, gender_mode=gender_mode)
+
+        return self._build_result(
+            split_segments,
+            jlpt_level=jlpt_level,
+            cloudinary_public_id=cloudinary_public_id,
+            cloudinary_format=cloudinary_format,
+            progress_callback=progress_callback,
+        )
+
+    def rederive(
+        self,
+        stored: AIExamResult,
+        jlpt_level: str = "N2",
+        mondai_config: Optional[list] = None,
+        cloudinary_public_id: Optional[str] = None,
+        cloudinary_format: Optional[str] = "mp3",
+    ) -> AIExamResult:
+        """Re-run steps 5-7 from the per-segment transcripts persisted in ``stored``.
+
+        Raises ``ValueError`` when ``stored`` predates persisted ASR fields.
+        """
+        if not stored.split_segments or any(
+            segment.timestamped_transcript is None for segment in stored.split_segments
+        ):
+            raise ValueError("Stored result has no per-segment ASR fields to re-derive from.")
+
+        split_segments = [
+            SplitAudioChunk(
+                segment_index=segment.segment_index,
+                file_name=segment.file_name,
+                start_ms=round(segment.start_time * 1000),
+                end_ms=round(segment.end_time * 1000),
+                transcript=segment.transcript,
+                timestamped_transcript=segment.timestamped_transcript,
+                refined_transcript=segment.refined_transcript or "",
+                introduction=segment.introduction,
+                script_text=segment.script_text or "",
+                question_texts=list(segment.question_texts),
+                spoken_question_number=segment.spoken_question_number,
+                announced_mondai_number=segment.announced_mondai_number,
             )
-            segment.transcript = transcript_result["raw_text"]
-            segment.timestamped_transcript = transcript_result.get("timestamped_raw_text", "").strip()
-            segment.refined_transcript = transcript_result["formatted_text"]
-            segment.introduction = transcript_result["introduction"]
-            segment.script_text = transcript_result["script_text"]
-            segment.question_texts = transcript_result["question_texts"]
-            segment.spoken_question_number = transcript_result["spoken_question_number"]
-            segment.announced_mondai_number = transcript_result.get("announced_mondai_number")
+            for segment in stored.split_segments
+        ]
+        return self._build_result(
+            split_segments,
+            jlpt_level=jlpt_level,
+            cloudinary_public_id=cloudinary_public_id,
+            cloudinary_format=cloudinary_format,
+        )
 
+    def _build_result(
+        self,
+        split_segments: Sequence[SplitAudioChunk],
+        jlpt_level: str,
+        cloudinary_public_id: Optional[str] = None,
+        cloudinary_format: Optional[str] = "mp3",
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> AIExamResult:
         self._notify(progress_callback, "Step 5/7: Formatting scripts with local Reazon rules...")
         structured_segments = self._build_structured_segments(split_segments, jlpt_level=jlpt_level)
 
@@ -905,12 +1362,20 @@ class AIExamService:
                 end_time=segment.end_ms / 1000.0,
                 transcript=segment.transcript,
                 refined_transcript=segment.refined_transcript or None,
+                timestamped_transcript=segment.timestamped_transcript,
+                introduction=segment.introduction,
+                script_text=segment.script_text,
+                question_texts=list(segment.question_texts),
+                spoken_question_number=segment.spoken_question_number,
+                announced_mondai_number=segment.announced_mondai_number,
             )
             for segment in split_segments
         ]
 
+        self._notify(progress_callback, "Step 7/7: Attaching clipped audio URLs...")
         if cloudinary_public_id:
             self._attach_audio_urls(questions, cloudinary_public_id, cloudinary_format or "mp3")
+        self._attach_local_clip_urls(questions, split_segments)
 
         result = AIExamResult(
             raw_transcript=raw_transcript,
@@ -923,12 +1388,50 @@ class AIExamService:
 
     @property
     def model_name(self) -> str:
-        return "reazonspeech-local"
+        return MODEL_NAME
 
     @property
     def pipeline_version(self) -> str:
         return PIPELINE_VERSION
 
+    def _transcribe_segments(
+        self,
+        split_segments: Sequence[SplitAudioChunk],
+        gender_mode: Optional[str] = None,
+    ) -> None:
+        """Run ASR over every bell segment, batching utterances across segments when supported."""
+        if getattr(self, "_asr_pool", None) is not None:
+            transcript_results = self._asr_pool.transcribe_batch(
+                [(*segment.pcm(), segment.start_ms) for segment in split_segments],
+                gender_mode=gender_mode or self._reazon.gender_mode,
+            )
+        elif hasattr(self._reazon, "transcribe_batch"):
+            transcript_results = self._reazon.transcribe_batch(
+                [(*segment.pcm(), segment.start_ms) for segment in split_segments],
+                gender_mode=gender_mode,
+            )
+        else:
+            transcript_results = [
+                self._reazon.transcribe(
+                    segment.wav_bytes(),
+                    suffix=".wav",
+                    base_offset_ms=segment.start_ms,
+                )
+                for segment in split_segments
+            ]
+
+        for segment, transcript_result in zip(split_segments, transcript_results):
+            segment.transcript = transcript_result["raw_text"]
+            segment.timestamped_transcript = transcript_result.get(
+                "timestamped_raw_text", ""
+            ).strip()
+            segment.refined_transcript = transcript_result["formatted_text"]
+            segment.introduction = transcript_result["introduction"]
+            segment.script_text = transcript_result["script_text"]
+            segment.question_texts = transcript_result["question_texts"]
+            segment.spoken_question_number = transcript_result["spoken_question_number"]
+            segment.announced_mondai_number = transcript_result.get("announced_mondai_number")
+
     @staticmethod
     def _notify(progress_callback: Optional[Callable[[str], None]], message: str) -> None:
         if progress_callback:
@@ -1177,6 +1680,44 @@ class AIExamService:
             )
         return timestamps
 
+    def _attach_local_clip_urls(
+        self,
+        questions: Sequence[AIQuestion],
+        split_segments: Sequence[SplitAudioChunk],
+    ) -> None:
+        """Cut each question's clip from its in-memory segment and point ``audio_url`` at the stored copy.
+
+        The Cloudinary offset URL it replaces stays on the clip URL as its
+        source, for the exam editor's trimmer. Questions whose segment has no
+        decoded audio (re-derived results) keep the offset URL.
+        """
+        materializer = getattr(self, "_clip_materializer", None)
+        if materializer is None:
+            return
+        from app.shared.clip_store import clip_url
+
+        segments_by_index = {segment.segment_index: segment for segment in split_segments}
+        targets = []
+        for question in questions:
+            segment = segments_by_index.get(question.source_segment_index)
+            if segment is None or segment.samples is None or not len(segment.samples):
+                continue
+            targets.append((question, segment))
+        if not targets:
+            return
+
+        try:
+            keys = materializer.materialize(
+                [(segment.samples, segment.sample_rate) for _, segment in targets]
+            )
+        except Exception as exc:
+            logger.warning(
+                "Local clip materialization failed, falling back to Cloudinary offsets: %s", exc
+            )
+            return
+        for (question, _), key in zip(targets, keys):
+            question.audio_url = clip_url(key, source=question.audio_url)
+
     @staticmethod
     def _attach_audio_urls(
         questions: Sequence[AIQuestion],
@@ -1187,6 +1728,8 @@ class AIExamService:
         import cloudinary.utils
 
         for question in questions:
+            if question.audio_url:
+                continue
             if question.source_start_time is None or question.source_end_time is None:
                 logger.warning(
                     "Q(%s,%s): missing source timestamps, audio_url will be empty",
@@ -0,0 +1,104 @@
+"""Cheap speaker-turn grouping for the wav2vec2 gender classifier.
+
+The classifier is a full wav2vec2-large forward pass. Within one bell
+segment, consecutive utterances from the same voice have nearly the same
+median pitch. Utterances are grouped into turns by pitch, and the classifier
+runs once per turn.
+"""
+
+import math
+import threading
+from typing import Optional, Sequence
+
+import numpy as np
+
+PITCH_FRAME = 1024
+PITCH_HOP = 512
+PITCH_MIN_HZ = 60.0
+PITCH_MAX_HZ = 400.0
+VOICING_THRESHOLD = 0.3
+TURN_TOLERANCE_SEMITONES = 3.0
+
+
+def estimate_pitch_hz(waveform: np.ndarray, sample_rate: int) -> Optional[float]:
+    """Median autocorrelation F0 over the louder half of the frames, or None if unvoiced."""
+    waveform = np.asarray(waveform, dtype=np.float32)
+    if len(waveform) < PITCH_FRAME:
+        return None
+
+    frames = np.lib.stride_tricks.sliding_window_view(waveform, PITCH_FRAME)[::PITCH_HOP]
+    frames = frames - frames.mean(axis=1, keepdims=True)
+    energy = np.einsum("ij,ij->i", frames, frames)
+    loud = frames[energy >= max(np.median(energy), 1e-8)]
+    if len(loud) == 0:
+        return None
+
+    spectrum = np.fft.rfft(loud * np.hanning(PITCH_FRAME), 2 * PITCH_FRAME, axis=1)
+    autocorr = np.fft.irfft(np.abs(spectrum) ** 2, axis=1)[:, :PITCH_FRAME]
+    min_lag = int(sample_rate / PITCH_MAX_HZ)
+    max_lag = min(int(sample_rate / PITCH_MIN_HZ), PITCH_FRAME - 1)
+    lags = autocorr[:, min_lag:max_lag].argmax(axis=1) + min_lag
+    strength = autocorr[np.arange(len(loud)), lags] / np.maximum(autocorr[:, 0], 1e-12)
+    voiced = lags[strength >= VOICING_THRESHOLD]
+    if len(voiced) == 0:
+        return None
+    return float(sample_rate / np.median(voiced))
+
+
+def group_speaker_turns(
+    pitches: Sequence[Optional[float]],
+    tolerance_semitones: float = TURN_TOLERANCE_SEMITONES,
+) -> list[list[int]]:
+    """Group consecutive utterance indices whose pitch stays within ``tolerance_semitones``.
+
+    Unvoiced utterances (``None``) join the current turn.
+    """
+    turns: list[list[int]] = []
+    reference: Optional[float] = None
+    for index, pitch in enumerate(pitches):
+        if turns and (
+            pitch is None
+            or reference is None
+            or abs(12.0 * math.log2(pitch / reference)) <= tolerance_semitones
+        ):
+            turns[-1].append(index)
+            if reference is None:
+                reference = pitch
+            continue
+        turns.append([index])
+        reference = pitch
+    return turns
+
+
+class GenderInferenceStats:
+    """Process-wide counters for how often the heavy classifier actually ran."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.utterances = 0
+        self.classifier_calls = 0
+        self.saved_by_turns = 0
+        self.skipped_disabled = 0
+
+    def record(
+        self, utterances: int, classifier_calls: int, saved_by_turns: int, skipped_disabled: int
+    ) -> None:
+        with self._lock:
+            self.utterances += utterances
+            self.classifier_calls += classifier_calls
+            self.saved_by_turns += saved_by_turns
+            self.skipped_disabled += skipped_disabled
+
+    def stats(self) -> dict:
+        with self._lock:
+            saved = self.saved_by_turns + self.skipped_disabled
+            return {
+                "utterances": self.utterances,
+                "classifier_calls": self.classifier_calls,
+                "saved_by_turns": self.saved_by_turns,
+                "skipped_disabled": self.skipped_disabled,
+                "saved_ratio": round(saved / self.utterances, 4) if self.utterances else 0.0,
+            }
+
+
+gender_inference_stats = GenderInferenceStats()
@@ -1,5 +1,4 @@
 import asyncio
-import base64
 import logging
 import uuid
 from typing import Optional
@@ -8,6 +7,7 @@ from sqlalchemy import select
 
 from app.core.celery_app import celery_app
 from app.db.session import AsyncSessionLocal
+from app.modules.ai_exam.drafts import create_exam_draft_from_ai_result
 from app.modules.ai_exam.models import AIExamCache
 from app.modules.ai_exam.schemas import AIExamResult
 from app.modules.ai_exam.service import AIExamService, MODEL_NAME, PIPELINE_VERSION
@@ -17,6 +17,8 @@ from app.modules.questions.models import Question, Answer  # noqa: F401
 from app.modules.result.models import UserResult  # noqa: F401
 from app.modules.ai_feedback.models import AIFeedback  # noqa: F401
 from app.modules.users.models import User  # noqa: F401
+from app.shared.blob_store import get_blob_store
+from app.shared.progress_channel import get_progress_channel
 from app.shared.upload import upload_audio_bytes
 
 logger = logging.getLogger(__name__)
@@ -41,6 +43,9 @@ async def _update_cache_status(
     filename: Optional[str] = None,
     content_hash: Optional[str] = None,
     cloudinary_res: Optional[dict] = None,
+    user_id: Optional[int] = None,
+    jlpt_level: Optional[str] = None,
+    exam_title: str = "",
 ) -> None:
     async with AsyncSessionLocal() as db:
         cache = await db.get(AIExamCache, uuid.UUID(cache_id))
@@ -85,30 +90,48 @@ async def _update_cache_status(
             cache.pipeline_version = PIPELINE_VERSION
             cache.cloudinary_public_id = cloudinary_res.get("public_id")
             cache.cloudinary_format = cloudinary_res.get("format", "mp3")
+            if user_id:
+                draft_exam = await create_exam_draft_from_ai_result(
+                    db,
+                    user_id=user_id,
+                    jlpt_level=jlpt_level,
+                    exam_title=exam_title,
+                    filename=filename,
+                    audio_id=audio.audio_id,
+                    result=result,
+                )
+                result.draft_exam_id = str(draft_exam.exam_id)
             cache.result_json = result.model_dump_json()
             cache.error_message = None
 
         await db.commit()
 
 
+def _publish_progress(job_id: str, status: str, message: str, error: Optional[str] = None) -> None:
+    get_progress_channel().publish(
+        job_id,
+        {"job_id": job_id, "status": status, "progress_message": message, "error": error},
+    )
+
+
 async def _run_generate_exam_task(
     *,
     job_id: str,
     cache_id: str,
     content_hash: str,
-    audio_base64: str,
+    audio_key: str,
     filename: str,
     jlpt_level: str,
     mondai_config: Optional[list] = None,
     user_id: Optional[int] = None,
     exam_title: str = "",
+    gender_mode: Optional[str] = None,
 ) -> None:
     from app.modules.notifications.service import create_notification
 
+    store = get_blob_store()
     try:
         cloudinary_res: Optional[dict] = None
-        audio_bytes = base64.b64decode(audio_base64.encode("ascii"))
-        loop = asyncio.get_running_loop()
 
         await _update_cache_status(
             cache_id,
@@ -116,8 +139,9 @@ async def _run_generate_exam_task(
             progress_message="Step 1/7: Uploading raw audio to Cloudinary...",
             error_message=None,
         )
+        _publish_progress(job_id, "processing", "Step 1/7: Uploading raw audio to Cloudinary...")
         cloudinary_res = await upload_audio_bytes(
-            audio_bytes,
+            str(store.path(audio_key)),
             filename,
             public_id=content_hash,
         )
@@ -125,26 +149,21 @@ async def _run_generate_exam_task(
         service = get_service()
 
         def set_progress(message: str) -> None:
-            future = asyncio.run_coroutine_threadsafe(
-                _update_cache_status(
-                    cache_id,
-                    status="processing",
-                    progress_message=message,
-                ),
-                loop,
-            )
-            future.result()
+            # Step updates are pushed only; the cache row changes on state transitions.
+            _publish_progress(job_id, "processing", message)
 
-        result = await asyncio.to_thread(
-            service.generate,
-            audio_bytes,
-            filename,
-            jlpt_level,
-            mondai_config,
-            cloudinary_res.get("public_id"),
-            cloudinary_res.get("format", "mp3"),
-            set_progress,
-        )
+        with store.open_mmap(audio_key) as audio:
+            result = await asyncio.to_thread(
+                service.generate,
+                audio,
+                filename,
+                jlpt_level,
+                mondai_config,
+                cloudinary_res.get("public_id"),
+                cloudinary_res.get("format", "mp3"),
+                set_progress,
+                gender_mode=gender_mode,
+            )
 
         await _update_cache_status(
             cache_id,
@@ -154,6 +173,14 @@ async def _run_generate_exam_task(
             filename=filename,
             content_hash=content_hash,
             cloudinary_res=cloudinary_res,
+            user_id=user_id,
+            jlpt_level=jlpt_level,
+            exam_title=exam_title,
+        )
+        _publish_progress(
+            job_id,
+            "done",
+            f"Done! Generated {len(result.questions)} questions and saved a draft exam.",
         )
 
         if user_id:
@@ -161,9 +188,9 @@ async def _run_generate_exam_task(
             await create_notification(
                 user_id=user_id,
                 title="Sinh đề AI hoàn thành!",
-                message=f'Đề "{title_display}" ({jlpt_level}) đã được tạo xong với {len(result.questions)} câu hỏi. Nhấn để xem kết quả.',
+                message=f'Đề "{title_display}" ({jlpt_level}) đã được tạo xong và tự động lưu vào bản nháp.',
                 type="success",
-                link=f"/exam/ai-create?job={job_id}",
+                link="/exam",
             )
 
     except Exception as exc:
@@ -174,8 +201,8 @@ async def _run_generate_exam_task(
             progress_message="Pipeline failed.",
             error_message=str(exc),
         )
+        _publish_progress(job_id, "failed", "Pipeline failed.", str(exc))
         if user_id:
-            from app.modules.notifications.service import create_notification
             await create_notification(
                 user_id=user_id,
                 title="Sinh đề AI thất bại",
@@ -184,6 +211,8 @@ async def _run_generate_exam_task(
                 link="/exam/ai-create",
             )
         raise
+    finally:
+        store.delete(audio_key)
 
 
 @celery_app.task(name="app.modules.ai_exam.generate_exam")
@@ -192,12 +221,13 @@ def generate_exam_task(
     job_id: str,
     cache_id: str,
     content_hash: str,
-    audio_base64: str,
+    audio_key: str,
     filename: str,
     jlpt_level: str,
     mondai_config: Optional[list] = None,
     user_id: Optional[int] = None,
     exam_title: str = "",
+    gender_mode: Optional[str] = None,
 ) -> None:
     """Run the AI exam generation pipeline in a Celery worker."""
     asyncio.run(
@@ -205,11 +235,51 @@ def generate_exam_task(
             job_id=job_id,
             cache_id=cache_id,
             content_hash=content_hash,
-            audio_base64=audio_base64,
+            audio_key=audio_key,
             filename=filename,
             jlpt_level=jlpt_level,
             mondai_config=mondai_config,
             user_id=user_id,
             exam_title=exam_title,
+            gender_mode=gender_mode,
         )
     )
+
+
+def enqueue_generate_exam(
+    audio_bytes: bytes,
+    *,
+    job_id: str,
+    cache_id: str,
+    content_hash: str,
+    filename: str,
+    jlpt_level: str,
+    mondai_config: Optional[list] = None,
+    user_id: Optional[int] = None,
+    exam_title: str = "",
+    gender_mode: Optional[str] = None,
+):
+    """Write the upload to the shared blob store and queue the task with only its key.
+
+    Used by ``POST /ai/generate-exam`` when ``AI_EXAM_PIPELINE_BACKEND`` is
+    ``celery``. The key is per job: two jobs for the same upload (another
+    level or gender mode) must not delete each other's input.
+    """
+    store = get_blob_store()
+    audio_key = store.put(audio_bytes, key=f"{content_hash}-{job_id}")
+    try:
+        return generate_exam_task.delay(
+            job_id=job_id,
+            cache_id=cache_id,
+            content_hash=content_hash,
+            audio_key=audio_key,
+            filename=filename,
+            jlpt_level=jlpt_level,
+            mondai_config=mondai_config,
+            user_id=user_id,
+            exam_title=exam_title,
+            gender_mode=gender_mode,
+        )
+    except Exception:
+        store.delete(audio_key)
+        raise
@@ -0,0 +1,192 @@
+"""Process-pool ReazonSpeech transcription.
+
+Each worker process loads its own ``ReazonTranscriber`` once, in the pool
+initializer, and keeps it for the life of the process. Segment PCM is copied
+once into a single shared-memory block. Workers get only ``(offset, length)``
+descriptors and read their segments as zero-copy views. Results come back
+in the original segment order. Each worker also returns its gender-classifier
+counters so the parent's metrics cover pooled runs. Workers share the
+persistent segment transcript cache unless the pool is built without it.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from app.modules.ai_exam.service import ReazonTranscriber
+
+logger = logging.getLogger(__name__)
+
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# (segment_index, offset, length, sample_rate, base_offset_ms)
+SegmentDescriptor = tuple[int, int, int, int, int]
+
+GENDER_COUNTERS = ("utterances", "classifier_calls", "saved_by_turns", "skipped_disabled")
+
+_worker_transcriber: Optional["ReazonTranscriber"] = None
+
+
+def _init_worker(
+    model_version: str,
+    batch_size: int,
+    threads_per_worker: int,
+    segment_cache: bool,
+) -> None:
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads_per_worker)
+    try:
+        import torch
+
+        torch.set_num_threads(threads_per_worker)
+    except ImportError:
+        pass
+
+    from app.modules.ai_exam.service import ReazonTranscriber, _load_segment_cache
+
+    global _worker_transcriber
+    _worker_transcriber = ReazonTranscriber(
+        model_version=model_version,
+        batch_size=batch_size,
+        segment_cache=_load_segment_cache() if segment_cache else None,
+    )
+    _worker_transcriber._load_model()
+    logger.info("ASR worker %s ready (%s threads).", os.getpid(), threads_per_worker)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _transcribe_shared(
+    shm_name: str,
+    descriptors: Sequence[SegmentDescriptor],
+    gender_mode: Optional[str] = None,
+) -> tuple[list[tuple[int, dict]], dict]:
+    import numpy as np
+
+    from app.modules.ai_exam.speaker_gender import gender_inference_stats
+
+    before = gender_inference_stats.stats()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        pcm = np.ndarray((shm.size // 4,), dtype=np.float32, buffer=shm.buf)
+        segments = [
+            (pcm[offset : offset + length], sample_rate, base_offset_ms)
+            for _, offset, length, sample_rate, base_offset_ms in descriptors
+        ]
+        results = _worker_transcriber.transcribe_batch(segments, gender_mode=gender_mode)
+        del segments, pcm
+    finally:
+        shm.close()
+    after = gender_inference_stats.stats()
+    gender_delta = {key: after[key] - before[key] for key in GENDER_COUNTERS}
+    return [
+        (descriptor[0], result) for descriptor, result in zip(descriptors, results)
+    ], gender_delta
+
+
+def partition_by_length(lengths: Sequence[int], parts: int) -> list[list[int]]:
+    """Split indices into at most ``parts`` groups with similar total length (longest first)."""
+    groups: list[list[int]] = [[] for _ in range(max(1, min(parts, len(lengths))))]
+    loads = [0] * len(groups)
+    for index in sorted(range(len(lengths)), key=lambda position: lengths[position], reverse=True):
+        target = loads.index(min(loads))
+        groups[target].append(index)
+        loads[target] += lengths[index]
+    return [sorted(group) for group in groups if group]
+
+
+def pack_segments(
+    segments: Sequence[tuple["np.ndarray", int, int]],
+) -> tuple[shared_memory.SharedMemory, list[SegmentDescriptor]]:
+    """Copy every segment into one float32 shared-memory block; the caller unlinks it."""
+    import numpy as np
+
+    total = sum(len(samples) for samples, _, _ in segments)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, total) * 4)
+    pcm = np.ndarray((max(1, total),), dtype=np.float32, buffer=shm.buf)
+    descriptors: list[SegmentDescriptor] = []
+    offset = 0
+    for index, (samples, sample_rate, base_offset_ms) in enumerate(segments):
+        pcm[offset : offset + len(samples)] = samples
+        descriptors.append((index, offset, len(samples), int(sample_rate), int(base_offset_ms)))
+        offset += len(samples)
+    del pcm
+    return shm, descriptors
+
+
+class ReazonProcessPool:
+    """Transcribe bell segments across worker processes that each hold a loaded model."""
+
+    def __init__(
+        self,
+        workers: int,
+        threads_per_worker: int = 1,
+        model_version: str = "reazonspeech-k2-v2",
+        batch_size: int = 16,
+        segment_cache: bool = True,
+    ):
+        """``segment_cache=False`` makes workers decode every segment, e.g. for benchmarks."""
+        self.workers = max(1, workers)
+        self.threads_per_worker = max(1, threads_per_worker)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_version, batch_size, self.threads_per_worker, segment_cache),
+        )
+
+    def warm_up(self) -> None:
+        """Start every worker so model loading happens before the first request."""
+        list(self._executor.map(_ping, range(self.workers)))
+
+    def transcribe_batch(
+        self,
+        segments: Sequence[tuple["np.ndarray", int, int]],
+        gender_mode: Optional[str] = None,
+    ) -> list[dict]:
+        """Same contract as ``ReazonTranscriber.transcribe_batch``; results are in input order."""
+        from app.modules.ai_exam.speaker_gender import gender_inference_stats
+
+        if not segments:
+            return []
+
+        shm, descriptors = pack_segments(segments)
+        try:
+            groups = partition_by_length(
+                [descriptor[2] for descriptor in descriptors], self.workers
+            )
+            futures = [
+                self._executor.submit(
+                    _transcribe_shared,
+                    shm.name,
+                    [descriptors[index] for index in group],
+                    gender_mode,
+                )
+                for group in groups
+            ]
+            results: list[Optional[dict]] = [None] * len(segments)
+            for future in futures:
+                indexed_results, gender_delta = future.result()
+                for index, result in indexed_results:
+                    results[index] = result
+                gender_inference_stats.record(**gender_delta)
+        finally:
+            shm.close()
+            shm.unlink()
+        return results
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
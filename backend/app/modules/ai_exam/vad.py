@@ -0,0 +1,128 @@
+"""Frame-energy silence detection with ``pydub.silence`` semantics.
+
+``detect_nonsilent_ranges`` returns the same millisecond ranges as
+``pydub.silence.detect_nonsilent(..., seek_step=1)`` on the equivalent int16
+``AudioSegment``. ``pad_ranges`` applies ``split_on_silence``'s
+``keep_silence`` padding. Per-millisecond energies are summed once and every
+``min_silence_len`` window is read from a prefix sum. This replaces pydub's
+Python loop, which recomputes RMS for every millisecond offset.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+MAX_POSSIBLE_AMPLITUDE = 32768.0
+_ENERGY_CHUNK_MS = 60_000
+
+
+def to_pcm16(samples: np.ndarray) -> np.ndarray:
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def duration_ms(frame_count: int, sample_rate: int) -> int:
+    """``len(AudioSegment)``: the rounded duration in milliseconds."""
+    return round(1000 * (frame_count / sample_rate))
+
+
+def _ms_boundaries(count: int, sample_rate: int) -> np.ndarray:
+    # pydub converts positions with int(ms * frame_rate / 1000.0).
+    return (np.arange(count + 1, dtype=np.int64) * sample_rate / 1000.0).astype(np.int64)
+
+
+def dbfs(pcm16: np.ndarray) -> float:
+    """``AudioSegment.dBFS`` using the integer RMS from ``audioop.rms``."""
+    if len(pcm16) == 0:
+        return float("-inf")
+    energy = int(np.dot(pcm16.astype(np.int64), pcm16.astype(np.int64)))
+    rms = int(math.sqrt(energy / len(pcm16)))
+    if not rms:
+        return float("-inf")
+    return 20 * math.log(rms / MAX_POSSIBLE_AMPLITUDE, 10)
+
+
+def _energy_per_ms(pcm16: np.ndarray, boundaries: np.ndarray) -> np.ndarray:
+    """Sum of squared samples in each ``[boundaries[k], boundaries[k + 1])`` bin."""
+    frame_count = len(pcm16)
+    starts = np.minimum(boundaries[:-1], frame_count)
+    ends = np.minimum(boundaries[1:], frame_count)
+    energy = np.zeros(len(starts), dtype=np.int64)
+    for chunk_start in range(0, len(starts), _ENERGY_CHUNK_MS):
+        chunk_starts = starts[chunk_start : chunk_start + _ENERGY_CHUNK_MS]
+        chunk_ends = ends[chunk_start : chunk_start + _ENERGY_CHUNK_MS]
+        first, last = int(chunk_starts[0]), int(chunk_ends[-1])
+        if last <= first:
+            continue
+        squares = pcm16[first:last].astype(np.int64)
+        squares *= squares
+        prefix = np.concatenate([[0], np.cumsum(squares)])
+        energy[chunk_start : chunk_start + len(chunk_starts)] = (
+            prefix[chunk_ends - first] - prefix[chunk_starts - first]
+        )
+    return energy
+
+
+def detect_nonsilent_ranges(
+    pcm16: np.ndarray,
+    sample_rate: int,
+    min_silence_len: int,
+    silence_thresh: float,
+) -> list[list[int]]:
+    """Vectorized ``pydub.silence.detect_nonsilent`` with ``seek_step=1``."""
+    length_ms = duration_ms(len(pcm16), sample_rate)
+    if length_ms < min_silence_len:
+        return [[0, length_ms]]
+
+    boundaries = _ms_boundaries(length_ms, sample_rate)
+    energy_prefix = np.concatenate([[0], np.cumsum(_energy_per_ms(pcm16, boundaries))])
+
+    window_starts = np.arange(length_ms - min_silence_len + 1)
+    window_ends = window_starts + min_silence_len
+    window_energy = energy_prefix[window_ends] - energy_prefix[window_starts]
+    # Windows reaching past the last frame are zero-padded by pydub, so the
+    # divisor is the expected frame count rather than the available one.
+    window_frames = np.maximum(boundaries[window_ends] - boundaries[window_starts], 1)
+    rms = np.floor(np.sqrt(window_energy / window_frames))
+    threshold = 10 ** (silence_thresh / 20) * MAX_POSSIBLE_AMPLITUDE
+    silence_starts = np.flatnonzero(rms <= threshold)
+    if len(silence_starts) == 0:
+        return [[0, length_ms]]
+
+    breaks = np.flatnonzero(np.diff(silence_starts) > min_silence_len)
+    range_starts = silence_starts[np.concatenate([[0], breaks + 1])]
+    range_ends = (
+        silence_starts[np.concatenate([breaks, [len(silence_starts) - 1]])] + min_silence_len
+    )
+    silent_ranges = list(zip(range_starts.tolist(), range_ends.tolist()))
+
+    if silent_ranges[0][0] == 0 and silent_ranges[0][1] == length_ms:
+        return []
+
+    nonsilent_ranges = []
+    previous_end = 0
+    for start, end in silent_ranges:
+        nonsilent_ranges.append([previous_end, start])
+        previous_end = end
+    if silent_ranges[-1][1] != length_ms:
+        nonsilent_ranges.append([previous_end, length_ms])
+    if nonsilent_ranges[0] == [0, 0]:
+        nonsilent_ranges.pop(0)
+    return nonsilent_ranges
+
+
+def pad_ranges(
+    ranges: list[list[int]], keep_silence: int, length_ms: Optional[int] = None
+) -> list[list[int]]:
+    """Apply ``split_on_silence`` padding: overlapping padding is split at the midpoint.
+
+    With ``length_ms`` the ranges are also clamped to the audio.
+    """
+    padded = [[start - keep_silence, end + keep_silence] for start, end in ranges]
+    for previous, following in zip(padded, padded[1:]):
+        if following[0] < previous[1]:
+            previous[1] = (previous[1] + following[0]) // 2
+            following[0] = previous[1]
+    if length_ms is not None:
+        padded = [[max(start, 0), min(end, length_ms)] for start, end in padded]
+    return padded
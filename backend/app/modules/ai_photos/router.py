@@ -12,10 +12,11 @@ from app.modules.ai_photos.schemas import (
 )
 from app.modules.ai_photos.service import AIPhotoService
 from app.modules.notifications.service import create_notification
+from app.shared.job_store import JobRegistry
 
 router = APIRouter(prefix="/ai_photos", tags=["ai_photos"])
 logger = logging.getLogger(__name__)
-_jobs: dict[str, AIPhotoJobStatusResponse] = {}
+_jobs = JobRegistry("ai_photos", AIPhotoJobStatusResponse)
 
 
 def get_service():
@@ -23,13 +24,14 @@ def get_service():
 
 
 async def _generate_photo_background(job_id: str, request: AIPhotoRequest, user_id: int):
-    job = _jobs.get(job_id)
+    job = await _jobs.get(job_id)
     if not job:
         return
 
     try:
         job.status = "processing"
         job.progress_message = "Đang tối ưu prompt và chuẩn bị sinh ảnh..."
+        await _jobs.put(job_id, job)
 
         service = get_service()
         result = await service.generate(
@@ -44,6 +46,7 @@ async def _generate_photo_background(job_id: str, request: AIPhotoRequest, user_
         job.status = "done"
         job.progress_message = "Sinh ảnh hoàn tất. Ảnh đã sẵn sàng để chọn."
         job.result = AIPhotoResponse(**result)
+        await _jobs.put(job_id, job)
         photo_label = "ảnh hành động 2x2" if request.photo_type.value == "action" else "ảnh ngữ cảnh"
         await create_notification(
             user_id=user_id,
@@ -55,6 +58,7 @@ async def _generate_photo_background(job_id: str, request: AIPhotoRequest, user_
         job.status = "failed"
         job.error = str(exc.detail)
         job.progress_message = "Sinh ảnh thất bại."
+        await _jobs.put(job_id, job)
         logger.error("AI photo job %s failed: %s", job_id, exc.detail)
         await create_notification(
             user_id=user_id,
@@ -66,6 +70,7 @@ async def _generate_photo_background(job_id: str, request: AIPhotoRequest, user_
         job.status = "failed"
         job.error = str(exc)
         job.progress_message = "Sinh ảnh thất bại."
+        await _jobs.put(job_id, job)
         logger.error("AI photo job %s failed: %s", job_id, exc, exc_info=True)
         await create_notification(
             user_id=user_id,
@@ -118,10 +123,13 @@ async def generate_ai_photo_async(
     Returns a `job_id` so the frontend can poll progress without holding a long request open.
     """
     job_id = str(uuid.uuid4())
-    _jobs[job_id] = AIPhotoJobStatusResponse(
-        job_id=job_id,
-        status="pending",
-        progress_message="Đã xếp hàng sinh ảnh AI...",
+    await _jobs.put(
+        job_id,
+        AIPhotoJobStatusResponse(
+            job_id=job_id,
+            status="pending",
+            progress_message="Đã xếp hàng sinh ảnh AI...",
+        ),
     )
     background_tasks.add_task(_generate_photo_background, job_id, request, current_user.id)
     return AIPhotoJobStartResponse(
@@ -136,7 +144,7 @@ async def get_ai_photo_job_status(
     job_id: str,
     _: User = Depends(get_current_user),
 ):
-    job = _jobs.get(job_id)
+    job = await _jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
@@ -147,5 +155,4 @@ async def delete_ai_photo_job(
     job_id: str,
     _: User = Depends(get_current_user),
 ):
-    if job_id in _jobs:
-        del _jobs[job_id]
+    await _jobs.delete(job_id)
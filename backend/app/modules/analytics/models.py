@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String
+
+from app.db.base import Base
+
+
+class AnalyticsDailyLevel(Base):
+    """Exams created and tests taken per day and JLPT level.
+
+    Maintained by ``app.modules.analytics.rollup``.
+    """
+
+    __tablename__ = "analytics_daily_levels"
+
+    day = Column(Date, primary_key=True)
+    level = Column(
+        String(8), primary_key=True
+    )  # N1-N5, "Other", or "-" for results without an exam
+    exams_published = Column(Integer, nullable=False, default=0)
+    exams_unpublished = Column(Integer, nullable=False, default=0)
+    takes = Column(Integer, nullable=False, default=0)
+
+
+class AnalyticsDailyRating(Base):
+    """Feedback rows per day, source ("ai" or "system") and raw rating score."""
+
+    __tablename__ = "analytics_daily_ratings"
+
+    day = Column(Date, primary_key=True)
+    source = Column(String(8), primary_key=True)
+    rating_score = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class AnalyticsDailyQuality(Base):
+    """Sum and count of AI confidence error scores of caches completed per creation day."""
+
+    __tablename__ = "analytics_daily_quality"
+
+    day = Column(Date, primary_key=True)
+    confidence_error_sum = Column(Float, nullable=False, default=0.0)
+    confidence_error_count = Column(Integer, nullable=False, default=0)
+
+
+class AnalyticsRollupState(Base):
+    """High-water marks of the rollup refresh; a single row named "daily"."""
+
+    __tablename__ = "analytics_rollup_state"
+
+    name = Column(String(32), primary_key=True)
+    rolled_through = Column(Date, nullable=False)  # days before this one are rolled up
+    watermark = Column(DateTime, nullable=False)  # rows updated since then are re-rolled
+    refreshed_at = Column(DateTime, nullable=False)
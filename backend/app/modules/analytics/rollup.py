@@ -0,0 +1,331 @@
+"""Daily rollups behind the admin analytics overview.
+
+Every overview metric is a sum over days, so it is kept in small fact
+tables (``app.modules.analytics.models``):
+
+- exams created and tests taken per ``(day, level)``
+- feedback rows per ``(day, source, rating)``
+- AI confidence error sums and counts per day
+
+``refresh_daily_rollups`` is run periodically by Celery beat. It rolls up
+closed days only, meaning days before the database's current day, and
+keeps two high-water marks:
+
+- ``rolled_through``: the first day that has not been rolled up yet.
+- ``watermark``: when the last refresh started.
+
+Each refresh re-rolls the new closed days and the last
+``revisit_days`` days. It also re-rolls every day that holds an exam,
+AI cache or feedback row updated since the watermark, such as an exam
+that was unpublished or an AI job that completed after its creation day.
+The days on which an updated exam was taken are re-rolled too, so its
+takes follow a level change. Deletions leave no trace, so deleted exams
+and their cascaded results stay counted until their day is revisited or
+``rebuild=True`` is used.
+
+``facts_for_range`` reads whole rolled-up days from the fact tables. It
+computes the rest live from the raw tables with the same grouped queries:
+today, any days the refresh has not reached yet, and the partial days at
+either end of the range. The dashboard therefore stays current while its
+cost stays flat as history grows.
+"""
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.modules.ai_exam.models import AIExamCache
+from app.modules.ai_feedback.models import AIFeedback
+from app.modules.analytics.models import (
+    AnalyticsDailyLevel,
+    AnalyticsDailyQuality,
+    AnalyticsDailyRating,
+    AnalyticsRollupState,
+)
+from app.modules.exam.models import Exam
+from app.modules.result.models import UserResult
+from app.modules.system_feedback.models import SystemFeedback
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ("N1", "N2", "N3", "N4", "N5", "Other")
+NO_EXAM = "-"  # level of results whose exam no longer exists
+FEEDBACK_SOURCES = (("ai", AIFeedback), ("system", SystemFeedback))
+
+_STATE = "daily"
+_LOCK_ID = 0x616E616C  # pg advisory lock serializing refreshes
+# Rows committed by transactions that were still open when a refresh started
+# carry an ``updated_at`` slightly before its watermark.
+_WATERMARK_LAG = timedelta(minutes=5)
+_TICK = timedelta(microseconds=1)  # timestamp resolution: ``<= end`` is ``< end + _TICK``
+
+# Half-open ``[lo, hi)``; ``lo=None`` is unbounded.
+Window = Tuple[Optional[datetime], datetime]
+
+
+@dataclass
+class DailyFacts:
+    exams_published: Counter = field(default_factory=Counter)  # (day, level) -> exams
+    exams_unpublished: Counter = field(default_factory=Counter)  # (day, level) -> exams
+    takes: Counter = field(default_factory=Counter)  # (day, level) -> results
+    ratings: Counter = field(default_factory=Counter)  # (day, source, rating_score) -> rows
+    confidence_error_sum: Counter = field(default_factory=Counter)  # day -> sum
+    confidence_error_count: Counter = field(default_factory=Counter)  # day -> caches
+
+    def merge(self, other: "DailyFacts") -> "DailyFacts":
+        for name in self.__dataclass_fields__:
+            getattr(self, name).update(getattr(other, name))
+        return self
+
+    def days(self) -> set:
+        keys = [*self.exams_published, *self.exams_unpublished, *self.takes, *self.ratings]
+        return {key[0] for key in keys} | set(self.confidence_error_count)
+
+
+@dataclass
+class RollupStats:
+    days: int = 0
+    rebuilt: bool = False
+    rolled_through: Optional[date] = None
+
+    def as_dict(self) -> dict:
+        return {
+            **self.__dict__,
+            "rolled_through": self.rolled_through and self.rolled_through.isoformat(),
+        }
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def _day(column):
+    return func.date_trunc("day", column)
+
+
+def _within(column, windows: List[Window]):
+    return or_(
+        *(column < hi if lo is None else and_(column >= lo, column < hi) for lo, hi in windows)
+    )
+
+
+def _day_windows(days: Iterable[date]) -> List[Window]:
+    """Consecutive days merged into as few windows as possible."""
+    windows: List[Window] = []
+    for day in sorted(set(days)):
+        if windows and windows[-1][1] == _midnight(day):
+            windows[-1] = (windows[-1][0], _midnight(day + timedelta(days=1)))
+        else:
+            windows.append((_midnight(day), _midnight(day + timedelta(days=1))))
+    return windows
+
+
+async def collect_facts(db: AsyncSession, windows: List[Window]) -> DailyFacts:
+    """Daily facts computed from the raw tables for rows inside ``windows``."""
+    facts = DailyFacts()
+    if not windows:
+        return facts
+    exam_level = func.coalesce(Exam.jlpt_level, "Other")
+
+    exam_rows = await db.execute(
+        select(
+            _day(Exam.created_at).label("day"),
+            exam_level.label("level"),
+            Exam.is_published,
+            func.count(),
+        )
+        .where(_within(Exam.created_at, windows))
+        .group_by("day", "level", Exam.is_published)
+    )
+    for day, level, is_published, count in exam_rows:
+        target = facts.exams_published if is_published else facts.exams_unpublished
+        target[(day.date(), level)] += count
+
+    result_level = case((Exam.exam_id.is_(None), NO_EXAM), else_=exam_level)
+    result_rows = await db.execute(
+        select(
+            _day(UserResult.completed_at).label("day"), result_level.label("level"), func.count()
+        )
+        .select_from(UserResult)
+        .outerjoin(Exam, Exam.exam_id == UserResult.exam_id)
+        .where(_within(UserResult.completed_at, windows))
+        .group_by("day", "level")
+    )
+    for day, level, count in result_rows:
+        facts.takes[(day.date(), level)] += count
+
+    for source, model in FEEDBACK_SOURCES:
+        rating_rows = await db.execute(
+            select(_day(model.created_at).label("day"), model.rating_score, func.count())
+            .where(_within(model.created_at, windows))
+            .group_by("day", model.rating_score)
+        )
+        for day, score, count in rating_rows:
+            facts.ratings[(day.date(), source, score)] += count
+
+    quality_rows = await db.execute(
+        select(
+            _day(AIExamCache.created_at).label("day"),
+            func.sum(AIExamCache.confidence_error_score),
+            func.count(AIExamCache.confidence_error_score),
+        )
+        .where(
+            _within(AIExamCache.created_at, windows),
+            AIExamCache.status == "completed",
+            AIExamCache.confidence_error_score.isnot(None),
+        )
+        .group_by("day")
+    )
+    for day, total, count in quality_rows:
+        facts.confidence_error_sum[day.date()] += total
+        facts.confidence_error_count[day.date()] += count
+    return facts
+
+
+async def _rolled_up(db: AsyncSession, model, first_day: date, end_day: date):
+    table = model.__table__
+    rows = await db.execute(select(table).where(table.c.day >= first_day, table.c.day < end_day))
+    return rows.mappings()
+
+
+async def load_rollups(db: AsyncSession, first_day: date, end_day: date) -> DailyFacts:
+    """Rolled-up facts for days in ``[first_day, end_day)``."""
+    facts = DailyFacts()
+    for row in await _rolled_up(db, AnalyticsDailyLevel, first_day, end_day):
+        key = (row["day"], row["level"])
+        facts.exams_published[key] += row["exams_published"]
+        facts.exams_unpublished[key] += row["exams_unpublished"]
+        facts.takes[key] += row["takes"]
+    for row in await _rolled_up(db, AnalyticsDailyRating, first_day, end_day):
+        facts.ratings[(row["day"], row["source"], row["rating_score"])] += row["count"]
+    for row in await _rolled_up(db, AnalyticsDailyQuality, first_day, end_day):
+        facts.confidence_error_sum[row["day"]] += row["confidence_error_sum"]
+        facts.confidence_error_count[row["day"]] += row["confidence_error_count"]
+    return facts
+
+
+async def facts_for_range(db: AsyncSession, start: datetime, end: datetime) -> DailyFacts:
+    """Facts for rows stamped in ``[start, end]``.
+
+    Whole rolled-up days come from the rollups and everything else from the raw tables.
+    """
+    state = await db.get(AnalyticsRollupState, _STATE)
+    first_day = (
+        start.date() if start == _midnight(start.date()) else start.date() + timedelta(days=1)
+    )
+    end_day = end.date()  # the day holding ``end`` is never whole
+    if state is not None:
+        end_day = min(end_day, state.rolled_through)
+    if state is None or first_day >= end_day:
+        return await collect_facts(db, [(start, end + _TICK)])
+
+    facts = await load_rollups(db, first_day, end_day)
+    live = [(start, _midnight(first_day)), (_midnight(end_day), end + _TICK)]
+    return facts.merge(await collect_facts(db, [(lo, hi) for lo, hi in live if lo < hi]))
+
+
+def _rollup_rows(facts: DailyFacts):
+    level_keys = set(facts.exams_published) | set(facts.exams_unpublished) | set(facts.takes)
+    levels = [
+        {
+            "day": day,
+            "level": level,
+            "exams_published": facts.exams_published[(day, level)],
+            "exams_unpublished": facts.exams_unpublished[(day, level)],
+            "takes": facts.takes[(day, level)],
+        }
+        for day, level in level_keys
+    ]
+    ratings = [
+        {"day": day, "source": source, "rating_score": score, "count": count}
+        for (day, source, score), count in facts.ratings.items()
+    ]
+    quality = [
+        {
+            "day": day,
+            "confidence_error_sum": facts.confidence_error_sum[day],
+            "confidence_error_count": count,
+        }
+        for day, count in facts.confidence_error_count.items()
+    ]
+    return (
+        (AnalyticsDailyLevel, levels),
+        (AnalyticsDailyRating, ratings),
+        (AnalyticsDailyQuality, quality),
+    )
+
+
+async def _touched_days(db: AsyncSession, since: datetime, before: datetime) -> set:
+    """Days whose facts may have changed through rows updated since ``since``.
+
+    That is the creation day of each updated exam, AI cache or feedback row,
+    plus every completion day of an updated exam's results: takes are keyed
+    by the exam's current level, which moves with its title or description.
+    """
+    days = set()
+    for model in (Exam, AIExamCache, AIFeedback, SystemFeedback):
+        rows = await db.execute(
+            select(_day(model.created_at))
+            .where(model.updated_at >= since, model.created_at < before)
+            .distinct()
+        )
+        days.update(day.date() for day in rows.scalars())
+
+    updated_exams = select(Exam.exam_id).where(Exam.updated_at >= since)
+    rows = await db.execute(
+        select(_day(UserResult.completed_at))
+        .where(UserResult.exam_id.in_(updated_exams), UserResult.completed_at < before)
+        .distinct()
+    )
+    days.update(day.date() for day in rows.scalars())
+    return days
+
+
+async def refresh_daily_rollups(
+    session_factory: async_sessionmaker,
+    *,
+    revisit_days: int = 1,
+    rebuild: bool = False,
+) -> RollupStats:
+    """Bring the daily fact tables up to yesterday; re-roll only days that may have changed."""
+    stats = RollupStats()
+    async with session_factory() as db:
+        await db.execute(select(func.pg_advisory_xact_lock(_LOCK_ID)))
+        now = (await db.execute(select(func.localtimestamp()))).scalar_one()
+        today = now.date()
+        state = await db.get(AnalyticsRollupState, _STATE)
+
+        if state is None or rebuild:
+            stats.rebuilt = True
+            windows: List[Window] = [(None, _midnight(today))]
+            for model in (AnalyticsDailyLevel, AnalyticsDailyRating, AnalyticsDailyQuality):
+                await db.execute(delete(model))
+        else:
+            revisit_from = min(state.rolled_through, today - timedelta(days=revisit_days))
+            days = {revisit_from + timedelta(days=n) for n in range((today - revisit_from).days)}
+            days |= await _touched_days(db, state.watermark - _WATERMARK_LAG, _midnight(today))
+            windows = _day_windows(days)
+            for model in (AnalyticsDailyLevel, AnalyticsDailyRating, AnalyticsDailyQuality):
+                await db.execute(delete(model).where(model.day.in_(days)))
+            stats.days = len(days)
+
+        facts = await collect_facts(db, windows)
+        for model, rows in _rollup_rows(facts):
+            if rows:
+                await db.execute(insert(model), rows)
+        if stats.rebuilt:
+            stats.days = len(facts.days())
+
+        if state is None:
+            state = AnalyticsRollupState(name=_STATE)
+            db.add(state)
+        state.rolled_through, state.watermark, state.refreshed_at = today, now, now
+        await db.commit()
+    stats.rolled_through = today
+    logger.info("Analytics rollups refreshed: %s", stats.as_dict())
+    return stats
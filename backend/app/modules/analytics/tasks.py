@@ -0,0 +1,31 @@
+import asyncio
+import logging
+
+from app.core.celery_app import celery_app
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.modules.ai_exam.models import AIExamCache  # noqa: F401
+from app.modules.ai_feedback.models import AIFeedback  # noqa: F401
+from app.modules.analytics.rollup import refresh_daily_rollups
+from app.modules.arena.models import Contest, ContestParticipant  # noqa: F401
+from app.modules.audio.models import Audio  # noqa: F401
+from app.modules.exam.models import Exam  # noqa: F401
+from app.modules.questions.models import Question, Answer  # noqa: F401
+from app.modules.result.models import UserResult  # noqa: F401
+from app.modules.system_feedback.models import SystemFeedback  # noqa: F401
+from app.modules.users.models import User  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.modules.analytics.refresh_rollups")
+def refresh_rollups_task(*, rebuild: bool = False) -> dict:
+    """Bring the daily analytics rollups up to date; scheduled by Celery beat."""
+    stats = asyncio.run(
+        refresh_daily_rollups(
+            AsyncSessionLocal,
+            revisit_days=get_settings().ANALYTICS_ROLLUP_REVISIT_DAYS,
+            rebuild=rebuild,
+        )
+    )
+    return stats.as_dict()
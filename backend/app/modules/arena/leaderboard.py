@@ -0,0 +1,192 @@
+"""Contest leaderboards read from an indexed, materialized ranking.
+
+``ContestParticipant`` keeps a copy of its result's score and completion
+time. The copy is written when the contest is submitted and is kept in sync
+by the rescoring job. The partial index ``ix_contest_participants_leaderboard``
+on ``(contest_id, score DESC, completed_at, joined_at, user_id)`` therefore
+stores every contest's board already in rank order:
+
+- A top-N page is an index range scan of N rows.
+- A participant's rank is a count over the index range ahead of them.
+
+No request loads or sorts a whole contest, so a submit updates the ranking
+through a single row write.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.modules.arena.models import Contest, ContestParticipant
+from app.modules.arena.schemas import ContestLeaderboardEntry
+from app.modules.result.models import UserResult
+from app.modules.users.models import User
+
+# Best score first; ties go to the earlier finisher, then the earlier joiner.
+RANK_ORDER = (
+    ContestParticipant.score.desc(),
+    ContestParticipant.completed_at,
+    ContestParticipant.joined_at,
+    ContestParticipant.user_id,
+)
+
+_ENTRY_COLUMNS = (
+    ContestParticipant.contest_id,
+    ContestParticipant.user_id,
+    ContestParticipant.score,
+    ContestParticipant.joined_at,
+    User.username,
+    User.first_name,
+    User.last_name,
+    User.avatar_url,
+)
+
+
+def record_result(participant: ContestParticipant, result: UserResult) -> None:
+    """Place ``participant`` on the board with ``result``, in the caller's transaction."""
+    participant.score = result.score or 0.0
+    participant.completed_at = result.completed_at or datetime.utcnow()
+
+
+def _ahead_of(other, mine):
+    """Rows of ``other`` ranked strictly before the row ``mine`` (both participant aliases)."""
+    return and_(
+        other.contest_id == mine.contest_id,
+        other.score.isnot(None),
+        or_(
+            other.score > mine.score,
+            and_(
+                other.score == mine.score,
+                tuple_(other.completed_at, other.joined_at, other.user_id)
+                < tuple_(mine.completed_at, mine.joined_at, mine.user_id),
+            ),
+        ),
+    )
+
+
+def _entry(row, rank: int) -> ContestLeaderboardEntry:
+    username = row.username or f"user-{row.user_id}"
+    display_name = (
+        f"{row.first_name or ''} {row.last_name or ''}".strip()
+        if row.first_name or row.last_name
+        else username
+    )
+    return ContestLeaderboardEntry(
+        user_id=row.user_id,
+        username=username,
+        display_name=display_name,
+        avatar_url=row.avatar_url,
+        score=round(row.score or 0.0, 2),
+        rank=rank,
+        joined_at=row.joined_at,
+    )
+
+
+class ContestLeaderboard:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def page(
+        self, contest_id: UUID, limit: int, offset: int = 0
+    ) -> List[ContestLeaderboardEntry]:
+        """Entries ranked ``offset + 1`` to ``offset + limit``."""
+        rows = (
+            await self.db.execute(
+                select(*_ENTRY_COLUMNS)
+                .outerjoin(User, User.id == ContestParticipant.user_id)
+                .where(
+                    ContestParticipant.contest_id == contest_id,
+                    ContestParticipant.score.isnot(None),
+                )
+                .order_by(*RANK_ORDER)
+                .offset(offset)
+                .limit(limit)
+            )
+        ).all()
+        return [_entry(row, rank) for rank, row in enumerate(rows, start=offset + 1)]
+
+    async def top_many(
+        self, contest_ids: Iterable[UUID], limit: int
+    ) -> Dict[UUID, List[ContestLeaderboardEntry]]:
+        """Top ``limit`` entries of several contests in one query (one index scan per contest)."""
+        contest_ids = list(contest_ids)
+        boards: Dict[UUID, List[ContestLeaderboardEntry]] = {
+            contest_id: [] for contest_id in contest_ids
+        }
+        if not contest_ids or limit <= 0:
+            return boards
+
+        wanted = (
+            select(Contest.contest_id).where(Contest.contest_id.in_(contest_ids)).subquery("wanted")
+        )
+        top = (
+            select(*_ENTRY_COLUMNS)
+            .outerjoin(User, User.id == ContestParticipant.user_id)
+            .where(
+                ContestParticipant.contest_id == wanted.c.contest_id,
+                ContestParticipant.score.isnot(None),
+            )
+            .order_by(*RANK_ORDER)
+            .limit(limit)
+            .lateral("top")
+        )
+        rows = (await self.db.execute(select(top).select_from(wanted.join(top, true())))).all()
+        for row in rows:
+            board = boards[row.contest_id]
+            board.append(_entry(row, len(board) + 1))
+        return boards
+
+    async def rank_many(
+        self, contest_ids: Iterable[UUID], user_id: int
+    ) -> Dict[UUID, ContestLeaderboardEntry]:
+        """``user_id``'s entry, with rank, in each of ``contest_ids`` where they have a score."""
+        contest_ids = list(contest_ids)
+        if not contest_ids:
+            return {}
+        mine = aliased(ContestParticipant)
+        other = aliased(ContestParticipant)
+        ahead = (
+            select(func.count()).select_from(other).where(_ahead_of(other, mine)).scalar_subquery()
+        )
+        rows = (
+            await self.db.execute(
+                select(
+                    mine.contest_id,
+                    mine.user_id,
+                    mine.score,
+                    mine.joined_at,
+                    User.username,
+                    User.first_name,
+                    User.last_name,
+                    User.avatar_url,
+                    ahead.label("ahead"),
+                )
+                .outerjoin(User, User.id == mine.user_id)
+                .where(
+                    mine.contest_id.in_(contest_ids),
+                    mine.user_id == user_id,
+                    mine.score.isnot(None),
+                )
+            )
+        ).all()
+        return {row.contest_id: _entry(row, row.ahead + 1) for row in rows}
+
+    async def rank_of(self, contest_id: UUID, user_id: int) -> Optional[ContestLeaderboardEntry]:
+        return (await self.rank_many([contest_id], user_id)).get(contest_id)
+
+    async def size(self, contest_id: UUID) -> int:
+        """Number of ranked (submitted) participants."""
+        return (
+            await self.db.execute(
+                select(func.count())
+                .select_from(ContestParticipant)
+                .where(
+                    ContestParticipant.contest_id == contest_id,
+                    ContestParticipant.score.isnot(None),
+                )
+            )
+        ).scalar_one()
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, Boolean
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -43,6 +43,21 @@ class ContestParticipant(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     result_id = Column(UUID(as_uuid=True), ForeignKey("user_results.result_id", ondelete="SET NULL"), nullable=True)
     joined_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # Copied from the submitted result so the leaderboard index holds the ranking.
+    score = Column(Float, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_contest_participants_leaderboard",
+            contest_id,
+            score.desc(),
+            completed_at,
+            joined_at,
+            user_id,
+            postgresql_where=score.isnot(None),
+        ),
+    )
 
     contest = relationship("Contest", back_populates="participants")
     result = relationship("UserResult", foreign_keys=[result_id])
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
@@ -8,6 +8,7 @@ from app.db.session import get_db
 from app.modules.arena.schemas import (
     ContestCreateRequest,
     ContestJoinResponse,
+    ContestLeaderboardResponse,
     ContestListResponse,
     ContestResponse,
     ContestSubmitRequest,
@@ -52,6 +53,17 @@ async def get_contest(
     return await service.get_contest(contest_id, current_user)
 
 
+@router.get("/{contest_id}/leaderboard", response_model=ContestLeaderboardResponse)
+async def get_contest_leaderboard(
+    contest_id: UUID,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    service: ArenaService = Depends(get_arena_service),
+    current_user: User = Depends(get_current_user),
+):
+    return await service.get_leaderboard(contest_id, current_user, offset=offset, limit=limit)
+
+
 @router.patch("/{contest_id}", response_model=ContestResponse)
 async def update_contest(
     contest_id: UUID,
@@ -78,8 +90,10 @@ async def get_contest_exam_for_take(
     service: ArenaService = Depends(get_arena_service),
     current_user: User = Depends(get_current_user),
 ):
-    contest, exam = await service.get_contest_exam_detail(contest_id, current_user)
-    return ContestTakeResponse(contest=contest, exam=exam)
+    contest, exam_payload = await service.get_contest_exam_detail(contest_id, current_user)
+    # The exam is served as cached JSON bytes; only the contest part is serialized here.
+    body = b'{"contest":%s,"exam":%s}' % (contest.model_dump_json().encode(), exam_payload)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/{contest_id}/submit", response_model=ContestSubmitResponse, status_code=201)
@@ -66,11 +66,22 @@ class ContestResponse(BaseModel):
     joined: bool = False
     joined_at: Optional[datetime] = None
     result_id: Optional[UUID] = None
+    # Top CONTEST_LEADERBOARD_PREVIEW_SIZE entries; page further with /leaderboard.
     leaderboard: list[ContestLeaderboardEntry] = Field(default_factory=list)
+    my_entry: Optional[ContestLeaderboardEntry] = None
     created_at: datetime
     updated_at: datetime
 
 
+class ContestLeaderboardResponse(BaseModel):
+    contest_id: UUID
+    total: int
+    offset: int
+    limit: int
+    entries: list[ContestLeaderboardEntry]
+    my_entry: Optional[ContestLeaderboardEntry] = None
+
+
 class ContestListResponse(BaseModel):
     contests: list[ContestResponse]
 
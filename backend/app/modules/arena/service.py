@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import NamedTuple, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -6,17 +8,20 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.config import get_settings
+from app.modules.arena.leaderboard import ContestLeaderboard, record_result
 from app.modules.arena.models import Contest, ContestParticipant
 from app.modules.arena.schemas import (
     ContestCreateRequest,
     ContestLeaderboardEntry,
+    ContestLeaderboardResponse,
     ContestResponse,
     ContestUpdateRequest,
 )
 from app.modules.exam.models import Exam
 from app.modules.questions.models import Question
 from app.modules.result.models import UserResult
-from app.modules.test.schemas import TestExamDetailResponse, TestSubmitRequest, TestSubmitResponse
+from app.modules.test.schemas import TestSubmitRequest, TestSubmitResponse
 from app.modules.test.service import TestService
 from app.modules.users.models import User
 
@@ -31,63 +36,108 @@ def _normalize_naive_utc(value: datetime) -> datetime:
     return value.replace(tzinfo=None)
 
 
+class ContestProfile(str, Enum):
+    """What a contest fetch eagerly loads besides the contest row."""
+
+    SUMMARY = "summary"  # exam row, for the title and its revision stamp
+    SCORING = "scoring"  # exam questions and answers, to grade a submission
+
+
+_PROFILE_OPTIONS = {
+    ContestProfile.SUMMARY: (selectinload(Contest.exam),),
+    ContestProfile.SCORING: (
+        selectinload(Contest.exam).selectinload(Exam.questions).selectinload(Question.answers),
+    ),
+}
+
+
+class ContestState(NamedTuple):
+    """Per-user view of a contest, from aggregate queries instead of the participant list."""
+
+    participant_count: int
+    participant: Optional[ContestParticipant]
+
+
 class ArenaService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.test_service = TestService(db)
+        self.leaderboard = ContestLeaderboard(db)
 
-    async def _get_contest_entity(self, contest_id: UUID) -> Contest:
+    async def _get_contest(
+        self, contest_id: UUID, profile: ContestProfile = ContestProfile.SUMMARY
+    ) -> Contest:
         result = await self.db.execute(
             select(Contest)
-            .options(
-                selectinload(Contest.exam).selectinload(Exam.audio),
-                selectinload(Contest.exam).selectinload(Exam.questions).selectinload(Question.answers),
-                selectinload(Contest.participants).selectinload(ContestParticipant.user),
-                selectinload(Contest.participants).selectinload(ContestParticipant.result),
-            )
+            .options(*_PROFILE_OPTIONS[profile])
             .where(Contest.contest_id == contest_id)
+            .execution_options(populate_existing=True)
         )
         contest = result.scalar_one_or_none()
         if not contest:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contest not found")
         return contest
 
-    def _build_leaderboard(self, contest: Contest) -> list[ContestLeaderboardEntry]:
-        ranked = sorted(
-            [participant for participant in contest.participants if participant.result is not None],
-            key=lambda participant: (
-                -(participant.result.score or 0.0),
-                participant.result.completed_at,
-                participant.joined_at,
-            ),
+    async def _get_participant(
+        self, contest_id: UUID, user_id: int
+    ) -> Optional[ContestParticipant]:
+        result = await self.db.execute(
+            select(ContestParticipant).where(
+                ContestParticipant.contest_id == contest_id,
+                ContestParticipant.user_id == user_id,
+            )
         )
+        return result.scalar_one_or_none()
 
-        leaderboard: list[ContestLeaderboardEntry] = []
-        for index, participant in enumerate(ranked, start=1):
-            user = participant.user
-            username = getattr(user, "username", f"user-{participant.user_id}")
-            first_name = getattr(user, "first_name", None)
-            last_name = getattr(user, "last_name", None)
-            display_name = (
-                f"{first_name} {last_name}".strip()
-                if first_name or last_name
-                else username
+    async def _require_participant(
+        self, contest_id: UUID, current_user: User
+    ) -> ContestParticipant:
+        participant = await self._get_participant(contest_id, current_user.id)
+        if not participant:
+            await self._get_contest(contest_id)  # 404 for a missing contest, 403 otherwise
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Join the contest first"
             )
-            leaderboard.append(
-                ContestLeaderboardEntry(
-                    user_id=participant.user_id,
-                    username=username,
-                    display_name=display_name,
-                    avatar_url=getattr(user, "avatar_url", None),
-                    score=round(participant.result.score or 0.0, 2),
-                    rank=index,
-                    joined_at=participant.joined_at,
+        return participant
+
+    async def _contest_states(
+        self, contest_ids: list[UUID], current_user: User
+    ) -> dict[UUID, ContestState]:
+        if not contest_ids:
+            return {}
+        counts = dict(
+            (
+                await self.db.execute(
+                    select(ContestParticipant.contest_id, func.count())
+                    .where(ContestParticipant.contest_id.in_(contest_ids))
+                    .group_by(ContestParticipant.contest_id)
+                )
+            ).all()
+        )
+        memberships = (
+            await self.db.execute(
+                select(ContestParticipant).where(
+                    ContestParticipant.contest_id.in_(contest_ids),
+                    ContestParticipant.user_id == current_user.id,
                 )
             )
-        return leaderboard
+        ).scalars()
+        mine = {participant.contest_id: participant for participant in memberships}
+        return {
+            contest_id: ContestState(
+                participant_count=counts.get(contest_id, 0), participant=mine.get(contest_id)
+            )
+            for contest_id in contest_ids
+        }
 
-    def _serialize_contest(self, contest: Contest, current_user: User) -> ContestResponse:
-        participant = next((item for item in contest.participants if item.user_id == current_user.id), None)
+    def _serialize_contest(
+        self,
+        contest: Contest,
+        state: ContestState,
+        leaderboard: list[ContestLeaderboardEntry],
+        my_entry: Optional[ContestLeaderboardEntry],
+    ) -> ContestResponse:
+        participant = state.participant
         return ContestResponse(
             contest_id=contest.contest_id,
             title=contest.title,
@@ -100,21 +150,27 @@ class ArenaService:
             creator_id=contest.creator_id,
             exam_id=contest.exam_id,
             exam_title=contest.exam.title if contest.exam else "Đề thi JLPT",
-            participant_count=len(contest.participants),
+            participant_count=state.participant_count,
             joined=participant is not None,
             joined_at=participant.joined_at if participant else None,
             result_id=participant.result_id if participant else None,
-            leaderboard=self._build_leaderboard(contest),
+            leaderboard=leaderboard,
+            my_entry=my_entry,
             created_at=contest.created_at,
             updated_at=contest.updated_at,
         )
 
+    async def _contest_response(self, contest: Contest, current_user: User) -> ContestResponse:
+        state = (await self._contest_states([contest.contest_id], current_user))[contest.contest_id]
+        preview_size = get_settings().CONTEST_LEADERBOARD_PREVIEW_SIZE
+        leaderboard = await self.leaderboard.page(contest.contest_id, preview_size)
+        my_entry = next((entry for entry in leaderboard if entry.user_id == current_user.id), None)
+        if my_entry is None and state.participant is not None and state.participant.result_id:
+            my_entry = await self.leaderboard.rank_of(contest.contest_id, current_user.id)
+        return self._serialize_contest(contest, state, leaderboard, my_entry)
+
     async def list_contests(self, current_user: User) -> list[ContestResponse]:
-        query = select(Contest).options(
-            selectinload(Contest.exam),
-            selectinload(Contest.participants).selectinload(ContestParticipant.user),
-            selectinload(Contest.participants).selectinload(ContestParticipant.result),
-        )
+        query = select(Contest).options(*_PROFILE_OPTIONS[ContestProfile.SUMMARY])
 
         # All users see all contests (except for end_time filtering if still applicable)
         cutoff = _utcnow() - timedelta(days=30)
@@ -126,11 +182,38 @@ class ArenaService:
 
         result = await self.db.execute(query.order_by(Contest.start_time.desc()))
         contests = result.scalars().unique().all()
-        return [self._serialize_contest(contest, current_user) for contest in contests]
+        contest_ids = [contest.contest_id for contest in contests]
+        states = await self._contest_states(contest_ids, current_user)
+        boards = await self.leaderboard.top_many(
+            contest_ids, get_settings().CONTEST_LEADERBOARD_PREVIEW_SIZE
+        )
+        my_entries = await self.leaderboard.rank_many(contest_ids, current_user.id)
+        return [
+            self._serialize_contest(
+                contest,
+                states[contest.contest_id],
+                boards[contest.contest_id],
+                my_entries.get(contest.contest_id),
+            )
+            for contest in contests
+        ]
 
     async def get_contest(self, contest_id: UUID, current_user: User) -> ContestResponse:
-        contest = await self._get_contest_entity(contest_id)
-        return self._serialize_contest(contest, current_user)
+        contest = await self._get_contest(contest_id)
+        return await self._contest_response(contest, current_user)
+
+    async def get_leaderboard(
+        self, contest_id: UUID, current_user: User, offset: int = 0, limit: int = 50
+    ) -> ContestLeaderboardResponse:
+        await self._get_contest(contest_id)
+        return ContestLeaderboardResponse(
+            contest_id=contest_id,
+            total=await self.leaderboard.size(contest_id),
+            offset=offset,
+            limit=limit,
+            entries=await self.leaderboard.page(contest_id, limit, offset),
+            my_entry=await self.leaderboard.rank_of(contest_id, current_user.id),
+        )
 
     async def create_contest(self, payload: ContestCreateRequest, current_user: User) -> ContestResponse:
         start_time = _normalize_naive_utc(payload.start_time)
@@ -158,14 +241,13 @@ class ArenaService:
         )
         self.db.add(contest)
         await self.db.commit()
-        await self.db.refresh(contest)
-        contest = await self._get_contest_entity(contest.contest_id)
-        return self._serialize_contest(contest, current_user)
+        contest = await self._get_contest(contest.contest_id)
+        return await self._contest_response(contest, current_user)
 
     async def update_contest(
         self, contest_id: UUID, payload: ContestUpdateRequest, current_user: User
     ) -> ContestResponse:
-        contest = await self._get_contest_entity(contest_id)
+        contest = await self._get_contest(contest_id)
         
         if contest.creator_id != current_user.id and current_user.role != "admin":
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You don't have permission to edit this contest")
@@ -194,42 +276,43 @@ class ArenaService:
             setattr(contest, key, value)
 
         await self.db.commit()
-        await self.db.refresh(contest)
-        contest = await self._get_contest_entity(contest_id)
-        return self._serialize_contest(contest, current_user)
+        contest = await self._get_contest(contest_id)
+        return await self._contest_response(contest, current_user)
 
     async def join_contest(self, contest_id: UUID, current_user: User) -> ContestResponse:
-        contest = await self._get_contest_entity(contest_id)
+        contest = await self._get_contest(contest_id)
         now = _utcnow()
         contest_end = contest.end_time.replace(tzinfo=timezone.utc)
 
         if contest_end < now:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Contest has expired")
 
-        existing = next((item for item in contest.participants if item.user_id == current_user.id), None)
-        if existing:
-            return self._serialize_contest(contest, current_user)
+        state = (await self._contest_states([contest_id], current_user))[contest_id]
+        if state.participant:
+            return await self._contest_response(contest, current_user)
 
-        if contest.max_participants is not None and len(contest.participants) >= contest.max_participants:
+        if (
+            contest.max_participants is not None
+            and state.participant_count >= contest.max_participants
+        ):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Contest is full")
 
         participant = ContestParticipant(contest_id=contest.contest_id, user_id=current_user.id)
         self.db.add(participant)
         await self.db.commit()
-        contest = await self._get_contest_entity(contest_id)
-        return self._serialize_contest(contest, current_user)
+        return await self._contest_response(contest, current_user)
 
     async def get_contest_exam_detail(
         self, contest_id: UUID, current_user: User
-    ) -> tuple[ContestResponse, TestExamDetailResponse]:
-        contest = await self._get_contest_entity(contest_id)
-        participant = next((item for item in contest.participants if item.user_id == current_user.id), None)
-        if not participant:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Join the contest first")
+    ) -> tuple[ContestResponse, bytes]:
+        """Contest summary plus the serialized ``TestExamDetailResponse`` with the contest's time limit."""
+        await self._require_participant(contest_id, current_user)
+        contest = await self._get_contest(contest_id)
 
-        exam_detail = self.test_service._build_exam_detail_response(contest.exam)
-        exam_detail.time_limit = contest.time_limit
-        return self._serialize_contest(contest, current_user), exam_detail
+        payload = await self.test_service.get_exam_detail_payload(
+            contest.exam_id, contest.exam.updated_at, time_limit=contest.time_limit
+        )
+        return await self._contest_response(contest, current_user), payload
 
     async def submit_contest(
         self,
@@ -237,20 +320,18 @@ class ArenaService:
         payload: TestSubmitRequest,
         current_user: User,
     ) -> tuple[ContestResponse, TestSubmitResponse]:
-        contest = await self._get_contest_entity(contest_id)
-        participant = next((item for item in contest.participants if item.user_id == current_user.id), None)
-        if not participant:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Join the contest first")
+        participant = await self._require_participant(contest_id, current_user)
         if participant.result_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Contest already submitted")
 
+        contest = await self._get_contest(contest_id, ContestProfile.SCORING)
         submission = await self.test_service._submit_exam_from_entity(contest.exam, payload, current_user)
 
         result = await self.db.get(UserResult, submission.result_id)
         if result:
             result.contest_id = contest.contest_id
+            record_result(participant, result)
         participant.result_id = submission.result_id
         await self.db.commit()
 
-        contest = await self._get_contest_entity(contest_id)
-        return self._serialize_contest(contest, current_user), submission
+        return await self._contest_response(contest, current_user), submission
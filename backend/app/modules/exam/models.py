@@ -1,11 +1,24 @@
+import re
 import uuid
 from sqlalchemy import Column, String, Integer, Text, Boolean, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
 from app.db.base import Base
 
+# Level tokens like: [N2], N2, (N2)
+JLPT_LEVEL_PATTERN = re.compile(r"(?<![A-Z0-9])\[?(N[1-5])\]?(?![A-Z0-9])", re.IGNORECASE)
+
+
+def detect_jlpt_level(title: str | None, description: str | None = None) -> str | None:
+    """First JLPT level token in the title, then the description (e.g. "N2")."""
+    for text in (title, description):
+        match = JLPT_LEVEL_PATTERN.search(text or "")
+        if match:
+            return match.group(1).upper()
+    return None
+
 
 class Exam(Base):
     __tablename__ = "exams"
@@ -18,6 +31,7 @@ class Exam(Base):
     time_limit = Column(Integer, nullable=True)   # minutes
     current_step = Column(Integer, default=1)     # UI wizard step 1–5
     is_published = Column(Boolean, default=False)
+    jlpt_level = Column(String(2), nullable=True, index=True)  # Derived from title/description
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -27,6 +41,13 @@ class Exam(Base):
     results = relationship("UserResult", back_populates="exam", cascade="all, delete-orphan")
     contests = relationship("Contest", back_populates="exam", cascade="all, delete-orphan")
 
+    @validates("title", "description")
+    def _sync_jlpt_level(self, key, value):
+        title = value if key == "title" else self.title
+        description = value if key == "description" else self.description
+        self.jlpt_level = detect_jlpt_level(title, description)
+        return value
+
     @property
     def audio_file_url(self) -> str | None:
         audio = self.__dict__.get("audio")
@@ -10,11 +10,10 @@ from app.core.security import get_current_user
 from app.modules.users.models import User
 from app.modules.exam.models import Exam
 from app.modules.exam.schemas import ExamCreate, ExamUpdate, ExamResponse, ExamListResponse
-import io
-import httpx
-from pydub import AudioSegment
 from app.modules.audio.models import Audio
 from app.modules.questions.models import Question
+from app.shared.audio_utils import merge_audio_files
+from app.shared.clip_cache import get_clip_cache
 from app.shared.upload import upload_audio_bytes
 
 router = APIRouter(prefix="/exams", tags=["exams"])
@@ -168,36 +167,20 @@ async def merge_exam_audio(
     if not audio_urls:
         raise HTTPException(status_code=400, detail="Cannot merge: No questions have audio clips.")
 
-    merged_audio = AudioSegment.empty()
-    silence = AudioSegment.silent(duration=2000)
-
     try:
-        async with httpx.AsyncClient() as client:
-            for i, url in enumerate(audio_urls):
-                r = await client.get(url, timeout=30.0)
-                if r.status_code == 200:
-                    audio_file = io.BytesIO(r.content)
-                    try:
-                        segment = AudioSegment.from_file(audio_file)
-                        if i > 0:
-                            merged_audio += silence
-                        merged_audio += segment
-                    except Exception as e:
-                        print(f"Error parsing audio for {url}: {e}")
-                else:
-                    print(f"Failed to download audio for {url}: {r.status_code}")
+        merged_audio = await merge_audio_files(
+            audio_urls,
+            silence_duration=2,
+            clip_cache=get_clip_cache(),
+            output_format="mp3",
+            skip_failed=True,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to download audio files: {e}")
 
-    out_f = io.BytesIO()
-    merged_audio.export(out_f, format="mp3", bitrate="128k")
-    out_f.seek(0)
-
     from uuid import uuid4
     upload_res = await upload_audio_bytes(
-        out_f.read(),
-        filename=f"exam_merged_{uuid4().hex[:8]}.mp3",
-        folder="merged-audio"
+        merged_audio, filename=f"exam_merged_{uuid4().hex[:8]}.mp3", folder="merged-audio"
     )
 
     new_audio = Audio(
@@ -235,4 +218,3 @@ async def delete_exam(
     
     await db.delete(exam)
     await db.commit()
-
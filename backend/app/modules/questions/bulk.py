@@ -0,0 +1,109 @@
+"""Bulk materialization of an exam's questions and answers.
+
+Question and answer IDs are generated client-side, so every row can be built
+up front. All rows are then written with multi-row ``INSERT ... VALUES``:
+one statement for the questions and one for the answers. SQLAlchemy's
+"insertmanyvalues" batching only starts a new statement every 1000 rows, and
+the statement compiles once per batch size and is cached. ``.values(rows)``
+would instead compile a fresh statement for every call. This replaces the
+flush-per-question pattern, which cost one round trip per question plus
+unit-of-work bookkeeping for every answer.
+
+The rows bypass the ORM session. Callers that need the new questions as ORM
+objects should query them afterwards. The exam row itself should be
+written through the session in the same transaction, so that the random-exam
+question-bank index sees the change.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.questions.models import Answer, Question
+
+
+@dataclass
+class AnswerDraft:
+    content: Optional[str] = None
+    image_url: Optional[str] = None
+    is_correct: bool = False
+    order_index: Optional[int] = None
+
+
+@dataclass
+class QuestionDraft:
+    mondai_group: Optional[str] = None
+    question_number: Optional[int] = None
+    audio_clip_url: Optional[str] = None
+    question_text: Optional[str] = None
+    image_url: Optional[str] = None
+    script_text: Optional[str] = None
+    explanation: Optional[str] = None
+    raw_transcript: Optional[str] = None
+    hide_question_text: bool = False
+    difficulty: Optional[int] = None
+    answers: List[AnswerDraft] = field(default_factory=list)
+
+
+def build_question_rows(
+    exam_id: uuid.UUID,
+    drafts: Sequence[QuestionDraft],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Question and answer rows with fresh UUIDs; ``order_index`` defaults to the position."""
+    question_rows: List[Dict[str, Any]] = []
+    answer_rows: List[Dict[str, Any]] = []
+    for draft in drafts:
+        question_id = uuid.uuid4()
+        question_rows.append(
+            {
+                "question_id": question_id,
+                "exam_id": exam_id,
+                "mondai_group": draft.mondai_group,
+                "question_number": draft.question_number,
+                "audio_clip_url": draft.audio_clip_url,
+                "question_text": draft.question_text,
+                "image_url": draft.image_url,
+                "script_text": draft.script_text,
+                "explanation": draft.explanation,
+                "raw_transcript": draft.raw_transcript,
+                "hide_question_text": bool(draft.hide_question_text),
+                "difficulty": draft.difficulty,
+            }
+        )
+        for index, answer in enumerate(draft.answers):
+            answer_rows.append(
+                {
+                    "answer_id": uuid.uuid4(),
+                    "question_id": question_id,
+                    "content": answer.content,
+                    "image_url": answer.image_url,
+                    "is_correct": bool(answer.is_correct),
+                    "order_index": answer.order_index if answer.order_index is not None else index,
+                }
+            )
+    return question_rows, answer_rows
+
+
+async def insert_exam_questions(
+    db: AsyncSession,
+    exam_id: uuid.UUID,
+    drafts: Sequence[QuestionDraft],
+) -> List[uuid.UUID]:
+    """Insert ``drafts`` into ``exam_id`` in as few statements as possible.
+
+    Returns the new question IDs.
+    """
+    question_rows, answer_rows = build_question_rows(exam_id, drafts)
+    if question_rows:
+        # RETURNING opts the executemany into multi-row VALUES batches on asyncpg.
+        await db.execute(
+            insert(Question.__table__).returning(Question.__table__.c.question_id), question_rows
+        )
+    if answer_rows:
+        await db.execute(
+            insert(Answer.__table__).returning(Answer.__table__.c.answer_id), answer_rows
+        )
+    return [row["question_id"] for row in question_rows]
@@ -1,13 +1,28 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Text, Boolean, ForeignKey
+from sqlalchemy import (
+    Column,
+    String,
+    Integer,
+    Text,
+    Boolean,
+    ForeignKey,
+    Index,
+    event,
+    func,
+    inspect,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 
 from app.db.base import Base
 
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (Index("ix_questions_exam_id_mondai_group", "exam_id", "mondai_group"),)
 
     question_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     exam_id = Column(UUID(as_uuid=True), ForeignKey("exams.exam_id", ondelete="CASCADE"), nullable=False)
@@ -39,3 +54,38 @@ class Answer(Base):
 
     # Relationships
     question = relationship("Question", back_populates="answers")
+
+
+@event.listens_for(Session, "after_flush")
+def _touch_exams_of_changed_questions(session: Session, flush_context) -> None:
+    """Bump ``Exam.updated_at`` when its questions or answers change.
+
+    Exam-level caches (e.g. the test-taking payload cache) use ``updated_at``
+    as their revision stamp. Bulk statements bypass this hook, so they must
+    update the exam row themselves.
+    """
+    exam_ids, question_ids = set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Question):
+            exam_ids.add(obj.exam_id)
+            exam_ids.update(inspect(obj).attrs.exam_id.history.deleted or ())
+        elif isinstance(obj, Answer):
+            question_ids.add(obj.question_id)
+            question_ids.update(inspect(obj).attrs.question_id.history.deleted or ())
+    exam_ids.discard(None)
+    question_ids.discard(None)
+    if not exam_ids and not question_ids:
+        return
+
+    exams = Base.metadata.tables["exams"]
+    touched = []
+    if exam_ids:
+        touched.append(exams.c.exam_id.in_(exam_ids))
+    if question_ids:
+        touched.append(
+            exams.c.exam_id.in_(
+                select(Question.exam_id).where(Question.question_id.in_(question_ids))
+            )
+        )
+    # Core statement on the flush connection: no ORM events, no autoflush.
+    session.connection().execute(update(exams).where(or_(*touched)).values(updated_at=func.now()))
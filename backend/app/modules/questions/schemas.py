@@ -2,6 +2,8 @@ from uuid import UUID
 from typing import Optional, List
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.shared.clip_store import AudioClipUrl
+
 
 # ---------------------------------------------------------------------------
 # Answer schemas
@@ -57,7 +59,7 @@ class AnswerResponse(AnswerBase):
 class QuestionBase(BaseModel):
     mondai_group: Optional[str] = Field(None, description="e.g. 'Mondai 1'")
     question_number: Optional[int] = Field(None, description="Question number within the group")
-    audio_clip_url: Optional[str] = Field(None, description="URL for the specific audio clip")
+    audio_clip_url: AudioClipUrl = Field(None, description="URL for the specific audio clip")
     question_text: Optional[str] = Field(None, description="Question text")
     image_url: Optional[str] = Field(None, description="Image URL for image-type questions")
     script_text: Optional[str] = Field(None, description="Dialogue script shown to learners")
@@ -76,7 +78,7 @@ class QuestionCreate(QuestionBase):
 class QuestionUpdate(BaseModel):
     mondai_group: Optional[str] = None
     question_number: Optional[int] = None
-    audio_clip_url: Optional[str] = None
+    audio_clip_url: AudioClipUrl = None
     question_text: Optional[str] = None
     image_url: Optional[str] = None
     script_text: Optional[str] = None
@@ -0,0 +1,241 @@
+"""In-process question-bank index for random exam generation.
+
+Each JLPT level is loaded once as compact ``QuestionRef`` records, grouped
+level -> mondai -> question_number -> source exam. This is the bucket layout
+the random selector draws from. Generation therefore reads the index instead
+of the database, and only the finally chosen questions are hydrated with
+answers.
+
+Committed ORM writes to ``Exam`` or ``Question`` mark their exams dirty. The
+next read re-loads just those exams and splices them into the loaded levels.
+Bulk ``update()``/``delete()`` statements against either table drop the whole
+index. Writes from other processes (other API workers, Celery) are only
+picked up after ``ttl_seconds``.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.modules.exam.models import Exam
+from app.modules.questions.models import Question
+
+# Questions without a number are drawn after every numbered round.
+UNNUMBERED = 10**9
+
+
+class QuestionRef(NamedTuple):
+    question_id: UUID
+    exam_id: UUID
+    mondai_group: str
+    question_number: Optional[int]
+    difficulty: Optional[int]
+
+
+def number_key(question_number: Optional[int]) -> int:
+    return question_number if (question_number or 0) > 0 else UNNUMBERED
+
+
+class LevelIndex:
+    """Questions of one level: ``groups[mondai][number_key][exam_id] -> [QuestionRef]``."""
+
+    def __init__(self, level: str):
+        self.level = level
+        self.groups: Dict[str, Dict[int, Dict[UUID, List[QuestionRef]]]] = {}
+        self.counts: Dict[str, int] = {}
+        self._exam_slots: Dict[UUID, Set[Tuple[str, int]]] = {}
+
+    def add(self, ref: QuestionRef) -> None:
+        key = number_key(ref.question_number)
+        self.groups.setdefault(ref.mondai_group, {}).setdefault(key, {}).setdefault(
+            ref.exam_id, []
+        ).append(ref)
+        self.counts[ref.mondai_group] = self.counts.get(ref.mondai_group, 0) + 1
+        self._exam_slots.setdefault(ref.exam_id, set()).add((ref.mondai_group, key))
+
+    def remove_exam(self, exam_id: UUID) -> None:
+        for mondai, key in self._exam_slots.pop(exam_id, ()):
+            by_exam = self.groups[mondai][key]
+            self.counts[mondai] -= len(by_exam.pop(exam_id, ()))
+            if not by_exam:
+                del self.groups[mondai][key]
+            if not self.groups[mondai]:
+                del self.groups[mondai]
+                del self.counts[mondai]
+
+    def refs(self, mondai: Optional[str] = None) -> Iterable[QuestionRef]:
+        mondais = [mondai] if mondai is not None else list(self.groups)
+        for group in mondais:
+            for by_exam in self.groups.get(group, {}).values():
+                for bucket in by_exam.values():
+                    yield from bucket
+
+
+_live_indexes: "weakref.WeakSet[QuestionBankIndex]" = weakref.WeakSet()
+
+
+class QuestionBankIndex:
+    def __init__(self, ttl_seconds: float = 300):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._levels: Dict[str, LevelIndex] = {}
+        self._exam_levels: Dict[UUID, str] = {}
+        self._loaded_at = 0.0
+        # Invalidations arrive from session events, possibly on other threads.
+        self._pending_lock = threading.Lock()
+        self._dirty_exams: Set[UUID] = set()
+        self._stale = False
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        _live_indexes.add(self)
+
+    def invalidate_exams(self, exam_ids: Iterable[UUID]) -> None:
+        with self._pending_lock:
+            self._dirty_exams.update(exam_ids)
+
+    def invalidate_all(self) -> None:
+        with self._pending_lock:
+            self._stale = True
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "levels": {level: dict(index.counts) for level, index in self._levels.items()},
+            "dirty_exams": len(self._dirty_exams),
+        }
+
+    async def level(self, db: AsyncSession, jlpt_level: str) -> LevelIndex:
+        """Current index for ``jlpt_level``; loads the level or applies pending changes first."""
+        level = jlpt_level.upper()
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            with self._pending_lock:
+                stale, self._stale = self._stale, False
+                dirty, self._dirty_exams = self._dirty_exams, set()
+            if stale or (self._levels and time.monotonic() - self._loaded_at > self.ttl_seconds):
+                self._levels.clear()
+                self._exam_levels.clear()
+                dirty = set()
+                self.version += 1
+            if dirty and self._levels:
+                await self._apply_exam_changes(db, dirty)
+            if level not in self._levels:
+                await self._load_level(db, level)
+            return self._levels[level]
+
+    @staticmethod
+    def _ref(row) -> QuestionRef:
+        return QuestionRef(
+            question_id=row.question_id,
+            exam_id=row.exam_id,
+            mondai_group=row.mondai_group or "Unknown",
+            question_number=row.question_number,
+            difficulty=row.difficulty,
+        )
+
+    _columns = (
+        Question.question_id,
+        Question.exam_id,
+        Question.mondai_group,
+        Question.question_number,
+        Question.difficulty,
+    )
+
+    async def _load_level(self, db: AsyncSession, level: str) -> None:
+        stmt = (
+            select(*self._columns)
+            .join(Exam, Exam.exam_id == Question.exam_id)
+            .where(Exam.jlpt_level == level, Exam.is_published == True)
+        )
+        index = LevelIndex(level)
+        for row in (await db.execute(stmt)).all():
+            index.add(self._ref(row))
+            self._exam_levels[row.exam_id] = level
+        if not self._levels:
+            self._loaded_at = time.monotonic()
+        self._levels[level] = index
+        self.version += 1
+
+    async def _apply_exam_changes(self, db: AsyncSession, exam_ids: Set[UUID]) -> None:
+        stmt = (
+            select(*self._columns, Exam.jlpt_level)
+            .join(Exam, Exam.exam_id == Question.exam_id)
+            .where(
+                Question.exam_id.in_(list(exam_ids)),
+                Exam.jlpt_level.in_(list(self._levels)),
+                Exam.is_published == True,
+            )
+        )
+        rows = (await db.execute(stmt)).all()
+        for exam_id in exam_ids:
+            previous = self._exam_levels.pop(exam_id, None)
+            if previous in self._levels:
+                self._levels[previous].remove_exam(exam_id)
+        for row in rows:
+            self._levels[row.jlpt_level].add(self._ref(row))
+            self._exam_levels[row.exam_id] = row.jlpt_level
+        self.version += 1
+
+
+@lru_cache
+def get_question_bank() -> QuestionBankIndex:
+    from app.core.config import get_settings
+
+    return QuestionBankIndex(ttl_seconds=get_settings().QUESTION_BANK_INDEX_TTL_SECONDS)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation from ORM writes
+# ---------------------------------------------------------------------------
+
+_PENDING_EXAMS = "question_bank_dirty_exams"
+_PENDING_ALL = "question_bank_stale"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_exams(session: Session, flush_context) -> None:
+    changed: Set[UUID] = session.info.setdefault(_PENDING_EXAMS, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Exam):
+            changed.add(obj.exam_id)
+        elif isinstance(obj, Question):
+            changed.add(obj.exam_id)
+            # A question moved to another exam leaves its old one too.
+            changed.update(inspect(obj).attrs.exam_id.history.deleted or ())
+    changed.discard(None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_writes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (Exam, Question):
+        orm_execute_state.session.info[_PENDING_ALL] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    changed = session.info.pop(_PENDING_EXAMS, None)
+    stale = session.info.pop(_PENDING_ALL, False)
+    if not changed and not stale:
+        return
+    for index in list(_live_indexes):
+        if stale:
+            index.invalidate_all()
+        else:
+            index.invalidate_exams(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_EXAMS, None)
+    session.info.pop(_PENDING_ALL, None)
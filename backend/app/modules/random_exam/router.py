@@ -17,7 +17,8 @@ from app.db.session import get_db
 from app.modules.audio.models import Audio
 from app.modules.exam.models import Exam
 from app.modules.exam.schemas import ExamResponse
-from app.modules.questions.models import Answer, Question
+from app.modules.questions.bulk import AnswerDraft, QuestionDraft, insert_exam_questions
+from app.modules.questions.models import Question
 from app.modules.random_exam.schemas import (
     AnswerResponse,
     AudioMergeRequest,
@@ -31,13 +32,14 @@ from app.modules.random_exam.schemas import (
 from app.modules.random_exam.service import RandomExamService
 from app.modules.users.models import User
 from app.shared.audio_utils import merge_audio_files
+from app.shared.clip_cache import get_clip_cache
+from app.shared.job_store import JobRegistry
 from app.shared.upload import upload_audio_bytes
 
 router = APIRouter(prefix="/exams/random", tags=["random-exams"])
 logger = logging.getLogger(__name__)
 
-# In-memory job storage (use Redis in production)
-_jobs: dict[str, dict] = {}
+_jobs = JobRegistry("random_exam", RandomExamJobStatusResponse)
 _service = RandomExamService()
 
 
@@ -91,9 +93,9 @@ async def generate_random_exam(
     """
     try:
         # Validate question pool first; do not create draft exam if requirements cannot be met.
-        available = await _service.get_available_questions(db, payload.jlpt_level)
+        available_counts = await _service.count_available_questions(db, payload.jlpt_level)
         _service.validate_mondai_pool(
-            available,
+            available_counts,
             [c.model_dump() for c in payload.mondai_config],
             payload.jlpt_level,
         )
@@ -114,20 +116,19 @@ async def generate_random_exam(
         await db.flush()
 
         # Initialize job state
-        job_state = {
-            "exam_id": exam_id,
-            "job_id": job_id,
-            "status": "processing",
-            "progress_message": "Initializing random exam generation...",
-            "title": payload.title,
-            "description": payload.description,
-            "level": payload.jlpt_level,
-            "total_questions": 0,
-            "mondai_summary": {},
-            "questions": [],
-            "error": None,
-        }
-        _jobs[job_id] = job_state
+        await _jobs.put(
+            job_id,
+            RandomExamJobStatusResponse(
+                exam_id=exam_id,
+                job_id=job_id,
+                status="processing",
+                progress_message="Initializing random exam generation...",
+                title=payload.title,
+                description=payload.description,
+                level=payload.jlpt_level,
+                total_questions=0,
+            ),
+        )
 
         # Start background task
         background_tasks.add_task(
@@ -170,17 +171,14 @@ async def _generate_exam_background(
 ):
     """Background task for random exam generation"""
     try:
-        job_state = _jobs.get(job_id)
+        job_state = await _jobs.get(job_id)
         if not job_state:
             logger.error(f"Job state not found for job_id: {job_id}")
             return
 
-        # Step 1: Get available questions
-        job_state["progress_message"] = "Fetching available questions from database..."
-        available = await _service.get_available_questions(db, payload.jlpt_level)
-
-        # Step 2: Generate random selection with special mondai 5 handling
-        job_state["progress_message"] = "Selecting random questions..."
+        # Step 1-2: Fetch the level's pool and select questions with special mondai 5 handling
+        job_state.progress_message = "Selecting random questions..."
+        await _jobs.put(job_id, job_state)
         result = await _service.generate_random_exam(
             db=db,
             title=payload.title,
@@ -190,15 +188,17 @@ async def _generate_exam_background(
         )
 
         # Step 3: Convert questions to responses
-        job_state["progress_message"] = "Preparing results..."
+        job_state.progress_message = "Preparing results..."
+        await _jobs.put(job_id, job_state)
         question_responses = [_question_to_response(q) for q in result["questions"]]
 
         # Step 4: Update job state
-        job_state["status"] = "done"
-        job_state["progress_message"] = "Random exam generated successfully!"
-        job_state["total_questions"] = result["total_questions"]
-        job_state["mondai_summary"] = result["mondai_summary"]
-        job_state["questions"] = question_responses
+        job_state.status = "done"
+        job_state.progress_message = "Random exam generated successfully!"
+        job_state.total_questions = result["total_questions"]
+        job_state.mondai_summary = result["mondai_summary"]
+        job_state.questions = question_responses
+        await _jobs.put(job_id, job_state)
 
         logger.info(
             f"Random exam generated successfully: {result['total_questions']} questions, "
@@ -207,11 +207,12 @@ async def _generate_exam_background(
 
     except Exception as e:
         logger.error(f"Error in background exam generation: {str(e)}")
-        job_state = _jobs.get(job_id)
+        job_state = await _jobs.get(job_id)
         if job_state:
-            job_state["status"] = "failed"
-            job_state["error"] = str(e)
-            job_state["progress_message"] = ""
+            job_state.status = "failed"
+            job_state.error = str(e)
+            job_state.progress_message = ""
+            await _jobs.put(job_id, job_state)
 
 
 @router.get("/job/{job_id}", response_model=RandomExamJobStatusResponse)
@@ -225,30 +226,16 @@ async def get_job_status(job_id: str):
     - questions: Generated questions (only when status is "done")
     - error: Error message (only when status is "failed")
     """
-    job_state = _jobs.get(job_id)
+    job_state = await _jobs.get(job_id)
     if not job_state:
         raise HTTPException(status_code=404, detail="Job not found")
-
-    return RandomExamJobStatusResponse(
-        exam_id=job_state["exam_id"],
-        job_id=job_state["job_id"],
-        status=job_state["status"],
-        progress_message=job_state.get("progress_message", ""),
-        title=job_state["title"],
-        description=job_state.get("description"),
-        level=job_state["level"],
-        total_questions=job_state.get("total_questions", 0),
-        mondai_summary=job_state.get("mondai_summary", {}),
-        questions=job_state.get("questions", []),
-        error=job_state.get("error"),
-    )
+    return job_state
 
 
 @router.delete("/job/{job_id}", status_code=204)
 async def delete_job(job_id: str):
-    """Clean up job from memory"""
-    if job_id in _jobs:
-        del _jobs[job_id]
+    """Clean up job from the job store"""
+    await _jobs.delete(job_id)
 
 
 @router.get("/available-questions", response_model=dict)
@@ -268,12 +255,18 @@ async def get_available_questions(
     """
     try:
         available = await _service.get_available_questions(db, level)
+        questions = await _service.load_questions(
+            db, [ref.question_id for refs in available.values() for ref in refs]
+        )
+        by_id = {q.question_id: q for q in questions}
 
         result = {}
-        for mondai_group, questions in available.items():
+        for mondai_group, refs in available.items():
+            # The index may briefly list questions another process has just deleted.
+            group_questions = [by_id[ref.question_id] for ref in refs if ref.question_id in by_id]
             result[mondai_group] = {
-                "count": len(questions),
-                "questions": [_question_to_response(q) for q in questions],
+                "count": len(group_questions),
+                "questions": [_question_to_response(q) for q in group_questions],
             }
 
         return result
@@ -408,6 +401,7 @@ async def create_exam_from_random(
                 logger.warning(f"Source question not found: {src_id}")
 
         processed_edited_ids: set[str] = set()
+        drafts: list[QuestionDraft] = []
 
         mondai_counters: dict[str, int] = {}
         for src_question in ordered_source_questions:
@@ -421,54 +415,6 @@ async def create_exam_from_random(
                 next_question_number = mondai_counters.get(mondai_key, 0) + 1
                 mondai_counters[mondai_key] = next_question_number
 
-                # Create copy of question in new exam
-                new_question = Question(
-                    question_id=uuid.uuid4(),
-                    exam_id=new_exam_id,
-                    mondai_group=mondai_key,
-                    question_number=next_question_number,
-                    audio_clip_url=(
-                        edited.audio_clip_url
-                        if edited and edited.audio_clip_url is not None
-                        else src_question.audio_clip_url
-                    ),
-                    question_text=(
-                        edited.question_text
-                        if edited and edited.question_text is not None
-                        else src_question.question_text
-                    ),
-                    image_url=(
-                        edited.image_url
-                        if edited and edited.image_url is not None
-                        else src_question.image_url
-                    ),
-                    script_text=(
-                        edited.script_text
-                        if edited and edited.script_text is not None
-                        else src_question.script_text
-                    ),
-                    explanation=(
-                        edited.explanation
-                        if edited and edited.explanation is not None
-                        else src_question.explanation
-                    ),
-                    raw_transcript=(
-                        edited.raw_transcript
-                        if edited and edited.raw_transcript is not None
-                        else src_question.raw_transcript
-                    ),
-                    hide_question_text=(
-                        edited.hide_question_text if edited else src_question.hide_question_text
-                    ),
-                    difficulty=(
-                        edited.difficulty
-                        if edited and edited.difficulty is not None
-                        else src_question.difficulty
-                    ),
-                )
-                db.add(new_question)
-                await db.flush()
-
                 # Copy answers
                 source_answers = (
                     edited.answers
@@ -483,21 +429,67 @@ async def create_exam_from_random(
                         for a in src_question.answers
                     ]
                 )
-
-                for idx, src_answer in enumerate(source_answers):
+                answers: list[AnswerDraft] = []
+                for src_answer in source_answers:
                     content = src_answer.content if hasattr(src_answer, "content") else src_answer.get("content")
                     image_url = src_answer.image_url if hasattr(src_answer, "image_url") else src_answer.get("image_url")
                     is_correct = src_answer.is_correct if hasattr(src_answer, "is_correct") else src_answer.get("is_correct", False)
                     order_index = src_answer.order_index if hasattr(src_answer, "order_index") else src_answer.get("order_index")
-                    new_answer = Answer(
-                        answer_id=uuid.uuid4(),
-                        question_id=new_question.question_id,
-                        content=content,
-                        image_url=image_url,
-                        is_correct=bool(is_correct),
-                        order_index=order_index if order_index is not None else idx,
+                    answers.append(
+                        AnswerDraft(
+                            content=content,
+                            image_url=image_url,
+                            is_correct=bool(is_correct),
+                            order_index=order_index,
+                        )
+                    )
+
+                # Copy of the question for the new exam
+                drafts.append(
+                    QuestionDraft(
+                        mondai_group=mondai_key,
+                        question_number=next_question_number,
+                        audio_clip_url=(
+                            edited.audio_clip_url
+                            if edited and edited.audio_clip_url is not None
+                            else src_question.audio_clip_url
+                        ),
+                        question_text=(
+                            edited.question_text
+                            if edited and edited.question_text is not None
+                            else src_question.question_text
+                        ),
+                        image_url=(
+                            edited.image_url
+                            if edited and edited.image_url is not None
+                            else src_question.image_url
+                        ),
+                        script_text=(
+                            edited.script_text
+                            if edited and edited.script_text is not None
+                            else src_question.script_text
+                        ),
+                        explanation=(
+                            edited.explanation
+                            if edited and edited.explanation is not None
+                            else src_question.explanation
+                        ),
+                        raw_transcript=(
+                            edited.raw_transcript
+                            if edited and edited.raw_transcript is not None
+                            else src_question.raw_transcript
+                        ),
+                        hide_question_text=(
+                            edited.hide_question_text if edited else src_question.hide_question_text
+                        ),
+                        difficulty=(
+                            edited.difficulty
+                            if edited and edited.difficulty is not None
+                            else src_question.difficulty
+                        ),
+                        answers=answers,
                     )
-                    db.add(new_answer)
+                )
 
                 if edited:
                     processed_edited_ids.add(edited.question_id)
@@ -515,33 +507,32 @@ async def create_exam_from_random(
             next_question_number = mondai_counters.get(mondai_key, 0) + 1
             mondai_counters[mondai_key] = next_question_number
 
-            new_question = Question(
-                question_id=uuid.uuid4(),
-                exam_id=new_exam_id,
-                mondai_group=mondai_key,
-                question_number=next_question_number,
-                audio_clip_url=edited.audio_clip_url,
-                question_text=edited.question_text,
-                image_url=edited.image_url,
-                script_text=edited.script_text,
-                explanation=edited.explanation,
-                raw_transcript=edited.raw_transcript,
-                hide_question_text=edited.hide_question_text,
-                difficulty=edited.difficulty,
+            drafts.append(
+                QuestionDraft(
+                    mondai_group=mondai_key,
+                    question_number=next_question_number,
+                    audio_clip_url=edited.audio_clip_url,
+                    question_text=edited.question_text,
+                    image_url=edited.image_url,
+                    script_text=edited.script_text,
+                    explanation=edited.explanation,
+                    raw_transcript=edited.raw_transcript,
+                    hide_question_text=edited.hide_question_text,
+                    difficulty=edited.difficulty,
+                    answers=[
+                        AnswerDraft(
+                            content=answer.content,
+                            image_url=answer.image_url,
+                            is_correct=bool(answer.is_correct),
+                            order_index=answer.order_index,
+                        )
+                        for answer in edited.answers
+                    ],
+                )
             )
-            db.add(new_question)
-            await db.flush()
 
-            for idx, answer in enumerate(edited.answers):
-                new_answer = Answer(
-                    answer_id=uuid.uuid4(),
-                    question_id=new_question.question_id,
-                    content=answer.content,
-                    image_url=answer.image_url,
-                    is_correct=bool(answer.is_correct),
-                    order_index=answer.order_index if answer.order_index is not None else idx,
-                )
-                db.add(new_answer)
+        # Step 4: Write every question and answer in bulk (IDs are generated client-side).
+        await insert_exam_questions(db, new_exam_id, drafts)
 
         await db.commit()
         await db.refresh(new_exam)
@@ -573,6 +564,7 @@ async def merge_audio_endpoint(
         merged_audio = await merge_audio_files(
             audio_urls=payload.audio_urls,
             silence_duration=payload.silence_duration,
+            clip_cache=get_clip_cache(),
         )
 
         logger.info("Audio merge completed. Merged file size: %s bytes", len(merged_audio))
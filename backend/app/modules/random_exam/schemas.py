@@ -4,6 +4,8 @@ from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from app.shared.clip_store import AudioClipUrl
+
 
 class MondaiCountConfig(BaseModel):
     """Configuration for number of questions per mondai."""
@@ -43,7 +45,7 @@ class QuestionInRandomExam(BaseModel):
     exam_id: str
     mondai_group: Optional[str] = None
     question_number: Optional[int] = None
-    audio_clip_url: Optional[str] = None
+    audio_clip_url: AudioClipUrl = None
     question_text: Optional[str] = None
     image_url: Optional[str] = None
     script_text: Optional[str] = None
@@ -102,7 +104,7 @@ class RandomExamCreateRequest(BaseModel):
         question_id: str
         mondai_group: Optional[str] = None
         question_number: Optional[int] = None
-        audio_clip_url: Optional[str] = None
+        audio_clip_url: AudioClipUrl = None
         question_text: Optional[str] = None
         image_url: Optional[str] = None
         script_text: Optional[str] = None
@@ -7,8 +7,7 @@ based on specified configurations. It supports special handling for Mondai 5 (N1
 
 import random
 import logging
-import re
-from typing import List, Dict, Optional, Set
+from typing import Any, List, Dict, Mapping, Optional, Sequence
 from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,6 +15,12 @@ from sqlalchemy.orm import selectinload
 
 from app.modules.questions.models import Question, Answer
 from app.modules.exam.models import Exam
+from app.modules.random_exam.question_bank import (
+    QuestionBankIndex,
+    QuestionRef,
+    get_question_bank,
+    number_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,60 +28,88 @@ logger = logging.getLogger(__name__)
 class RandomExamService:
     """Service for generating random exams from existing question pool"""
 
-    def __init__(self):
-        self._jobs: Dict[str, Dict] = {}
+    def __init__(self, question_bank: Optional[QuestionBankIndex] = None):
+        self._question_bank = question_bank
+
+    @property
+    def question_bank(self) -> QuestionBankIndex:
+        return self._question_bank or get_question_bank()
+
+    @staticmethod
+    def _select_diverse_questions(pool: List[Any], count: int) -> List[Any]:
+        """Select from a flat pool; see ``_select_from_buckets``."""
+        if count <= 0 or not pool:
+            return []
+
+        # Group by question_number, then by source exam.
+        by_number_exam: Dict[int, Dict[Any, List[Any]]] = {}
+        for q in pool:
+            by_number_exam.setdefault(number_key(q.question_number), {}).setdefault(
+                q.exam_id, []
+            ).append(q)
+
+        return RandomExamService._select_from_buckets(by_number_exam, count)
 
     @staticmethod
-    def _select_diverse_questions(pool: List[Question], count: int) -> List[Question]:
+    def _select_from_buckets(
+        by_number_exam: Mapping[int, Mapping[Any, Sequence[Any]]],
+        count: int,
+    ) -> List[Any]:
         """Select questions in rounds with non-deterministic cross-exam mixing.
 
         Desired behavior:
         - Continue selecting by question-number rounds until enough questions.
         - Mix across many source exams but avoid rigid round-robin patterns.
         - Allow occasional consecutive picks from the same exam naturally.
+
+        ``by_number_exam`` is ``{question_number: {exam_id: [question, ...]}}``
+        and is not modified, so the shared question-bank index can be passed
+        directly. A bucket is only copied and shuffled once it is drawn from.
         """
-        if count <= 0 or not pool:
+        if count <= 0 or not by_number_exam:
             return []
 
-        # Group by question_number, then by source exam.
-        by_number_exam: Dict[int, Dict[str, List[Question]]] = {}
-        seen_exams: Set[str] = set()
-
-        for q in pool:
-            key = q.question_number if (q.question_number or 0) > 0 else 10**9
-            exam_key = str(q.exam_id)
-            seen_exams.add(exam_key)
-            by_number_exam.setdefault(key, {}).setdefault(exam_key, []).append(q)
-
-        for exam_map in by_number_exam.values():
-            for bucket in exam_map.values():
-                random.shuffle(bucket)
-
         ordered_numbers = sorted(by_number_exam.keys())
-        selected: List[Question] = []
-        last_exam_id: Optional[str] = None
+        open_exams: Dict[int, List[Any]] = {}
+        drawn: Dict[tuple, List[Any]] = {}
+        selected: List[Any] = []
+        last_exam_id: Optional[Any] = None
 
         while len(selected) < count:
             progressed = False
 
             for number in ordered_numbers:
-                exam_map = by_number_exam.get(number, {})
-                available_exams = [eid for eid, items in exam_map.items() if items]
+                if number not in open_exams:
+                    open_exams[number] = [
+                        eid for eid, items in by_number_exam[number].items() if items
+                    ]
+                available_exams = open_exams[number]
                 if not available_exams:
                     continue
 
-                # Weighted random: prefer switching exam, but keep natural randomness.
-                if last_exam_id and len(available_exams) > 1:
-                    switch_candidates = [eid for eid in available_exams if eid != last_exam_id]
-                    stay_candidates = [eid for eid in available_exams if eid == last_exam_id]
-                    weighted: List[str] = []
-                    weighted.extend(switch_candidates * 4)
-                    weighted.extend(stay_candidates * 2)
-                    chosen_exam = random.choice(weighted if weighted else available_exams)
+                # Weighted random: prefer switching exam (weight 4 each) over staying (weight 2).
+                if last_exam_id is not None and len(available_exams) > 1:
+                    switch_count = len(available_exams)
+                    can_stay = last_exam_id in available_exams
+                    if can_stay:
+                        switch_count -= 1
+                    if can_stay and random.random() < 2 / (4 * switch_count + 2):
+                        chosen_exam = last_exam_id
+                    else:
+                        chosen_exam = random.choice(available_exams)
+                        while chosen_exam == last_exam_id:
+                            chosen_exam = random.choice(available_exams)
                 else:
                     chosen_exam = random.choice(available_exams)
 
-                chosen = exam_map[chosen_exam].pop(0)
+                bucket = drawn.get((number, chosen_exam))
+                if bucket is None:
+                    bucket = list(by_number_exam[number][chosen_exam])
+                    random.shuffle(bucket)
+                    drawn[(number, chosen_exam)] = bucket
+                chosen = bucket.pop()
+                if not bucket:
+                    available_exams.remove(chosen_exam)
                 selected.append(chosen)
                 last_exam_id = chosen_exam
                 progressed = True
@@ -89,17 +122,9 @@ class RandomExamService:
 
         return selected[:count]
 
-    @staticmethod
-    def _exam_matches_level(exam: Optional[Exam], jlpt_level: str) -> bool:
-        if exam is None:
-            return False
-        haystack = f"{exam.title or ''} {exam.description or ''}"
-        # Match tokens like: [N2], N2, (N2)
-        return re.search(rf"(?<![A-Z0-9])\[?{re.escape(jlpt_level)}\]?(?![A-Z0-9])", haystack, re.IGNORECASE) is not None
-
     @staticmethod
     def validate_mondai_pool(
-        available: Dict[str, List[Question]],
+        available_counts: Dict[str, int],
         mondai_config: List[Dict[str, int]],
         jlpt_level: str,
     ) -> None:
@@ -111,7 +136,7 @@ class RandomExamService:
             if requested <= 0:
                 continue
             mondai_key = f"Mondai {mondai_id}"
-            available_count = len(available.get(mondai_key, []))
+            available_count = available_counts.get(mondai_key, 0)
 
             # Mondai 5 for N1/N2 still uses ALL questions, but minimum requested count must exist.
             if available_count < requested:
@@ -122,39 +147,46 @@ class RandomExamService:
                 f"Không đủ câu hỏi đúng trình độ {jlpt_level} để tạo đề: " + "; ".join(issues)
             )
 
+    async def count_available_questions(
+        self,
+        db: AsyncSession,
+        jlpt_level: str,
+    ) -> Dict[str, int]:
+        """Question counts per mondai for a JLPT level, e.g. {"Mondai 1": 12, ...}."""
+        level_index = await self.question_bank.level(db, jlpt_level)
+        return dict(level_index.counts)
+
     async def get_available_questions(
         self,
         db: AsyncSession,
         jlpt_level: str,
-    ) -> Dict[str, List[Question]]:
+    ) -> Dict[str, List[QuestionRef]]:
         """
         Get all available questions grouped by mondai for a specific JLPT level.
 
-        Returns dict like {"Mondai 1": [questions], "Mondai 2": [questions], ...}
+        Entries are compact ``QuestionRef`` records from the question-bank
+        index; use ``load_questions`` for full rows.
+
+        Returns dict like {"Mondai 1": [refs], "Mondai 2": [refs], ...}
         """
-        # Query questions with source exam loaded, then strictly filter by selected JLPT level.
+        level_index = await self.question_bank.level(db, jlpt_level)
+        return {mondai: list(level_index.refs(mondai)) for mondai in level_index.groups}
+
+    async def load_questions(
+        self,
+        db: AsyncSession,
+        question_ids: Sequence[UUID],
+    ) -> List[Question]:
+        """Load full questions with answers, in the order of ``question_ids``."""
+        if not question_ids:
+            return []
         stmt = (
             select(Question)
-            .join(Question.exam)
-            .options(selectinload(Question.answers), selectinload(Question.exam))
-            .where(Question.exam_id.isnot(None), Exam.is_published == True)
+            .options(selectinload(Question.answers))
+            .where(Question.question_id.in_(list(question_ids)))
         )
-
-        result = await db.execute(stmt)
-        all_questions = result.scalars().all()
-
-        # Keep only questions whose source exam metadata matches selected JLPT level.
-        level_questions = [q for q in all_questions if self._exam_matches_level(q.exam, jlpt_level)]
-
-        # Group by mondai
-        grouped: Dict[str, List[Question]] = {}
-        for q in level_questions:
-            mondai = q.mondai_group or "Unknown"
-            if mondai not in grouped:
-                grouped[mondai] = []
-            grouped[mondai].append(q)
-
-        return grouped
+        by_id = {q.question_id: q for q in (await db.execute(stmt)).scalars().all()}
+        return [by_id[qid] for qid in question_ids if qid in by_id]
 
     async def generate_random_exam(
         self,
@@ -174,13 +206,12 @@ class RandomExamService:
         - For other levels, randomly select from available Mondai 5 questions
         """
         try:
-            # Get available questions grouped by mondai
-            available = await self.get_available_questions(db, jlpt_level)
+            level_index = await self.question_bank.level(db, jlpt_level)
 
             # Enforce strict pool validation: if any requested mondai is insufficient, stop.
-            self.validate_mondai_pool(available, mondai_config, jlpt_level)
+            self.validate_mondai_pool(level_index.counts, mondai_config, jlpt_level)
 
-            selected_questions: List[Question] = []
+            selected_refs: List[QuestionRef] = []
             mondai_summary: Dict[str, int] = {}
 
             for config in mondai_config:
@@ -191,19 +222,22 @@ class RandomExamService:
                     continue
 
                 mondai_key = f"Mondai {mondai_id}"
-                pool = available.get(mondai_key, [])
+                buckets = level_index.groups.get(mondai_key)
 
-                if not pool:
+                if not buckets:
                     logger.warning(f"No questions available for {mondai_key}")
                     continue
 
                 # Random selection for all mondais with cross-exam diversity.
-                selected = self._select_diverse_questions(pool, count)
+                selected = self._select_from_buckets(buckets, count)
 
-                selected_questions.extend(selected)
+                selected_refs.extend(selected)
                 mondai_summary[mondai_key] = len(selected)
 
             # Keep the generated order so frontend can preserve audio-friendly sequence.
+            selected_questions = await self.load_questions(
+                db, [ref.question_id for ref in selected_refs]
+            )
 
             return {
                 "title": title,
@@ -18,7 +18,7 @@ class UserResult(Base):
     total_questions = Column(Integer, nullable=True)
     correct_answers = Column(Integer, nullable=True)
     user_answers = Column(JSONB, nullable=True)
-    completed_at = Column(DateTime, server_default=func.now())
+    completed_at = Column(DateTime, server_default=func.now(), index=True)
 
     # Relationships
     exam = relationship("Exam", back_populates="results")
@@ -0,0 +1,121 @@
+"""Pre-serialized ``TestExamDetailResponse`` payloads for test-taking endpoints.
+
+Opening an exam used to reload the exam, question and answer graph and run
+the Pydantic serialization for every learner. Arena contests hit this
+hardest, because hundreds of users open one exam at start time.
+
+Entries hold ready-to-send JSON bytes keyed by exam ID, or by
+``(exam ID, time limit)`` for the copies contests serve with their own
+limit. Each entry is stamped with the exam's ``updated_at``, which moves on every exam edit. The
+session hook in ``app.modules.questions.models`` also moves it on question
+or answer edits. A reader looks up the current stamp with one narrow query,
+which it needs for the access check anyway. A mismatched stamp is treated
+as a miss, so edits made by any process are seen on the next read and
+nothing has to be invalidated explicitly.
+
+Misses are single-flight per process. The first request for a cold
+(exam, stamp) rebuilds it, and concurrent requests await that result
+instead of loading the graph themselves. The cache is a per-process LRU
+bounded by payload bytes.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+Stamp = Optional[datetime]
+_Key = Tuple[Hashable, Stamp]
+
+
+class ExamPayloadCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Tuple[Stamp, bytes]] = OrderedDict()
+        self._size = 0
+        self._building: Dict[_Key, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+
+    def get(self, key: Hashable, stamp: Stamp) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, stamp: Stamp, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (stamp, payload)
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    async def get_or_build(
+        self, key: Hashable, stamp: Stamp, build: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Cached payload for ``(key, stamp)``; at most one ``build`` runs per pair at a time."""
+        payload = self.get(key, stamp)
+        if payload is not None:
+            self.hits += 1
+            return payload
+        self.misses += 1
+
+        building_key = (key, stamp)
+        pending = self._building.get(building_key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The builder's request was cancelled; take over the rebuild.
+                return await self.get_or_build(key, stamp, build)
+
+        pending = asyncio.get_running_loop().create_future()
+        self._building[building_key] = pending
+        try:
+            self.builds += 1
+            payload = await build()
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as exc:
+            pending.set_exception(exc)
+            # Waiters get the exception; don't warn when nobody was waiting.
+            pending.exception()
+            raise
+        else:
+            self.put(key, stamp, payload)
+            pending.set_result(payload)
+            return payload
+        finally:
+            self._building.pop(building_key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "builds": self.builds,
+            }
+
+
+@lru_cache
+def get_exam_payload_cache() -> ExamPayloadCache:
+    from app.core.config import get_settings
+
+    return ExamPayloadCache(max_bytes=get_settings().EXAM_PAYLOAD_CACHE_MAX_MB * 1024 * 1024)
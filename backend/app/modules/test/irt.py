@@ -0,0 +1,162 @@
+"""Vectorized 2PL IRT scoring.
+
+Item parameters depend only on difficulty (1-5), so a response pattern is
+fully described by ten counts: correct and incorrect answers per difficulty.
+``IRTScorer`` scores those signatures in NumPy and memoizes them. Many
+submissions (e.g. a contest rescore) are scored in one vectorized pass over
+their distinct signatures.
+
+The model is unchanged: 2PL likelihood, N(0, 2^2) prior, MAP theta on
+[-4, 4], and a range-scaled expected score mapped to [0, 60] with power 1.2.
+Within those bounds a·|theta - b| stays below 12.3, so the old
+p ∈ [1e-6, 1 - 1e-6] clamp never applies and the negative log posterior is
+smooth and strictly convex. Projected Newton therefore reaches the same MAP
+estimate as the bounded Brent search it replaces, to a tighter tolerance.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+DIFFICULTY_LEVELS = 5
+# Calibrated widening: Original was [-1.5, 1.5]
+ITEM_B = np.array([-2.8, -1.4, 0.0, 1.4, 2.8])
+# Calibrated discrimination: Original was [0.8, 1.35]
+ITEM_A = np.array([1.0, 1.2, 1.4, 1.6, 1.8])
+PRIOR_SIGMA = 2.0
+THETA_MIN, THETA_MAX = -4.0, 4.0
+MAX_SCORE = 60.0
+SCORE_POWER = 1.2
+
+# (correct per difficulty 1-5, incorrect per difficulty 1-5)
+Signature = Tuple[int, ...]
+
+
+def bound_difficulty(difficulty: int) -> int:
+    return max(1, min(5, int(difficulty)))
+
+
+def response_signature(responses: Iterable[Tuple[int, int]]) -> Signature:
+    """Collapse ``(difficulty, correct)`` pairs into per-difficulty correct/incorrect counts."""
+    counts = [0] * (2 * DIFFICULTY_LEVELS)
+    for difficulty, correct in responses:
+        level = bound_difficulty(difficulty) - 1
+        counts[level if correct else DIFFICULTY_LEVELS + level] += 1
+    return tuple(counts)
+
+
+def _expected_correct(theta: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    p = 1.0 / (1.0 + np.exp(-ITEM_A * (theta[:, None] - ITEM_B)))
+    return (totals * p).sum(axis=1)
+
+
+def map_theta(correct: np.ndarray, incorrect: np.ndarray, max_iterations: int = 50) -> np.ndarray:
+    """MAP ability on [THETA_MIN, THETA_MAX] for rows of per-difficulty counts."""
+    totals = correct + incorrect
+    theta = np.zeros(len(correct))
+    prior_precision = 1.0 / PRIOR_SIGMA**2
+    for _ in range(max_iterations):
+        p = 1.0 / (1.0 + np.exp(-ITEM_A * (theta[:, None] - ITEM_B)))
+        gradient = -(ITEM_A * (correct - totals * p)).sum(axis=1) + theta * prior_precision
+        hessian = (ITEM_A**2 * totals * p * (1.0 - p)).sum(axis=1) + prior_precision
+        updated = np.clip(theta - gradient / hessian, THETA_MIN, THETA_MAX)
+        converged = np.max(np.abs(updated - theta)) < 1e-10
+        theta = updated
+        if converged:
+            break
+    return theta
+
+
+def score_signatures(signatures: Sequence[Signature]) -> np.ndarray:
+    """Scores in [0, 60] (rounded to 2 decimals) for a batch of signatures."""
+    counts = np.asarray(signatures, dtype=float).reshape(len(signatures), 2 * DIFFICULTY_LEVELS)
+    correct, incorrect = counts[:, :DIFFICULTY_LEVELS], counts[:, DIFFICULTY_LEVELS:]
+    totals = correct + incorrect
+    answered, right, wrong = totals.sum(axis=1), correct.sum(axis=1), incorrect.sum(axis=1)
+
+    theta = map_theta(correct, incorrect)
+    current = _expected_correct(theta, totals)
+    low = _expected_correct(np.full(len(theta), THETA_MIN), totals)
+    high = _expected_correct(np.full(len(theta), THETA_MAX), totals)
+    spread = np.where(high > low, high - low, 1.0)
+    normalized = np.clip((current - low) / spread, 0.0, 1.0)
+    scores = np.clip(normalized**SCORE_POWER * MAX_SCORE, 0.0, MAX_SCORE)
+
+    # Hard-coded absolute extremes for consistency
+    scores = np.where(wrong == 0, MAX_SCORE, scores)
+    scores = np.where((right == 0) | (answered == 0), 0.0, scores)
+    return np.round(scores, 2)
+
+
+class IRTScorer:
+    """Memoizing scorer keyed by response signature (least recently used entries evicted)."""
+
+    def __init__(self, max_entries: int = 65536):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[Signature, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(
+        self, signatures: Iterable[Signature]
+    ) -> Tuple[Dict[Signature, float], List[Signature]]:
+        found: Dict[Signature, float] = {}
+        missing: List[Signature] = []
+        with self._lock:
+            for signature in signatures:
+                score = self._cache.get(signature)
+                if score is None:
+                    self.misses += 1
+                    missing.append(signature)
+                else:
+                    self.hits += 1
+                    self._cache.move_to_end(signature)
+                    found[signature] = score
+        return found, missing
+
+    def _store(self, scores: Dict[Signature, float]) -> None:
+        with self._lock:
+            self._cache.update(scores)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def score_signatures(self, signatures: Sequence[Signature]) -> List[float]:
+        found, missing = self._lookup(set(signatures))  # each distinct signature once
+        if missing:
+            computed = dict(zip(missing, (float(score) for score in score_signatures(missing))))
+            self._store(computed)
+            found.update(computed)
+        return [found[signature] for signature in signatures]
+
+    def score(self, responses: Iterable[Tuple[int, int]]) -> float:
+        return self.score_signatures([response_signature(responses)])[0]
+
+    def score_many(self, submissions: Iterable[Iterable[Tuple[int, int]]]) -> List[float]:
+        return self.score_signatures([response_signature(responses) for responses in submissions])
+
+    def cache_info(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+
+@lru_cache
+def get_irt_scorer() -> IRTScorer:
+    return IRTScorer()
+
+
+def calculate_irt_score(responses: List[Tuple[int, int]]) -> float:
+    """
+    Estimate ability using a 2PL Bayesian IRT model (MAP) and map to [0, 60].
+    Uses Range-Scaled Expected Score with a power 1.2 transformation
+    to ensure reasonable score progression at the extremes.
+    """
+    return get_irt_scorer().score(responses)
+
+
+def calculate_irt_scores(submissions: Iterable[List[Tuple[int, int]]]) -> List[float]:
+    """``calculate_irt_score`` for many submissions in one vectorized pass."""
+    return get_irt_scorer().score_many(submissions)
@@ -0,0 +1,201 @@
+"""Recompute ``UserResult.score`` for stored submissions with the current IRT model.
+
+Use this after the difficulty calibration in ``app.modules.test.irt`` changes.
+
+Results are streamed from a server-side cursor in partitions of
+``batch_size``. Each partition is rebuilt into response signatures from
+``user_answers`` and scored in one vectorized call. Changed scores are written
+back with a single bulk UPDATE through a second session, which commits per
+partition. The same transaction updates the leaderboard copy of any contest
+scores. Memory stays bounded by the partition size and a small LRU of
+per-exam answer keys.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.modules.arena.models import ContestParticipant
+from app.modules.questions.models import Question
+from app.modules.result.models import UserResult
+from app.modules.test.irt import DIFFICULTY_LEVELS, Signature, get_irt_scorer
+from app.modules.test.service import _estimate_question_difficulty, _is_scored_question
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RescoreStats:
+    scanned: int = 0
+    rescored: int = 0
+    changed: int = 0
+    skipped: int = 0
+
+    def as_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def _answer_pairs(user_answers: Any) -> Iterable[Tuple[str, str]]:
+    # Stored as {"question_id": "answer_id"}; older rows may hold a list of pairs.
+    if isinstance(user_answers, list):
+        return [
+            (str(item.get("question_id")), str(item.get("answer_id")))
+            for item in user_answers
+            if isinstance(item, dict) and item.get("question_id")
+        ]
+    return (user_answers or {}).items()
+
+
+class ExamAnswerKey:
+    """Scoring key of one exam: the all-wrong signature plus the level of every correct answer."""
+
+    __slots__ = ("base", "correct_levels")
+
+    def __init__(self, questions: Iterable[Question] = ()):
+        counts = [0] * (2 * DIFFICULTY_LEVELS)
+        self.correct_levels: Dict[Tuple[str, str], int] = {}
+        for question in questions:
+            if not _is_scored_question(question):
+                continue
+            level = _estimate_question_difficulty(question) - 1
+            counts[DIFFICULTY_LEVELS + level] += 1
+            for answer in question.answers:
+                if answer.is_correct:
+                    self.correct_levels[(str(question.question_id), str(answer.answer_id))] = level
+        self.base: Signature = tuple(counts)
+
+    def __bool__(self) -> bool:
+        return any(self.base)
+
+    def signature(self, user_answers: Any) -> Signature:
+        """Response signature of one submission against this key."""
+        counts = list(self.base)
+        for pair in _answer_pairs(user_answers):
+            level = self.correct_levels.get(pair)
+            if level is not None:
+                counts[level] += 1
+                counts[DIFFICULTY_LEVELS + level] -= 1
+        return tuple(counts)
+
+
+class ExamKeyCache:
+    """Answer keys for recently seen exams, loaded in one query per batch of misses."""
+
+    def __init__(self, max_exams: int = 256):
+        self.max_exams = max_exams
+        self._keys: OrderedDict[UUID, ExamAnswerKey] = OrderedDict()
+
+    async def get_many(self, db: AsyncSession, exam_ids: set[UUID]) -> Dict[UUID, ExamAnswerKey]:
+        missing = [exam_id for exam_id in exam_ids if exam_id not in self._keys]
+        if missing:
+            questions = (
+                (
+                    await db.execute(
+                        select(Question)
+                        .where(Question.exam_id.in_(missing))
+                        .options(selectinload(Question.answers))
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            by_exam: Dict[UUID, List[Question]] = {exam_id: [] for exam_id in missing}
+            for question in questions:
+                by_exam[question.exam_id].append(question)
+            self._keys.update((exam_id, ExamAnswerKey(items)) for exam_id, items in by_exam.items())
+            db.expunge_all()
+        found = {}
+        for exam_id in exam_ids:
+            self._keys.move_to_end(exam_id)
+            found[exam_id] = self._keys[exam_id]
+        while len(self._keys) > self.max_exams:
+            self._keys.popitem(last=False)
+        return found
+
+
+async def _sync_contest_scores(db: AsyncSession, result_ids: List[UUID]) -> None:
+    # Keep the leaderboard copy on ContestParticipant in step with the new scores.
+    await db.execute(
+        update(ContestParticipant)
+        .where(
+            ContestParticipant.contest_id == UserResult.contest_id,
+            ContestParticipant.result_id == UserResult.result_id,
+            UserResult.result_id.in_(result_ids),
+        )
+        .values(score=UserResult.score)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def rescore_results(
+    session_factory: async_sessionmaker,
+    *,
+    batch_size: int = 1000,
+    exam_id: Optional[UUID] = None,
+    contest_id: Optional[UUID] = None,
+    dry_run: bool = False,
+) -> RescoreStats:
+    """Rescore stored results, optionally for one exam or contest; count what changed."""
+    stats = RescoreStats()
+    scorer = get_irt_scorer()
+    exam_keys = ExamKeyCache()
+
+    stmt = (
+        select(
+            UserResult.result_id,
+            UserResult.exam_id,
+            UserResult.contest_id,
+            UserResult.score,
+            UserResult.user_answers,
+        )
+        .where(UserResult.exam_id.isnot(None))
+        .order_by(UserResult.exam_id, UserResult.result_id)
+        .execution_options(yield_per=batch_size)
+    )
+    if exam_id is not None:
+        stmt = stmt.where(UserResult.exam_id == exam_id)
+    if contest_id is not None:
+        stmt = stmt.where(UserResult.contest_id == contest_id)
+
+    async with session_factory() as reader, session_factory() as writer:
+        stream = await reader.stream(stmt)
+        async for rows in stream.partitions():
+            stats.scanned += len(rows)
+            keys = await exam_keys.get_many(writer, {row.exam_id for row in rows})
+
+            scorable = [row for row in rows if keys[row.exam_id]]
+            stats.skipped += len(rows) - len(scorable)
+            scores = scorer.score_signatures(
+                [keys[row.exam_id].signature(row.user_answers) for row in scorable]
+            )
+            stats.rescored += len(scorable)
+
+            changed_rows = [
+                (row, score)
+                for row, score in zip(scorable, scores)
+                if row.score is None or abs(row.score - score) >= 0.005
+            ]
+            stats.changed += len(changed_rows)
+            if changed_rows and not dry_run:
+                await writer.execute(
+                    update(UserResult),
+                    [{"result_id": row.result_id, "score": score} for row, score in changed_rows],
+                )
+                contest_results = [
+                    row.result_id for row, _ in changed_rows if row.contest_id is not None
+                ]
+                if contest_results:
+                    await _sync_contest_scores(writer, contest_results)
+                await writer.commit()
+            else:
+                await writer.rollback()
+
+            logger.info("Rescored %s results (%s changed) so far", stats.rescored, stats.changed)
+
+    return stats
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
@@ -28,7 +28,8 @@ async def get_exam_detail_for_test(
     current_user: User = Depends(get_current_user),
 ):
     """Return a candidate-facing exam payload without exposing correct answers."""
-    return await service.get_exam_detail(exam_id, current_user)
+    payload = await service.get_exam_detail_json(exam_id, current_user)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post("/exams/{exam_id}/submit", response_model=TestSubmitResponse, status_code=201)
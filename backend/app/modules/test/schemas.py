@@ -4,6 +4,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.shared.clip_store import AudioClipUrl
+
 
 class TestAnswerOptionResponse(BaseModel):
     answer_id: UUID
@@ -18,7 +20,7 @@ class TestQuestionResponse(BaseModel):
     question_id: UUID
     mondai_group: Optional[str] = None
     question_number: Optional[int] = None
-    audio_clip_url: Optional[str] = None
+    audio_clip_url: AudioClipUrl = None
     question_text: Optional[str] = None
     hide_question_text: bool = False
     image_url: Optional[str] = None
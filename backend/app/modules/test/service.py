@@ -1,12 +1,10 @@
-import math
 import re
 from collections import defaultdict
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
-from scipy.optimize import minimize_scalar
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -15,6 +13,8 @@ from app.modules.audio.models import Audio
 from app.modules.exam.models import Exam
 from app.modules.questions.models import Question
 from app.modules.result.models import UserResult
+from app.modules.test.exam_cache import get_exam_payload_cache
+from app.modules.test.irt import calculate_irt_score
 from app.modules.test.schemas import (
     TestAnswerOptionResponse,
     TestExamDetailResponse,
@@ -51,18 +51,6 @@ def _is_scored_question(question: Question) -> bool:
     return (question.question_number or 0) > 0
 
 
-def _difficulty_to_b(difficulty: int) -> float:
-    bounded = max(1, min(5, int(difficulty)))
-    # Calibrated widening: Original was [-1.5, 1.5]
-    return {1: -2.8, 2: -1.4, 3: 0.0, 4: 1.4, 5: 2.8}[bounded]
-
-
-def _difficulty_to_a(difficulty: int) -> float:
-    bounded = max(1, min(5, int(difficulty)))
-    # Calibrated discrimination: Original was [0.8, 1.35]
-    return {1: 1.0, 2: 1.2, 3: 1.4, 4: 1.6, 5: 1.8}[bounded]
-
-
 def _estimate_question_difficulty(question: Question) -> int:
     if question.difficulty is not None:
         return max(1, min(5, int(question.difficulty)))
@@ -85,74 +73,20 @@ def _estimate_question_difficulty(question: Question) -> int:
     return 3
 
 
-def calculate_irt_score(responses: List[Tuple[int, int]]) -> float:
-    """
-    Estimate ability using a 2PL Bayesian IRT model (MAP) and map to [0, 60].
-    Uses Range-Scaled Expected Score with a Quadratic (Power 2.0) transformation
-    to ensure reasonable score progression at the extremes.
-    """
-    if not responses:
-        return 0.0
-
-    # Hard-coded absolute extremes for consistency
-    if all(x == 1 for _, x in responses):
-        return 60.0
-    if all(x == 0 for _, x in responses):
-        return 0.0
-
-    def neg_log_posterior(theta: float) -> float:
-        # 1. Log-Likelihood (2PL)
-        nll = 0.0
-        for difficulty, correct in responses:
-            a = _difficulty_to_a(difficulty)
-            b = _difficulty_to_b(difficulty)
-            p = 1.0 / (1.0 + math.exp(-a * (theta - b)))
-            p = max(min(p, 0.999999), 0.000001)
-            if correct:
-                nll -= math.log(p)
-            else:
-                nll -= math.log(1.0 - p)
-        
-        # 2. Bayesian Prior (theta ~ N(0, 2.0))
-        # Stabilizes estimation for low question counts
-        prior_sigma = 2.0
-        nll += (theta ** 2) / (2 * (prior_sigma ** 2))
-        return nll
-
-    # Estimate theta using Bayesian MAP
-    res = minimize_scalar(neg_log_posterior, bounds=(-4.0, 4.0), method="bounded")
-    theta = float(getattr(res, "x", 0.0))
-
-    def get_expected_correct(t: float) -> float:
-        total = 0.0
-        for difficulty, _ in responses:
-            a = _difficulty_to_a(difficulty)
-            b = _difficulty_to_b(difficulty)
-            p = 1.0 / (1.0 + math.exp(-a * (t - b)))
-            total += p
-        return total
-
-    # 3. Range-Scaled Expected Score Mapping
-    current_exp = get_expected_correct(theta)
-    min_exp = get_expected_correct(-4.0)
-    max_exp = get_expected_correct(4.0)
-    
-    # Normalized expected score [0, 1]
-    norm_exp = (current_exp - min_exp) / (max_exp - min_exp)
-    norm_exp = max(0.0, min(1.0, norm_exp))
-
-    # 4. Balanced Power Transformation (1.2)
-    # Compresses scores at the low end but provides more reasonable
-    # resolution for mid-range performance compared to quadratic (2.0).
-    score = (norm_exp ** 1.2) * 60.0
-    
-    return round(float(max(0.0, min(60.0, score))), 2)
-
-
 class TestService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    def _ensure_exam_access(self, exam, current_user: User) -> None:
+        can_access = (
+            exam.is_published or current_user.role == "admin" or exam.creator_id == current_user.id
+        )
+        if not can_access:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not allowed to access this exam",
+            )
+
     async def _get_exam_entity(self, exam_id: UUID, current_user: User) -> Exam:
         result = await self.db.execute(
             select(Exam)
@@ -165,17 +99,7 @@ class TestService:
         exam = result.scalar_one_or_none()
         if not exam:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exam not found")
-
-        can_access = (
-            exam.is_published
-            or current_user.role == "admin"
-            or exam.creator_id == current_user.id
-        )
-        if not can_access:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not allowed to access this exam",
-            )
+        self._ensure_exam_access(exam, current_user)
         return exam
 
     def _build_exam_detail_response(self, exam: Exam) -> TestExamDetailResponse:
@@ -245,9 +169,47 @@ class TestService:
             questions=serialized_questions,
         )
 
-    async def get_exam_detail(self, exam_id: UUID, current_user: User) -> TestExamDetailResponse:
-        exam = await self._get_exam_entity(exam_id, current_user)
-        return self._build_exam_detail_response(exam)
+    async def _render_exam_detail(self, exam_id: UUID, time_limit: Optional[int] = None) -> bytes:
+        result = await self.db.execute(
+            select(Exam)
+            .options(
+                selectinload(Exam.audio),
+                selectinload(Exam.questions).selectinload(Question.answers),
+            )
+            .where(Exam.exam_id == exam_id)
+            .execution_options(populate_existing=True)
+        )
+        exam = result.scalar_one_or_none()
+        if not exam:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exam not found")
+        detail = self._build_exam_detail_response(exam)
+        if time_limit is not None:
+            detail.time_limit = time_limit
+        return detail.model_dump_json().encode()
+
+    async def get_exam_detail_payload(
+        self, exam_id: UUID, stamp: Optional[datetime], time_limit: Optional[int] = None
+    ) -> bytes:
+        """Serialized ``TestExamDetailResponse`` for exam revision ``stamp`` (its ``updated_at``).
+
+        ``time_limit`` replaces the exam's own, as contests do; each one is cached separately.
+        """
+        key = exam_id if time_limit is None else (exam_id, time_limit)
+        return await get_exam_payload_cache().get_or_build(
+            key, stamp, lambda: self._render_exam_detail(exam_id, time_limit)
+        )
+
+    async def get_exam_detail_json(self, exam_id: UUID, current_user: User) -> bytes:
+        result = await self.db.execute(
+            select(Exam.exam_id, Exam.updated_at, Exam.is_published, Exam.creator_id).where(
+                Exam.exam_id == exam_id
+            )
+        )
+        exam = result.one_or_none()
+        if not exam:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exam not found")
+        self._ensure_exam_access(exam, current_user)
+        return await self.get_exam_detail_payload(exam.exam_id, exam.updated_at)
 
     async def get_result_review(self, result_id: UUID, current_user: User) -> TestResultReviewResponse:
         # Get result
@@ -0,0 +1,39 @@
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+
+from app.core.celery_app import celery_app
+from app.db.session import AsyncSessionLocal
+from app.modules.ai_feedback.models import AIFeedback  # noqa: F401
+from app.modules.arena.models import Contest, ContestParticipant  # noqa: F401
+from app.modules.audio.models import Audio  # noqa: F401
+from app.modules.exam.models import Exam  # noqa: F401
+from app.modules.questions.models import Question, Answer  # noqa: F401
+from app.modules.result.models import UserResult  # noqa: F401
+from app.modules.test.rescoring import rescore_results
+from app.modules.users.models import User  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.modules.test.rescore_results")
+def rescore_results_task(
+    *,
+    exam_id: Optional[str] = None,
+    contest_id: Optional[str] = None,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+) -> dict:
+    """Recompute stored result scores in a Celery worker; returns the rescoring counts."""
+    stats = asyncio.run(
+        rescore_results(
+            AsyncSessionLocal,
+            batch_size=batch_size,
+            exam_id=UUID(exam_id) if exam_id else None,
+            contest_id=UUID(contest_id) if contest_id else None,
+            dry_run=dry_run,
+        )
+    )
+    logger.info("Rescoring finished: %s", stats.as_dict())
+    return stats.as_dict()
@@ -1,17 +1,198 @@
 """Audio utilities for merging and processing audio files"""
 
+import asyncio
 import logging
-import subprocess
+import os
 import tempfile
-from typing import List
-from urllib.request import urlopen
+from typing import List, Optional
+
+import httpx
+
+from app.shared.clip_cache import PcmClipCache
+from app.shared.clip_store import get_clip_store, local_clip_key, public_clip_url
 
 logger = logging.getLogger(__name__)
 
+MERGE_SAMPLE_RATE = 44100
+MERGE_CHANNELS = 1
+MERGE_SAMPLE_WIDTH = 2  # pcm_s16le
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = 8
+
+# ffmpeg encoder arguments per output container.
+OUTPUT_CODECS = {
+    "m4a": ["-c:a", "aac", "-b:a", "128k", "-movflags", "+faststart"],
+    "mp3": ["-c:a", "libmp3lame", "-b:a", "128k"],
+}
+
+
+async def _run_ffmpeg(args: List[str], input_bytes: bytes, timeout: float = 120) -> bytes:
+    """Run ffmpeg with ``input_bytes`` on stdin and return stdout."""
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(input_bytes), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise RuntimeError(f"ffmpeg timed out after {timeout}s")
+    if process.returncode != 0:
+        raise RuntimeError(
+            stderr.decode("utf-8", errors="replace").strip()
+            or f"ffmpeg exited with {process.returncode}"
+        )
+    return stdout
+
+
+async def decode_to_pcm(audio_data: bytes) -> bytes:
+    """Decode any ffmpeg-readable clip to the merge format (44.1 kHz mono pcm_s16le)."""
+    return await _run_ffmpeg(
+        [
+            "-i",
+            "pipe:0",
+            "-f",
+            "s16le",
+            "-ar",
+            str(MERGE_SAMPLE_RATE),
+            "-ac",
+            str(MERGE_CHANNELS),
+            "pipe:1",
+        ],
+        audio_data,
+    )
+
+
+def silence_pcm(seconds: float) -> bytes:
+    return b"\x00" * (int(seconds * MERGE_SAMPLE_RATE) * MERGE_CHANNELS * MERGE_SAMPLE_WIDTH)
+
+
+async def _download(client: httpx.AsyncClient, url: str, slots: asyncio.Semaphore) -> bytes:
+    key = local_clip_key(url)
+    if key is not None and get_clip_store().exists(key):
+        # Clips cut by this API are read from disk rather than fetched from ourselves.
+        return await asyncio.to_thread(get_clip_store().path(key).read_bytes)
+    async with slots:
+        response = await client.get(public_clip_url(url))
+        response.raise_for_status()
+        return response.content
+
+
+async def _fetch_and_decode(
+    client: httpx.AsyncClient,
+    url: str,
+    download_slots: asyncio.Semaphore,
+    decode_slots: asyncio.Semaphore,
+    clip_cache: Optional[PcmClipCache] = None,
+    skip_failed: bool = False,
+) -> bytes:
+    """Merge-format PCM for ``url``; ``b""`` for a failed clip when ``skip_failed``."""
+    if clip_cache is not None:
+        cached = await asyncio.to_thread(clip_cache.get, url)
+        if cached is not None:
+            return cached
+    try:
+        audio_data = await _download(client, url, download_slots)
+    except Exception as e:
+        logger.error(f"Error downloading audio from {url}: {str(e)}")
+        if skip_failed:
+            return b""
+        raise
+    async with decode_slots:
+        try:
+            pcm = await decode_to_pcm(audio_data)
+        except RuntimeError as e:
+            logger.error(f"FFmpeg normalize error for {url}: {str(e)}")
+            if skip_failed:
+                return b""
+            raise RuntimeError(f"Failed to normalize input audio: {str(e)}") from e
+    if clip_cache is not None:
+        await asyncio.to_thread(clip_cache.put, url, pcm)
+    return pcm
+
+
+async def encode_pcm_stream(
+    clips: List["asyncio.Future[bytes]"],
+    silence_duration: float,
+    output_format: str = "m4a",
+) -> bytes:
+    """Feed clips, in order and as each becomes ready, into one encoder; return the encoded bytes.
+
+    The encoder reads raw PCM from stdin, so there are no intermediate WAV
+    files and encoding overlaps with the remaining downloads. Empty clips are
+    left out together with their gap.
+    """
+    gap = silence_pcm(silence_duration)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, f"merged.{output_format}")
+        encoder = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-f",
+            "s16le",
+            "-ar",
+            str(MERGE_SAMPLE_RATE),
+            "-ac",
+            str(MERGE_CHANNELS),
+            "-i",
+            "pipe:0",
+            *OUTPUT_CODECS[output_format],
+            output_path,
+            stdin=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stderr_task = asyncio.create_task(encoder.stderr.read())
+        try:
+            written = 0
+            for clip in clips:
+                pcm = await clip
+                if not pcm:
+                    continue
+                if written:
+                    encoder.stdin.write(gap)
+                encoder.stdin.write(pcm)
+                await encoder.stdin.drain()
+                written += 1
+            if not written:
+                raise RuntimeError("None of the audio clips could be downloaded and decoded")
+            encoder.stdin.close()
+            returncode = await asyncio.wait_for(encoder.wait(), timeout=600)
+        except BaseException:
+            if encoder.returncode is None:
+                encoder.kill()
+                await encoder.wait()
+            raise
+        finally:
+            stderr = await stderr_task
+
+        if returncode != 0:
+            message = stderr.decode("utf-8", errors="replace")
+            logger.error(f"FFmpeg merge error: {message}")
+            raise RuntimeError(f"Failed to merge audio files: {message}")
+
+        with open(output_path, "rb") as f:
+            return f.read()
+
 
 async def merge_audio_files(
     audio_urls: List[str],
     silence_duration: int = 3,
+    *,
+    client: Optional[httpx.AsyncClient] = None,
+    max_concurrent_downloads: int = DEFAULT_MAX_CONCURRENT_DOWNLOADS,
+    max_decode_workers: Optional[int] = None,
+    clip_cache: Optional[PcmClipCache] = None,
+    output_format: str = "m4a",
+    skip_failed: bool = False,
 ) -> bytes:
     """
     Merge multiple audio files with silence gaps between them.
@@ -19,165 +200,62 @@ async def merge_audio_files(
     Args:
         audio_urls: List of audio file URLs to merge
         silence_duration: Duration of silence gap in seconds (default: 3)
+        client: Optional shared HTTP client (a pooled one is created otherwise)
+        max_concurrent_downloads: Bound on in-flight downloads
+        max_decode_workers: Bound on concurrent ffmpeg decoders (default: CPU count)
+        clip_cache: Decoded-clip cache; cached clips are neither downloaded nor decoded
+        output_format: "m4a" (AAC) or "mp3"
+        skip_failed: Leave out clips that fail to download or decode instead of failing
 
     Returns:
         Merged audio file as bytes
 
-    Uses ffmpeg to:
-    1. Download each audio file
-    2. Normalize all files to a common WAV format
-    3. Generate silence segments in the same format
-    4. Concatenate and encode output with built-in AAC encoder
-    5. Return merged audio
+    Pipeline:
+    1. Download clips concurrently over one connection pool
+    2. Decode each clip to 44.1 kHz mono PCM in a bounded pool of ffmpeg processes
+    3. Stream the PCM, with silence gaps, in order into a single ffmpeg encoder
     """
+    if not audio_urls:
+        raise ValueError("No audio URLs provided")
+    if output_format not in OUTPUT_CODECS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    download_slots = asyncio.Semaphore(max(1, max_concurrent_downloads))
+    decode_slots = asyncio.Semaphore(max(1, max_decode_workers or os.cpu_count() or 1))
+    owns_client = client is None
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=30,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max(1, max_concurrent_downloads)),
+        )
+
+    clips: List[asyncio.Task] = []
     try:
-        if not audio_urls:
-            raise ValueError("No audio URLs provided")
-
-        # Create temporary directory for processing
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Step 1: Download all audio files
-            downloaded_files = []
-
-            for idx, url in enumerate(audio_urls):
-                logger.info(f"Downloading audio {idx + 1}/{len(audio_urls)}: {url}")
-
-                try:
-                    # Download audio file
-                    response = urlopen(url, timeout=30)
-                    audio_data = response.read()
-                    audio_path = f"{tmpdir}/audio_{idx}.m4a"
-
-                    with open(audio_path, "wb") as f:
-                        f.write(audio_data)
-
-                    downloaded_files.append(audio_path)
-
-                except Exception as e:
-                    logger.error(f"Error downloading audio from {url}: {str(e)}")
-                    raise
-
-            # Step 2: Normalize each downloaded file to consistent WAV format
-            normalized_files = []
-            for idx, src_path in enumerate(downloaded_files):
-                normalized_path = f"{tmpdir}/normalized_{idx}.wav"
-                normalize_cmd = [
-                    "ffmpeg",
-                    "-y",
-                    "-i",
-                    src_path,
-                    "-ar",
-                    "44100",
-                    "-ac",
-                    "1",
-                    "-c:a",
-                    "pcm_s16le",
-                    normalized_path,
-                ]
-
-                result = subprocess.run(
-                    normalize_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=120,
+        logger.info(f"Merging {len(audio_urls)} audio files with {silence_duration}s gaps")
+        clips = [
+            asyncio.create_task(
+                _fetch_and_decode(
+                    client, url, download_slots, decode_slots, clip_cache, skip_failed
                 )
-
-                if result.returncode != 0:
-                    logger.error(f"FFmpeg normalize error for {src_path}: {result.stderr}")
-                    raise RuntimeError(f"Failed to normalize input audio: {result.stderr}")
-
-                normalized_files.append(normalized_path)
-
-            # Step 3: Generate silence file in same WAV format
-            silence_path = f"{tmpdir}/silence.wav"
-            logger.info(f"Generating {silence_duration}s silence gap...")
-
-            silence_cmd = [
-                "ffmpeg",
-                "-y",
-                "-f",
-                "lavfi",
-                "-i",
-                "anullsrc=r=44100:cl=mono",
-                "-t",
-                str(silence_duration),
-                "-ar",
-                "44100",
-                "-ac",
-                "1",
-                "-c:a",
-                "pcm_s16le",
-                silence_path,
-            ]
-
-            result = subprocess.run(
-                silence_cmd,
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-
-            if result.returncode != 0:
-                logger.error(f"FFmpeg silence generation error: {result.stderr}")
-                raise RuntimeError(f"Failed to generate silence: {result.stderr}")
-
-            # Step 4: Build concatenation list with silence between files
-            final_concat_list = []
-            for idx, audio_file in enumerate(normalized_files):
-                final_concat_list.append(f"file '{audio_file}'")
-                # Add silence after each file except the last one
-                if idx < len(normalized_files) - 1:
-                    final_concat_list.append(f"file '{silence_path}'")
-
-            concat_file = f"{tmpdir}/concat.txt"
-            with open(concat_file, "w") as f:
-                f.write("\n".join(final_concat_list))
-
-            logger.info(f"Concatenation list created with {len(normalized_files)} audio files")
-
-            # Step 5: Merge all files and encode using built-in AAC encoder
-            output_path = f"{tmpdir}/merged.m4a"
-            logger.info("Starting audio merge with ffmpeg...")
-
-            merge_cmd = [
-                "ffmpeg",
-                "-y",
-                "-f",
-                "concat",
-                "-safe",
-                "0",
-                "-i",
-                concat_file,
-                "-c:a",
-                "aac",
-                "-b:a",
-                "128k",
-                output_path,
-            ]
-
-            result = subprocess.run(
-                merge_cmd,
-                capture_output=True,
-                text=True,
-                timeout=600,
-            )
-
-            if result.returncode != 0:
-                logger.error(f"FFmpeg merge error: {result.stderr}")
-                raise RuntimeError(f"Failed to merge audio files: {result.stderr}")
-
-            # Step 6: Read merged audio
-            with open(output_path, "rb") as f:
-                merged_audio = f.read()
-
-            logger.info(
-                f"Audio merge completed successfully. "
-                f"Merged {len(audio_urls)} files with {silence_duration}s gaps. "
-                f"Output size: {len(merged_audio)} bytes"
             )
+            for url in audio_urls
+        ]
+        merged_audio = await encode_pcm_stream(clips, silence_duration, output_format)
 
-            return merged_audio
+        logger.info(
+            f"Audio merge completed successfully. "
+            f"Merged {len(audio_urls)} files with {silence_duration}s gaps. "
+            f"Output size: {len(merged_audio)} bytes"
+        )
+        return merged_audio
 
     except Exception as e:
         logger.error(f"Error merging audio files: {str(e)}")
         raise
+    finally:
+        for clip in clips:
+            clip.cancel()
+        await asyncio.gather(*clips, return_exceptions=True)
+        if owns_client:
+            await client.aclose()
@@ -0,0 +1,68 @@
+"""Content-addressed local blob store for handing large uploads to workers.
+
+Blobs are written once under their sha256 key and are read back by path or
+memory map. A key may carry a ``-<suffix>`` (e.g. a job ID) so one job can
+delete its copy without touching another job's copy of the same content.
+Only the key crosses the Celery broker. The API and the workers
+must therefore share the directory: a common volume, or the same host.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}(-[0-9A-Za-z_-]{1,64})?$")
+
+
+class LocalBlobStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        if not _KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid blob key: {key!r}")
+        return self.root / key[:2] / key
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).is_file()
+
+    def put(self, data: bytes, key: Optional[str] = None) -> str:
+        """Store ``data`` under ``key``, its sha256 by default; existing blobs are kept as is."""
+        key = key or hashlib.sha256(data).hexdigest()
+        target = self.path(key)
+        if target.is_file():
+            return key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{key}.")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return key
+
+    @contextmanager
+    def open_mmap(self, key: str) -> Iterator[mmap.mmap]:
+        """Read-only memory map of a blob; it supports ``read``/``seek`` like a file."""
+        with open(self.path(key), "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+
+@lru_cache
+def get_blob_store() -> LocalBlobStore:
+    from app.core.config import BACKEND_DIR, get_settings
+
+    root = Path(get_settings().BLOB_STORE_DIR)
+    return LocalBlobStore(root if root.is_absolute() else BACKEND_DIR / root)
@@ -0,0 +1,116 @@
+"""On-disk cache of decoded audio clips for merges.
+
+Question clips are immutable Cloudinary URLs, and ``start_offset``/``end_offset``
+transformation URLs are immutable too. Each decoded merge-format PCM clip is
+stored under ``sha256(url)``. Re-merging an exam after a small edit then only
+downloads and decodes the clips that changed. Once the total size exceeds
+``max_bytes``, the least recently used clips are deleted.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from app.shared.blob_store import LocalBlobStore
+
+logger = logging.getLogger(__name__)
+
+
+def clip_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class PcmClipCache:
+    def __init__(self, root: Path, max_bytes: int = 1024 * 1024 * 1024):
+        self.store = LocalBlobStore(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        if not self.store.root.is_dir():
+            return
+        entries = []
+        for path in self.store.root.glob("??/*"):
+            if path.name.startswith("."):
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.name, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def get(self, url: str) -> Optional[bytes]:
+        key = clip_key(url)
+        try:
+            data = self.store.path(key).read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._sizes.pop(key, None)
+                self.misses += 1
+            return None
+        os.utime(self.store.path(key))
+        with self._lock:
+            self._sizes[key] = len(data)
+            self._sizes.move_to_end(key)
+            self.hits += 1
+        return data
+
+    def put(self, url: str, pcm: bytes) -> None:
+        key = clip_key(url)
+        self.store.put(pcm, key=key)
+        with self._lock:
+            self._sizes[key] = len(pcm)
+            self._sizes.move_to_end(key)
+            evicted = []
+            total = sum(self._sizes.values())
+            while total > self.max_bytes and len(self._sizes) > 1:
+                old_key, old_size = self._sizes.popitem(last=False)
+                evicted.append(old_key)
+                total -= old_size
+        for old_key in evicted:
+            self.store.delete(old_key)
+        if evicted:
+            logger.info("Evicted %s clip(s) from %s.", len(evicted), self.store.root)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._sizes),
+                "size_bytes": sum(self._sizes.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+
+_clip_cache: Optional[PcmClipCache] = None
+
+
+def get_clip_cache() -> Optional[PcmClipCache]:
+    """Process-wide cache built from settings; ``None`` when disabled."""
+    global _clip_cache
+    if _clip_cache is None:
+        from app.core.config import BACKEND_DIR, get_settings
+
+        settings = get_settings()
+        if not settings.AUDIO_CLIP_CACHE_DIR or settings.AUDIO_CLIP_CACHE_MAX_MB <= 0:
+            return None
+        root = Path(settings.AUDIO_CLIP_CACHE_DIR)
+        if not root.is_absolute():
+            root = BACKEND_DIR / root
+        _clip_cache = PcmClipCache(root, max_bytes=settings.AUDIO_CLIP_CACHE_MAX_MB * 1024 * 1024)
+    return _clip_cache
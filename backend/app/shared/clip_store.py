@@ -0,0 +1,96 @@
+"""Pre-cut question clips served by the API.
+
+Clips are stored in a ``LocalBlobStore`` under a content hash and served
+from ``{API_PREFIX}/ai/clips/{key}.mp3``. Questions store that path, not an
+absolute URL, so stored clips survive a change of host. ``AudioClipUrl``
+fields turn it into ``{PUBLIC_API_URL}{path}`` in JSON responses and strip
+that prefix again from URLs sent back by clients.
+
+A clip cut from an uploaded recording carries the Cloudinary offset URL it
+replaces as ``?source=``, which the exam editor's trimmer starts from. The
+merge service recognises clip URLs and reads the bytes from disk instead of
+over HTTP.
+
+The store is permanent, not a cache: questions keep pointing at their clips.
+With several API hosts or workers, ``AUDIO_CLIP_STORE_DIR`` must be shared.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Annotated, Optional
+from urllib.parse import quote, urlsplit
+
+from pydantic import AfterValidator, PlainSerializer
+
+from app.shared.blob_store import LocalBlobStore
+
+CLIP_ROUTE = "/ai/clips"  # served by app.modules.ai_exam.router.get_question_clip
+CLIP_EXTENSION = ".mp3"
+_CLIP_NAME = re.compile(r"^([0-9a-f]{64})\.mp3$")
+
+
+@lru_cache
+def get_clip_store() -> LocalBlobStore:
+    from app.core.config import BACKEND_DIR, get_settings
+
+    root = Path(get_settings().AUDIO_CLIP_STORE_DIR)
+    return LocalBlobStore(root if root.is_absolute() else BACKEND_DIR / root)
+
+
+def _clip_path_prefix() -> str:
+    from app.core.config import get_settings
+
+    return f"{get_settings().API_PREFIX}{CLIP_ROUTE}/"
+
+
+def _public_base() -> Optional[str]:
+    from app.core.config import get_settings
+
+    base = get_settings().PUBLIC_API_URL
+    return base.rstrip("/") if base else None
+
+
+def clip_url(key: str, source: Optional[str] = None) -> str:
+    """Host-relative path of a stored clip, optionally remembering its ``source`` URL."""
+    path = f"{_clip_path_prefix()}{key}{CLIP_EXTENSION}"
+    return f"{path}?source={quote(source, safe='')}" if source else path
+
+
+def parse_clip_name(name: str) -> Optional[str]:
+    """Blob key from a ``{key}.mp3`` file name, or ``None`` if it is not one."""
+    match = _CLIP_NAME.match(name)
+    return match.group(1) if match else None
+
+
+def stored_clip_url(url: Optional[str]) -> Optional[str]:
+    """``url`` with this API's public base removed when it points at a clip."""
+    base = _public_base()
+    if url and base and url.startswith(f"{base}{_clip_path_prefix()}"):
+        return url[len(base) :]
+    return url
+
+
+def public_clip_url(url: Optional[str]) -> Optional[str]:
+    """Absolute URL for a stored clip path; other URLs are returned unchanged."""
+    base = _public_base()
+    if url and base and url.startswith(_clip_path_prefix()):
+        return f"{base}{url}"
+    return url
+
+
+def local_clip_key(url: str) -> Optional[str]:
+    """Blob key when ``url`` points at this API's clip route, stored or public."""
+    url = stored_clip_url(url)
+    prefix = _clip_path_prefix()
+    if not url.startswith(prefix):
+        return None
+    return parse_clip_name(urlsplit(url).path[len(prefix) :])
+
+
+# Question fields holding clip URLs: stored host-relative, served absolute.
+AudioClipUrl = Annotated[
+    Optional[str],
+    AfterValidator(stored_clip_url),
+    PlainSerializer(public_clip_url, when_used="json-unless-none"),
+]
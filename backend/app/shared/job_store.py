@@ -0,0 +1,204 @@
+"""Shared registry for background-job status.
+
+Routers keep job status in a ``JobRegistry`` instead of a module-level dict.
+Entries expire after a TTL, and the in-process backend is also bounded by
+entry count (LRU). Every backend stores the job model as JSON, so they all
+behave the same. Callers must ``put`` a job again after changing it.
+
+Backends (``JOB_STORE_BACKEND``):
+
+- ``memory``: per-process LRU. Use it for a single API worker.
+- ``redis``: shared through ``REDIS_URL``, with expiry handled by Redis.
+- ``postgres``: the ``background_jobs`` table. Expired rows are ignored on
+  read and purged periodically on write.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Generic, Optional, Protocol, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Column, DateTime, String, Text, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.base import Base
+
+JobT = TypeVar("JobT", bound=BaseModel)
+
+
+class BackgroundJob(Base):
+    __tablename__ = "background_jobs"
+
+    job_key = Column(String(128), primary_key=True)
+    payload = Column(Text, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class JobBackend(Protocol):
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, payload: str, ttl_seconds: int) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class MemoryJobBackend:
+    """Per-process store bounded by ``max_entries`` (least recently used first) and TTL."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    async def set(self, key: str, payload: str, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisJobBackend:
+    def __init__(self, url: str, prefix: str = "jobs:state"):
+        import redis.asyncio as aioredis
+
+        self.prefix = prefix
+        self._client = aioredis.Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[str]:
+        payload = await self._client.get(f"{self.prefix}:{key}")
+        return payload.decode("utf-8") if payload is not None else None
+
+    async def set(self, key: str, payload: str, ttl_seconds: int) -> None:
+        await self._client.set(f"{self.prefix}:{key}", payload, ex=ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(f"{self.prefix}:{key}")
+
+
+class PostgresJobBackend:
+    def __init__(self, purge_every: int = 100):
+        self.purge_every = purge_every
+        self._writes = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        from app.db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            return (
+                await db.execute(
+                    select(BackgroundJob.payload).where(
+                        BackgroundJob.job_key == key,
+                        BackgroundJob.expires_at > func.now(),
+                    )
+                )
+            ).scalar_one_or_none()
+
+    async def set(self, key: str, payload: str, ttl_seconds: int) -> None:
+        from datetime import timedelta
+
+        from app.db.session import AsyncSessionLocal
+
+        expires_at = func.now() + timedelta(seconds=ttl_seconds)
+        statement = insert(BackgroundJob).values(
+            job_key=key, payload=payload, expires_at=expires_at
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[BackgroundJob.job_key],
+            set_={"payload": payload, "expires_at": expires_at, "updated_at": func.now()},
+        )
+        self._writes += 1
+        async with AsyncSessionLocal() as db:
+            await db.execute(statement)
+            if self._writes % self.purge_every == 0:
+                await db.execute(
+                    delete(BackgroundJob).where(BackgroundJob.expires_at <= func.now())
+                )
+            await db.commit()
+
+    async def delete(self, key: str) -> None:
+        from app.db.session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(BackgroundJob).where(BackgroundJob.job_key == key))
+            await db.commit()
+
+
+@lru_cache
+def get_job_backend() -> JobBackend:
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    if settings.JOB_STORE_BACKEND == "redis":
+        return RedisJobBackend(settings.REDIS_URL)
+    if settings.JOB_STORE_BACKEND == "postgres":
+        return PostgresJobBackend()
+    return MemoryJobBackend(max_entries=settings.JOB_STORE_MAX_ENTRIES)
+
+
+class JobRegistry(Generic[JobT]):
+    """Typed view over a backend for one module's job model.
+
+    For example ``JobRegistry("ai_photos", AIPhotoJobStatusResponse)``.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        model: type[JobT],
+        backend: Optional[JobBackend] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        self.namespace = namespace
+        self.model = model
+        self._backend = backend
+        self._ttl_seconds = ttl_seconds
+
+    @property
+    def backend(self) -> JobBackend:
+        if self._backend is None:
+            self._backend = get_job_backend()
+        return self._backend
+
+    @property
+    def ttl_seconds(self) -> int:
+        if self._ttl_seconds is None:
+            from app.core.config import get_settings
+
+            self._ttl_seconds = get_settings().JOB_STORE_TTL_SECONDS
+        return self._ttl_seconds
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.namespace}:{job_id}"
+
+    async def get(self, job_id: str) -> Optional[JobT]:
+        payload = await self.backend.get(self._key(job_id))
+        return self.model.model_validate_json(payload) if payload is not None else None
+
+    async def put(self, job_id: str, job: JobT) -> None:
+        await self.backend.set(self._key(job_id), job.model_dump_json(), self.ttl_seconds)
+
+    async def delete(self, job_id: str) -> None:
+        await self.backend.delete(self._key(job_id))
@@ -0,0 +1,237 @@
+"""Push-based progress events for background jobs.
+
+Pipelines publish a small event dict on every step. API endpoints stream those
+events to clients over SSE/WebSocket, so progress updates never touch the
+database. Each channel also keeps the latest event per job, which lets
+subscribers and pollers start from the current state.
+
+``InProcessProgressChannel`` serves pipelines that run inside the API process:
+FastAPI background tasks, or Celery with ``task_always_eager``.
+``RedisProgressChannel`` is for Celery workers in separate processes. Publishers
+and the API must then point at the same Redis.
+
+``publish``/``latest`` are for threads and Celery tasks. Code running on the
+API event loop uses ``publish_async``/``latest_async``, which never block it.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"done", "completed", "failed"})
+
+
+def is_terminal(event: dict) -> bool:
+    return event.get("status") in TERMINAL_STATUSES
+
+
+class InProcessProgressChannel:
+    """Thread-safe broadcaster; ``publish`` may be called from worker threads."""
+
+    def __init__(self, max_jobs: int = 1024):
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._latest: OrderedDict[str, dict] = OrderedDict()
+        self._subscribers: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def publish(self, job_id: str, event: dict) -> None:
+        with self._lock:
+            self._latest[job_id] = event
+            self._latest.move_to_end(job_id)
+            while len(self._latest) > self.max_jobs:
+                self._latest.popitem(last=False)
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down; it unsubscribes itself on exit.
+                pass
+
+    def latest(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._latest.get(job_id)
+
+    async def publish_async(self, job_id: str, event: dict) -> None:
+        self.publish(job_id, event)
+
+    async def latest_async(self, job_id: str) -> Optional[dict]:
+        return self.latest(job_id)
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[AsyncIterator[dict]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(entry)
+
+        async def events() -> AsyncIterator[dict]:
+            while True:
+                yield await queue.get()
+
+        try:
+            yield events()
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(job_id, [])
+                if entry in subscribers:
+                    subscribers.remove(entry)
+                if not subscribers:
+                    self._subscribers.pop(job_id, None)
+
+
+class RedisProgressChannel:
+    """Redis pub/sub channel; the latest event is also stored with a TTL."""
+
+    def __init__(self, url: str, prefix: str = "jobs:progress", latest_ttl_seconds: int = 3600):
+        import redis
+
+        self.url = url
+        self.prefix = prefix
+        self.latest_ttl_seconds = latest_ttl_seconds
+        self._client = redis.Redis.from_url(url)
+        # redis.asyncio connections belong to the loop that opened them.
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _async_client(self):
+        import redis.asyncio as aioredis
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = aioredis.Redis.from_url(self.url)
+        return client
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    def _latest_key(self, job_id: str) -> str:
+        return f"{self.prefix}:latest:{job_id}"
+
+    def publish(self, job_id: str, event: dict) -> None:
+        payload = json.dumps(event, ensure_ascii=False)
+        try:
+            pipe = self._client.pipeline()
+            pipe.set(self._latest_key(job_id), payload, ex=self.latest_ttl_seconds)
+            pipe.publish(self._channel(job_id), payload)
+            pipe.execute()
+        except Exception as exc:
+            # Progress is best effort; the pipeline must not fail because Redis blinked.
+            logger.warning("Failed to publish progress for job %s: %s", job_id, exc)
+
+    def latest(self, job_id: str) -> Optional[dict]:
+        try:
+            payload = self._client.get(self._latest_key(job_id))
+        except Exception as exc:
+            logger.warning("Failed to read progress for job %s: %s", job_id, exc)
+            return None
+        return json.loads(payload) if payload else None
+
+    async def publish_async(self, job_id: str, event: dict) -> None:
+        payload = json.dumps(event, ensure_ascii=False)
+        try:
+            async with self._async_client().pipeline() as pipe:
+                pipe.set(self._latest_key(job_id), payload, ex=self.latest_ttl_seconds)
+                pipe.publish(self._channel(job_id), payload)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Failed to publish progress for job %s: %s", job_id, exc)
+
+    async def latest_async(self, job_id: str) -> Optional[dict]:
+        try:
+            payload = await self._async_client().get(self._latest_key(job_id))
+        except Exception as exc:
+            logger.warning("Failed to read progress for job %s: %s", job_id, exc)
+            return None
+        return json.loads(payload) if payload else None
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[AsyncIterator[dict]]:
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self._channel(job_id))
+
+        async def events() -> AsyncIterator[dict]:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    yield json.loads(message["data"])
+
+        try:
+            yield events()
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.aclose()
+            await client.aclose()
+
+
+ProgressChannel = InProcessProgressChannel | RedisProgressChannel
+
+
+@lru_cache
+def get_progress_channel() -> ProgressChannel:
+    """Process-wide channel selected by ``PROGRESS_CHANNEL_BACKEND`` (``memory`` or ``redis``)."""
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    if settings.PROGRESS_CHANNEL_BACKEND == "redis":
+        return RedisProgressChannel(settings.REDIS_URL)
+    return InProcessProgressChannel()
+
+
+async def stream_job_events(
+    channel: ProgressChannel,
+    job_id: str,
+    load_snapshot: Optional[Callable[[], Awaitable[Optional[dict]]]] = None,
+    heartbeat_seconds: float = 15.0,
+) -> AsyncIterator[Optional[dict]]:
+    """Yield the current state, then every published event until a terminal one.
+
+    ``load_snapshot`` supplies the current state when the channel has none,
+    for example from the database. ``None`` is yielded after
+    ``heartbeat_seconds`` without events, so transports can keep idle
+    connections alive.
+    """
+    async with channel.subscribe(job_id) as events:
+        # Subscribe before reading the snapshot so no event falls in between.
+        current = await channel.latest_async(job_id)
+        if current is None and load_snapshot is not None:
+            current = await load_snapshot()
+        if current is not None:
+            yield current
+            if is_terminal(current):
+                return
+
+        iterator = events.__aiter__()
+        # The pending read survives heartbeats; cancelling it would close the generator.
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                done, _ = await asyncio.wait({pending}, timeout=heartbeat_seconds)
+                if not done:
+                    yield None
+                    continue
+                try:
+                    event = pending.result()
+                except StopAsyncIteration:
+                    return
+                pending = None
+                yield event
+                if is_terminal(event):
+                    return
+        finally:
+            if pending is not None:
+                pending.cancel()
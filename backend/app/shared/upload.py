@@ -60,12 +60,15 @@ async def upload_audio(file: UploadFile, folder: str = "question-audio") -> dict
 
 
 async def upload_audio_bytes(
-    audio_bytes: bytes,
+    audio_bytes: bytes | str,
     filename: str,
     folder: str = "question-audio",
     public_id: str | None = None,
 ) -> dict:
-    """Upload raw audio bytes to Cloudinary and return metadata."""
+    """Upload raw audio bytes, or a local file path streamed from disk, to Cloudinary.
+
+    Returns the upload metadata.
+    """
     try:
         result = cloudinary.uploader.upload(
             audio_bytes,
@@ -0,0 +1,134 @@
+"""Compare row-loading, live SQL and rolled-up analytics overviews.
+
+Runs against whatever is already in the database (e.g. the stored results
+seeded for the rescoring benchmark) over the last ``--days`` days. The
+row-loading variant reproduces the work the original overview did: it
+fetched every exam, result (with its exam), feedback and completed AI cache
+row in range and tallied them in Python. The live SQL variant runs the
+grouped queries over the whole range. The rollups variant rebuilds the
+daily rollups once (committed), then times ``AnalyticsService.get_overview``.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.analytics_overview --days 365 --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+
+import app.main  # noqa: F401  (registers every ORM model)
+from app.db.session import AsyncSessionLocal, engine
+from app.modules.ai_exam.models import AIExamCache
+from app.modules.ai_feedback.models import AIFeedback
+from app.modules.analytics.rollup import collect_facts, refresh_daily_rollups
+from app.modules.analytics.service import AnalyticsService
+from app.modules.exam.models import Exam
+from app.modules.result.models import UserResult
+from app.modules.system_feedback.models import SystemFeedback
+
+
+async def _load_rows(db, start: datetime, end: datetime) -> int:
+    exams = (
+        (await db.execute(select(Exam).where(Exam.created_at.between(start, end)))).scalars().all()
+    )
+    _ = sum(1 for exam in exams if exam.is_published)
+    results = (
+        (
+            await db.execute(
+                select(UserResult)
+                .where(UserResult.completed_at.between(start, end))
+                .options(selectinload(UserResult.exam))
+            )
+        )
+        .scalars()
+        .all()
+    )
+    days = {}
+    for result in results:
+        day = result.completed_at.strftime("%Y-%m-%d")
+        days[day] = days.get(day, 0) + 1
+    for model in (AIFeedback, SystemFeedback):
+        _ = (
+            (await db.execute(select(model).where(model.created_at.between(start, end))))
+            .scalars()
+            .all()
+        )
+    caches = (
+        (
+            await db.execute(
+                select(AIExamCache).where(
+                    AIExamCache.created_at.between(start, end), AIExamCache.status == "completed"
+                )
+            )
+        )
+        .scalars()
+        .all()
+    )
+    _ = [json.loads(cache.result_json) for cache in caches if cache.result_json]
+    db.expunge_all()
+    return len(results)
+
+
+async def _live_sql(db, start: datetime, end: datetime) -> int:
+    facts = await collect_facts(db, [(start, end + timedelta(microseconds=1))])
+    return AnalyticsService._build_overview(facts, start, end).interaction_stats.total_takes
+
+
+async def _rollups(db, start: datetime, end: datetime) -> int:
+    return (await AnalyticsService().get_overview(db, start, end)).interaction_stats.total_takes
+
+
+async def _run(args: argparse.Namespace) -> None:
+    end = datetime.utcnow()
+    start = end - timedelta(days=args.days)
+    try:
+        refreshed = time.perf_counter()
+        stats = await refresh_daily_rollups(AsyncSessionLocal, rebuild=True)
+        refreshed = time.perf_counter() - refreshed
+        async with AsyncSessionLocal() as db:
+            rows = (
+                await db.execute(
+                    select(func.count())
+                    .select_from(UserResult)
+                    .where(UserResult.completed_at.between(start, end))
+                )
+            ).scalar_one()
+            timings = {}
+            takes = {}
+            for name, variant in (
+                ("load rows", _load_rows),
+                ("live SQL", _live_sql),
+                ("rollups", _rollups),
+            ):
+                takes[name] = await variant(db, start, end)  # warm-up
+                started = time.perf_counter()
+                for _ in range(args.repeat):
+                    await variant(db, start, end)
+                timings[name] = (time.perf_counter() - started) / args.repeat
+    finally:
+        await engine.dispose()
+
+    assert takes["load rows"] == takes["live SQL"] == takes["rollups"] == rows
+    print(f"results in range: {rows} over {args.days} days")
+    print(
+        f"refresh:          {refreshed * 1000:.1f} ms ({stats.days} days, rebuilt: {stats.rebuilt})"
+    )
+    for name in timings:
+        print(f"{name + ':':<17} {timings[name] * 1000:.1f} ms per overview")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compare the legacy per-chunk ReazonSpeech loop with batched decoding on a real exam file.
+
+The legacy baseline reproduces the ``ReazonTranscriber.transcribe`` loop this
+module replaced: pydub silence splitting, one temporary WAV per chunk and one
+``reazonspeech.k2.asr.transcribe`` call per chunk. The new path is timed with
+``batch_size=1`` and with ``--batch-size`` so the gain from batching alone is
+visible separately from the rest of the rewrite.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.asr_batching path/to/jlpt_listening.mp3 --batch-size 16
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from app.modules.ai_exam.service import BellAudioSplitter, ReazonTranscriber
+
+
+def legacy_transcribe(transcriber: ReazonTranscriber, wav_bytes: bytes) -> str:
+    """Raw text of one segment via the pre-batching per-chunk loop, without gender tagging."""
+    from pydub import AudioSegment
+    from pydub.silence import split_on_silence
+    from reazonspeech.k2.asr import audio_from_path, transcribe
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        tmp.write(wav_bytes)
+        tmp_path = tmp.name
+    chunk_dir = tempfile.mkdtemp(prefix="reazon_chunks_")
+    try:
+        audio = AudioSegment.from_file(tmp_path)
+        silence_thresh = audio.dBFS - 14 if audio.dBFS != float("-inf") else -50
+        chunks = split_on_silence(
+            audio, min_silence_len=400, silence_thresh=silence_thresh, keep_silence=150
+        ) or [audio]
+        parts: list[str] = []
+        for index, chunk in enumerate(chunks):
+            if len(chunk) < 300:
+                continue
+            chunk_path = os.path.join(chunk_dir, f"chunk_{index}.wav")
+            chunk.export(chunk_path, format="wav")
+            result = transcribe(transcriber._model, audio_from_path(chunk_path))
+            text = transcriber._clean_text(result.text if result else "")
+            if text:
+                parts.append(text)
+        return "".join(parts)
+    finally:
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+        os.unlink(tmp_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio_path", type=Path)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument(
+        "--limit", type=int, default=0, help="Only use the first N bell segments (0 = all)."
+    )
+    args = parser.parse_args()
+
+    segments = BellAudioSplitter().split_audio(
+        args.audio_path.read_bytes(), suffix=args.audio_path.suffix
+    )
+    if args.limit:
+        segments = segments[: args.limit]
+    inputs = [(*segment.pcm(), segment.start_ms) for segment in segments]
+
+    transcriber = ReazonTranscriber(batch_size=args.batch_size)
+    transcriber._load_model()
+    transcriber._gender_classifier_attempted = True  # time ASR only
+
+    started = time.perf_counter()
+    legacy = [legacy_transcribe(transcriber, segment.wav_bytes()) for segment in segments]
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    unbatched = [transcriber.transcribe_batch([segment], batch_size=1)[0] for segment in inputs]
+    unbatched_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batched = transcriber.transcribe_batch(inputs)
+    batched_seconds = time.perf_counter() - started
+
+    # The legacy loop splits on silence differently, so its text is compared for
+    # information only; batching must not change the new path's output at all.
+    legacy_differences = sum(1 for left, right in zip(legacy, batched) if left != right["raw_text"])
+    batching_mismatches = sum(
+        1 for left, right in zip(unbatched, batched) if left["raw_text"] != right["raw_text"]
+    )
+    print(f"segments:                     {len(inputs)}")
+    print(f"legacy per-chunk loop:        {legacy_seconds:.2f}s")
+    print(f"new path, batch_size=1:       {unbatched_seconds:.2f}s")
+    print(f"new path, batch_size={args.batch_size:<8} {batched_seconds:.2f}s")
+    print(f"speedup vs legacy:            {legacy_seconds / max(batched_seconds, 1e-9):.2f}x")
+    print(f"speedup from batching alone:  {unbatched_seconds / max(batched_seconds, 1e-9):.2f}x")
+    print(f"segments differing from legacy: {legacy_differences}")
+    print(f"batching mismatches:          {batching_mismatches}")
+
+
+if __name__ == "__main__":
+    main()
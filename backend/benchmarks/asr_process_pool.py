@@ -0,0 +1,70 @@
+"""Compare in-process and process-pool ReazonSpeech transcription as segment count grows.
+
+Neither side uses the segment transcript cache, so both decode every segment.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.asr_process_pool path/to/jlpt_listening.mp3 --workers 8 --threads 2
+"""
+
+import argparse
+import itertools
+import time
+from pathlib import Path
+
+from app.modules.ai_exam.service import BellAudioSplitter, ReazonTranscriber
+from app.modules.ai_exam.transcription_pool import ReazonProcessPool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio_path", type=Path)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=1, help="Threads per worker process.")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--segment-counts", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    segments = BellAudioSplitter().split_audio(
+        args.audio_path.read_bytes(), suffix=args.audio_path.suffix
+    )
+    inputs = [(*segment.pcm(), segment.start_ms) for segment in segments]
+
+    transcriber = ReazonTranscriber(batch_size=args.batch_size)
+    transcriber._load_model()
+    pool = ReazonProcessPool(
+        args.workers, args.threads, batch_size=args.batch_size, segment_cache=False
+    )
+    started = time.perf_counter()
+    pool.warm_up()
+    startup_seconds = time.perf_counter() - started
+    pool_shape = f"{args.workers} workers x {args.threads} threads"
+    print(f"pool start-up ({pool_shape}): {startup_seconds:.2f}s")
+
+    print(f"{'segments':>8} {'in-process':>11} {'pool':>8} {'speedup':>8} {'mismatches':>10}")
+    try:
+        for count in args.segment_counts:
+            # Repeat the exam's segments when asking for more than it has.
+            batch = list(itertools.islice(itertools.cycle(inputs), count))
+
+            started = time.perf_counter()
+            local = transcriber.transcribe_batch(batch)
+            local_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            pooled = pool.transcribe_batch(batch)
+            pool_seconds = time.perf_counter() - started
+
+            mismatches = sum(
+                1 for left, right in zip(local, pooled) if left["raw_text"] != right["raw_text"]
+            )
+            print(
+                f"{count:>8} {local_seconds:>10.2f}s {pool_seconds:>7.2f}s "
+                f"{local_seconds / max(pool_seconds, 1e-9):>7.2f}x {mismatches:>10}"
+            )
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
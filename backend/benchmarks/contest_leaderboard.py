@@ -0,0 +1,157 @@
+"""Compare load-and-sort leaderboards with the indexed ContestLeaderboard reads.
+
+Seeds one contest with ``--participants`` submitted participants inside a
+transaction that is rolled back, then times both ways of answering a
+contest poll: the top-N preview plus the caller's own rank.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.contest_leaderboard --participants 5000 --top 50 --repeat 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+import app.main  # noqa: F401  (registers every ORM model)
+from app.db.session import AsyncSessionLocal, engine
+from app.modules.arena.leaderboard import ContestLeaderboard
+from app.modules.arena.models import Contest, ContestParticipant
+from app.modules.exam.models import Exam
+from app.modules.result.models import UserResult
+from app.modules.users.models import User
+
+
+async def _seed(db, participants: int) -> tuple[uuid.UUID, int]:
+    now = datetime.utcnow()
+    rng = random.Random(0)
+    exam = Exam(title="[N3] leaderboard benchmark")
+    contest = Contest(
+        title="benchmark",
+        time_limit=30,
+        start_time=now,
+        end_time=now + timedelta(hours=1),
+        exam=exam,
+    )
+    db.add(contest)
+    await db.flush()
+
+    tag = uuid.uuid4().hex[:8]
+    user_ids = (
+        (
+            await db.execute(
+                insert(User).returning(User.id),
+                [
+                    {
+                        "email": f"lb-{tag}-{n}@example.com",
+                        "username": f"lb-{tag}-{n}",
+                        "hashed_password": "x",
+                    }
+                    for n in range(participants)
+                ],
+            )
+        )
+        .scalars()
+        .all()
+    )
+    results = [
+        {
+            "result_id": uuid.uuid4(),
+            "user_id": user_id,
+            "exam_id": exam.exam_id,
+            "contest_id": contest.contest_id,
+            "score": round(rng.uniform(0, 60), 2),
+            "completed_at": now + timedelta(seconds=rng.randint(0, 3600)),
+        }
+        for user_id in user_ids
+    ]
+    await db.execute(insert(UserResult).returning(UserResult.result_id), results)
+    await db.execute(
+        insert(ContestParticipant).returning(ContestParticipant.user_id),
+        [
+            {
+                "contest_id": contest.contest_id,
+                "user_id": row["user_id"],
+                "result_id": row["result_id"],
+                "joined_at": now,
+                "score": row["score"],
+                "completed_at": row["completed_at"],
+            }
+            for row in results
+        ],
+    )
+    return contest.contest_id, user_ids[len(user_ids) // 2]
+
+
+async def _load_and_sort(db, contest_id: uuid.UUID, user_id: int, top: int) -> int:
+    contest = (
+        await db.execute(
+            select(Contest)
+            .options(
+                selectinload(Contest.participants).selectinload(ContestParticipant.user),
+                selectinload(Contest.participants).selectinload(ContestParticipant.result),
+            )
+            .where(Contest.contest_id == contest_id)
+            .execution_options(populate_existing=True)
+        )
+    ).scalar_one()
+    ranked = sorted(
+        [participant for participant in contest.participants if participant.result is not None],
+        key=lambda participant: (
+            -(participant.result.score or 0.0),
+            participant.result.completed_at,
+            participant.joined_at,
+        ),
+    )
+    _ = ranked[:top]
+    return next(
+        index for index, participant in enumerate(ranked, start=1) if participant.user_id == user_id
+    )
+
+
+async def _indexed(db, contest_id: uuid.UUID, user_id: int, top: int) -> int:
+    board = ContestLeaderboard(db)
+    await board.page(contest_id, top)
+    return (await board.rank_of(contest_id, user_id)).rank
+
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            contest_id, user_id = await _seed(db, args.participants)
+            timings = {}
+            ranks = {}
+            for name, variant in (("load and sort", _load_and_sort), ("indexed", _indexed)):
+                ranks[name] = await variant(db, contest_id, user_id, args.top)  # warm-up
+                started = time.perf_counter()
+                for _ in range(args.repeat):
+                    await variant(db, contest_id, user_id, args.top)
+                timings[name] = (time.perf_counter() - started) / args.repeat
+                db.expunge_all()
+            await db.rollback()
+    finally:
+        await engine.dispose()
+
+    assert ranks["load and sort"] == ranks["indexed"]
+    print(f"participants:  {args.participants}, top {args.top}, rank checked: {ranks['indexed']}")
+    print(f"load and sort: {timings['load and sort'] * 1000:.1f} ms per poll")
+    print(f"indexed:       {timings['indexed'] * 1000:.1f} ms per poll")
+    print(f"speedup:       {timings['load and sort'] / max(timings['indexed'], 1e-9):.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--participants", type=int, default=5000)
+    parser.add_argument("--top", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
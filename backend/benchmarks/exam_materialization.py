@@ -0,0 +1,121 @@
+"""Compare flush-per-question and bulk INSERT materialization of one exam.
+
+Both variants write into the configured database inside a transaction that
+is rolled back. Round trips are counted as statements sent to the driver.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.exam_materialization --questions 50 --answers 4 --repeat 5
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import event
+
+import app.main  # noqa: F401  (registers every ORM model)
+from app.db.session import AsyncSessionLocal, engine
+from app.modules.exam.models import Exam
+from app.modules.questions.bulk import AnswerDraft, QuestionDraft, insert_exam_questions
+from app.modules.questions.models import Answer, Question
+
+
+def _drafts(questions: int, answers: int) -> list[QuestionDraft]:
+    return [
+        QuestionDraft(
+            mondai_group=f"Mondai {1 + number % 5}",
+            question_number=number,
+            question_text=f"Question {number}",
+            script_text="会話スクリプト" * 20,
+            explanation="解説" * 20,
+            answers=[
+                AnswerDraft(content=f"Answer {index}", is_correct=index == 0)
+                for index in range(answers)
+            ],
+        )
+        for number in range(1, questions + 1)
+    ]
+
+
+async def _flush_per_question(db, exam_id: uuid.UUID, drafts: list[QuestionDraft]) -> None:
+    for draft in drafts:
+        question = Question(
+            exam_id=exam_id,
+            mondai_group=draft.mondai_group,
+            question_number=draft.question_number,
+            question_text=draft.question_text,
+            script_text=draft.script_text,
+            explanation=draft.explanation,
+        )
+        db.add(question)
+        await db.flush()
+        for index, answer in enumerate(draft.answers):
+            db.add(
+                Answer(
+                    question_id=question.question_id,
+                    content=answer.content,
+                    is_correct=answer.is_correct,
+                    order_index=index,
+                )
+            )
+    await db.flush()
+
+
+async def _bulk(db, exam_id: uuid.UUID, drafts: list[QuestionDraft]) -> None:
+    await insert_exam_questions(db, exam_id, drafts)
+
+
+async def _measure(
+    variant, drafts: list[QuestionDraft], repeat: int, counter: list[int]
+) -> tuple[float, int]:
+    seconds = 0.0
+    statements = 0
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            exam = Exam(title="[N3] materialization benchmark", is_published=False)
+            db.add(exam)
+            await db.flush()
+            counter[0] = 0
+            started = time.perf_counter()
+            await variant(db, exam.exam_id, drafts)
+            seconds += time.perf_counter() - started
+            statements += counter[0]
+            await db.rollback()
+    return seconds / repeat, statements // repeat
+
+
+async def _run(args: argparse.Namespace) -> None:
+    drafts = _drafts(args.questions, args.answers)
+    counter = [0]
+
+    def count_statement(*_):
+        counter[0] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        legacy_seconds, legacy_statements = await _measure(
+            _flush_per_question, drafts, args.repeat, counter
+        )
+        bulk_seconds, bulk_statements = await _measure(_bulk, drafts, args.repeat, counter)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+        await engine.dispose()
+
+    print(f"questions x answers:   {args.questions} x {args.answers}")
+    print(f"flush per question:    {legacy_seconds * 1000:.1f} ms, {legacy_statements} statements")
+    print(f"bulk INSERT ... VALUES: {bulk_seconds * 1000:.1f} ms, {bulk_statements} statements")
+    print(f"speedup:               {legacy_seconds / max(bulk_seconds, 1e-9):.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--answers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compare rebuilding the test-taking exam payload with the payload cache.
+
+Seeds one published exam (deleted afterwards), then times ``--requests``
+sequential opens each way. It also fires ``--concurrent`` simultaneous opens
+at a cold entry to count rebuilds.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.exam_payload_cache --questions 50 --answers 4 \\
+        --requests 200 --concurrent 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete, update
+
+import app.main  # noqa: F401  (registers every ORM model)
+from app.db.session import AsyncSessionLocal, engine
+from app.modules.exam.models import Exam
+from app.modules.questions.bulk import AnswerDraft, QuestionDraft, insert_exam_questions
+from app.modules.test.exam_cache import get_exam_payload_cache
+from app.modules.test.service import TestService
+from app.modules.users.models import User
+
+LEARNER = User(id=0, role="user")
+
+
+async def _seed(questions: int, answers: int):
+    async with AsyncSessionLocal() as db:
+        exam = Exam(title="[N3] payload benchmark", is_published=True)
+        db.add(exam)
+        await db.flush()
+        await insert_exam_questions(
+            db,
+            exam.exam_id,
+            [
+                QuestionDraft(
+                    mondai_group=f"Mondai {1 + number % 5}",
+                    question_number=number,
+                    question_text=f"Question {number}",
+                    script_text="会話スクリプト" * 40,
+                    explanation="解説" * 40,
+                    answers=[
+                        AnswerDraft(content=f"Answer {index}", is_correct=index == 0)
+                        for index in range(answers)
+                    ],
+                )
+                for number in range(1, questions + 1)
+            ],
+        )
+        await db.commit()
+        return exam.exam_id
+
+
+async def _legacy(exam_id) -> bytes:
+    async with AsyncSessionLocal() as db:
+        service = TestService(db)
+        exam = await service._get_exam_entity(exam_id, LEARNER)
+        return service._build_exam_detail_response(exam).model_dump_json().encode()
+
+
+async def _cached(exam_id) -> bytes:
+    async with AsyncSessionLocal() as db:
+        return await TestService(db).get_exam_detail_json(exam_id, LEARNER)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    exam_id = await _seed(args.questions, args.answers)
+    cache = get_exam_payload_cache()
+    try:
+        timings = {}
+        for name, variant in (("rebuild per request", _legacy), ("payload cache", _cached)):
+            await variant(exam_id)  # warm-up (and first build)
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                payload = await variant(exam_id)
+            timings[name] = (time.perf_counter() - started) / args.requests
+        size = len(payload)
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Exam)
+                .where(Exam.exam_id == exam_id)
+                .values(title="[N3] payload benchmark v2")
+            )
+            await db.commit()
+        builds = cache.stats()["builds"]
+        started = time.perf_counter()
+        await asyncio.gather(*(_cached(exam_id) for _ in range(args.concurrent)))
+        stampede_seconds = time.perf_counter() - started
+        stampede_builds = cache.stats()["builds"] - builds
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Exam).where(Exam.exam_id == exam_id))
+            await db.commit()
+        await engine.dispose()
+
+    legacy, cached = timings["rebuild per request"], timings["payload cache"]
+    print(
+        f"exam: {args.questions} questions x {args.answers} answers, payload {size / 1024:.1f} KiB"
+    )
+    print(f"rebuild per request: {legacy * 1000:.2f} ms per open")
+    print(f"payload cache:       {cached * 1000:.2f} ms per open ({legacy / cached:.1f}x)")
+    print(
+        f"{args.concurrent} concurrent opens after an edit: "
+        f"{stampede_builds} rebuild(s), {stampede_seconds * 1000:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--answers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrent", type=int, default=50)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare the scalar SciPy IRT scorer with the vectorized, memoized one.
+
+The previous implementation, ``legacy_calculate_irt_score``, lives in
+``tests/irt_reference.py`` with the unit tests that check the new engine
+against it.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.irt_scoring --submissions 2000 --questions 30
+"""
+
+import argparse
+import time
+
+from app.modules.test.irt import IRTScorer
+from tests.irt_reference import legacy_calculate_irt_score, random_submissions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=30)
+    args = parser.parse_args()
+
+    submissions = random_submissions(args.submissions, args.questions)
+
+    started = time.perf_counter()
+    legacy = [legacy_calculate_irt_score(responses) for responses in submissions]
+    legacy_seconds = time.perf_counter() - started
+
+    cold = IRTScorer()
+    started = time.perf_counter()
+    one_by_one = [cold.score(responses) for responses in submissions]
+    single_seconds = time.perf_counter() - started
+
+    batch_scorer = IRTScorer()
+    started = time.perf_counter()
+    batched = batch_scorer.score_many(submissions)
+    batch_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch_scorer.score_many(submissions)
+    warm_seconds = time.perf_counter() - started
+
+    max_diff = max(abs(left - right) for left, right in zip(legacy, batched))
+    assert one_by_one == batched
+    print(f"submissions x questions: {args.submissions} x {args.questions}")
+    print(f"distinct signatures:     {batch_scorer.cache_info()['entries']}")
+    print(f"legacy scipy loop:       {legacy_seconds * 1000:.1f} ms")
+    for label, seconds in (
+        ("score() per submission: ", single_seconds),
+        ("score_many() cold:      ", batch_seconds),
+        ("score_many() warm cache:", warm_seconds),
+    ):
+        print(f"{label} {seconds * 1000:.1f} ms ({legacy_seconds / seconds:.1f}x)")
+    print(f"max |score difference|:  {max_diff:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -110,5 +110,53 @@ def createsuperuser(
         )
 
 
+@app.command()
+def rescore_results(
+    exam_id: str = typer.Option(None, help="Only rescore results of this exam."),
+    contest_id: str = typer.Option(None, help="Only rescore results of this contest."),
+    batch_size: int = typer.Option(1000, help="Rows fetched, scored and written per batch."),
+    dry_run: bool = typer.Option(False, help="Count changes without writing them."),
+):
+    """Recompute stored result scores with the current IRT calibration."""
+    from uuid import UUID
+
+    from app.modules.test.tasks import rescore_results as run_rescoring
+
+    stats = asyncio.run(
+        run_rescoring(
+            AsyncSessionLocal,
+            batch_size=batch_size,
+            exam_id=UUID(exam_id) if exam_id else None,
+            contest_id=UUID(contest_id) if contest_id else None,
+            dry_run=dry_run,
+        )
+    )
+    typer.secho(
+        f"Scanned {stats.scanned}, rescored {stats.rescored}, changed {stats.changed}, skipped {stats.skipped}"
+        + (" (dry run)" if dry_run else ""),
+        fg=typer.colors.GREEN,
+    )
+
+
+@app.command()
+def refresh_analytics(
+    rebuild: bool = typer.Option(False, help="Recompute every rolled-up day instead of only changed ones."),
+):
+    """Refresh the daily analytics rollups read by the admin dashboard."""
+    from app.modules.analytics.tasks import refresh_daily_rollups
+
+    stats = asyncio.run(
+        refresh_daily_rollups(
+            AsyncSessionLocal,
+            revisit_days=settings.ANALYTICS_ROLLUP_REVISIT_DAYS,
+            rebuild=rebuild,
+        )
+    )
+    typer.secho(
+        f"Rolled up {stats.days} days through {stats.rolled_through}" + (" (rebuilt)" if stats.rebuilt else ""),
+        fg=typer.colors.GREEN,
+    )
+
+
 if __name__ == "__main__":
     app()
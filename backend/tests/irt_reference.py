@@ -0,0 +1,61 @@
+"""Frozen scalar IRT scorer the vectorized engine is checked against.
+
+``legacy_calculate_irt_score`` is the SciPy implementation that
+``app.modules.test.irt`` replaced. It is kept verbatim so the unit tests and
+``benchmarks.irt_scoring`` compare against the same reference.
+"""
+
+import math
+import random
+from typing import List, Tuple
+
+from scipy.optimize import minimize_scalar
+
+_B = {1: -2.8, 2: -1.4, 3: 0.0, 4: 1.4, 5: 2.8}
+_A = {1: 1.0, 2: 1.2, 3: 1.4, 4: 1.6, 5: 1.8}
+
+
+def legacy_calculate_irt_score(responses: List[Tuple[int, int]]) -> float:
+    if not responses:
+        return 0.0
+    if all(x == 1 for _, x in responses):
+        return 60.0
+    if all(x == 0 for _, x in responses):
+        return 0.0
+
+    def neg_log_posterior(theta: float) -> float:
+        nll = 0.0
+        for difficulty, correct in responses:
+            bounded = max(1, min(5, int(difficulty)))
+            p = 1.0 / (1.0 + math.exp(-_A[bounded] * (theta - _B[bounded])))
+            p = max(min(p, 0.999999), 0.000001)
+            nll -= math.log(p) if correct else math.log(1.0 - p)
+        return nll + (theta**2) / (2 * 2.0**2)
+
+    theta = float(minimize_scalar(neg_log_posterior, bounds=(-4.0, 4.0), method="bounded").x)
+
+    def expected(t: float) -> float:
+        total = 0.0
+        for difficulty, _ in responses:
+            bounded = max(1, min(5, int(difficulty)))
+            total += 1.0 / (1.0 + math.exp(-_A[bounded] * (t - _B[bounded])))
+        return total
+
+    low, high = expected(-4.0), expected(4.0)
+    norm_exp = max(0.0, min(1.0, (expected(theta) - low) / (high - low)))
+    return round(float(max(0.0, min(60.0, (norm_exp**1.2) * 60.0))), 2)
+
+
+def random_submissions(count: int, questions: int, seed: int = 0) -> List[List[Tuple[int, int]]]:
+    rng = random.Random(seed)
+    difficulties = [rng.randint(1, 5) for _ in range(questions)]
+    submissions = []
+    for _ in range(count):
+        ability = rng.gauss(0.0, 1.5)
+        submissions.append(
+            [
+                (d, int(rng.random() < 1.0 / (1.0 + math.exp(-(ability - _B[d])))))
+                for d in difficulties
+            ]
+        )
+    return submissions
@@ -72,7 +72,10 @@ def test_bell_splitter_falls_back_to_full_audio_when_no_bell_detected():
     assert segments[0].segment_index == 1
     assert segments[0].start_ms == 0
     assert segments[0].end_ms >= 2000
-    assert segments[0].audio_bytes
+    assert segments[0].audio_bytes == b""
+    assert segments[0].sample_rate > 0
+    assert len(segments[0].samples) == segments[0].sample_rate * 2200 // 1000
+    assert segments[0].wav_bytes().startswith(b"RIFF")
 
 
 class _FakeSplitter:
@@ -177,6 +180,80 @@ def test_generate_uses_local_reazon_only_and_keeps_one_question_per_segment():
     ]
 
 
+def test_transcribers_without_batching_get_wav_for_buffer_backed_segments():
+    import numpy as np
+
+    from app.modules.ai_exam.service import decode_audio
+
+    received = []
+
+    class _SingleSegmentTranscriber:
+        def transcribe(
+            self, audio_bytes: bytes, suffix: str = ".wav", base_offset_ms: int = 0
+        ) -> dict:
+            received.append((decode_audio(audio_bytes, suffix), base_offset_ms))
+            return {
+                "raw_text": "一番",
+                "formatted_text": "一番",
+                "introduction": None,
+                "script_text": "",
+                "question_texts": [],
+                "spoken_question_number": 1,
+            }
+
+    sample_rate = 8000
+    tone = (0.3 * np.sin(np.arange(sample_rate) * 2 * np.pi * 440 / sample_rate)).astype(np.float32)
+    segments = [
+        SplitAudioChunk(
+            segment_index=index,
+            file_name=f"segment_{index:02d}.wav",
+            start_ms=start,
+            end_ms=start + 1000,
+        )
+        for index, start in ((1, 0), (2, 4000))
+    ]
+    for segment in segments:
+        segment.samples, segment.sample_rate = tone, sample_rate
+    service = AIExamService.__new__(AIExamService)
+    service._reazon = _SingleSegmentTranscriber()
+
+    service._transcribe_segments(segments)
+
+    assert [offset for _, offset in received] == [0, 4000]
+    for (samples, rate), _ in received:
+        assert rate == sample_rate
+        assert np.allclose(samples, tone, atol=1e-3)
+    assert [segment.transcript for segment in segments] == ["一番", "一番"]
+
+
+def test_rederive_rebuilds_questions_from_stored_segment_transcripts():
+    import pytest
+
+    service = AIExamService.__new__(AIExamService)
+    service._splitter = _FakeSplitter()
+    service._reazon = _FakeReazon()
+
+    stored = service.generate(audio_bytes=b"full-audio", filename="sample.mp3", jlpt_level="N2")
+    expected = service.generate(audio_bytes=b"full-audio", filename="sample.mp3", jlpt_level="N3")
+
+    service._reazon = None  # re-derivation must not touch ASR
+    rederived = service.rederive(stored, jlpt_level="N3")
+
+    assert rederived == expected
+    assert stored.split_segments[0].question_texts == ["会社での会話です。"]
+
+    legacy = stored.model_copy(
+        update={
+            "split_segments": [
+                segment.model_copy(update={"timestamped_transcript": None})
+                for segment in stored.split_segments
+            ]
+        }
+    )
+    with pytest.raises(ValueError):
+        service.rederive(legacy, jlpt_level="N3")
+
+
 def test_build_raw_transcript_falls_back_to_segment_start_timestamp():
     split_segments = [
         SplitAudioChunk(
@@ -631,3 +708,541 @@ def test_build_structured_segments_repairs_false_seven_before_new_mondai_two():
         ("Mondai 2", 1),
         ("Mondai 2", 2),
     ]
+
+
+class _FakeStreamResult:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeK2Stream:
+    def __init__(self):
+        self.samples = 0
+        self.result = None
+
+    def accept_waveform(self, sample_rate: int, waveform) -> None:
+        self.samples = len(waveform)
+
+
+class _FakeK2Model:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def create_stream(self):
+        return _FakeK2Stream()
+
+    def _decode(self, stream) -> None:
+        speech_ms = round(stream.samples / 16 - 1800, -2)
+        stream.result = _FakeStreamResult(f"長さ{int(speech_ms)}")
+
+    def decode_stream(self, stream) -> None:
+        self.batch_sizes.append(1)
+        self._decode(stream)
+
+    def decode_streams(self, streams) -> None:
+        self.batch_sizes.append(len(streams))
+        for stream in streams:
+            self._decode(stream)
+
+
+def _pcm(audio: AudioSegment):
+    import numpy as np
+
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32) / 32768.0
+    return samples, audio.frame_rate
+
+
+def test_transcribe_batch_pools_utterances_across_segments_and_maps_back():
+    from app.modules.ai_exam.service import ReazonTranscriber
+
+    def tone(duration_ms: int) -> AudioSegment:
+        return Sine(440).to_audio_segment(duration=duration_ms).apply_gain(-6).set_frame_rate(16000)
+
+    silence = AudioSegment.silent(duration=800, frame_rate=16000)
+    segment_a = silence + tone(600) + silence + tone(1000) + silence
+    segment_b = silence + tone(1400) + silence
+
+    transcriber = ReazonTranscriber(batch_size=8)
+    transcriber._model = _FakeK2Model()
+    transcriber._gender_classifier_attempted = True
+
+    results = transcriber.transcribe_batch([(*_pcm(segment_a), 10000), (*_pcm(segment_b), 70000)])
+
+    assert transcriber._model.batch_sizes == [3]
+    assert results[0]["raw_text"] == "長さ900長さ1300"
+    assert results[0]["timestamped_raw_text"] == "00:10: 長さ900\n00:12: 長さ1300"
+    assert results[1]["raw_text"] == "長さ1700"
+    assert results[1]["timestamped_raw_text"] == "01:10: 長さ1700"
+
+    serial = ReazonTranscriber(batch_size=8)
+    serial._model = _FakeK2Model()
+    serial._gender_classifier_attempted = True
+    with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
+        segment_a.export(tmp.name, format="wav")
+        single = serial.transcribe(Path(tmp.name).read_bytes(), base_offset_ms=10000)
+
+    assert serial._model.batch_sizes == [1, 1]
+    assert single["timestamped_raw_text"] == results[0]["timestamped_raw_text"]
+
+
+def test_gender_classifier_runs_once_per_speaker_turn_and_can_be_disabled():
+    from app.modules.ai_exam.service import ReazonTranscriber
+    from app.modules.ai_exam.speaker_gender import estimate_pitch_hz, gender_inference_stats
+
+    def voice(frequency: int, duration_ms: int) -> AudioSegment:
+        return (
+            Sine(frequency)
+            .to_audio_segment(duration=duration_ms)
+            .apply_gain(-6)
+            .set_frame_rate(16000)
+        )
+
+    silence = AudioSegment.silent(duration=800, frame_rate=16000)
+    segment = (
+        silence + voice(120, 600) + silence + voice(126, 900) + silence + voice(230, 1000) + silence
+    )
+    classifier_inputs = []
+
+    def fake_classifier(inputs, batch_size):
+        classifier_inputs.append(len(inputs))
+        return [
+            [
+                {
+                    "label": (
+                        "male"
+                        if estimate_pitch_hz(item["raw"], item["sampling_rate"]) < 165
+                        else "female"
+                    )
+                }
+            ]
+            for item in inputs
+        ]
+
+    def run(mode: str):
+        transcriber = ReazonTranscriber(batch_size=8)
+        transcriber._model = _FakeK2Model()
+        transcriber._gender_classifier_attempted = True
+        transcriber._gender_classifier = fake_classifier
+        before = gender_inference_stats.stats()
+        result = transcriber.transcribe_batch([(*_pcm(segment), 0)], gender_mode=mode)[0]
+        after = gender_inference_stats.stats()
+        counters = ("classifier_calls", "saved_by_turns", "skipped_disabled")
+        return result, {key: after[key] - before[key] for key in counters}
+
+    turns, turn_stats = run("turns")
+    assert classifier_inputs == [2]
+    assert turn_stats == {"classifier_calls": 2, "saved_by_turns": 1, "skipped_disabled": 0}
+    assert "女：長さ1300。" in turns["formatted_text"]
+
+    full, full_stats = run("full")
+    assert classifier_inputs == [2, 3]
+    assert full_stats == {"classifier_calls": 3, "saved_by_turns": 0, "skipped_disabled": 0}
+    assert full["formatted_text"] == turns["formatted_text"]
+
+    _, off_stats = run("off")
+    assert classifier_inputs == [2, 3]
+    assert off_stats == {"classifier_calls": 0, "saved_by_turns": 0, "skipped_disabled": 3}
+
+
+def test_vectorized_vad_matches_pydub_silence_detection():
+    import numpy as np
+    from pydub.silence import detect_nonsilent, split_on_silence
+
+    from app.modules.ai_exam.vad import dbfs, detect_nonsilent_ranges, pad_ranges, to_pcm16
+
+    rng = np.random.default_rng(7)
+    for sample_rate in (16000, 22050, 44100):
+        samples = (rng.standard_normal(sample_rate * 8) * 1e-3).astype(np.float32)
+        for start_sec, seconds, gain in (
+            (0.3, 1.2, 0.3),
+            (2.2, 0.25, 0.1),
+            (3.0, 0.9, 0.5),
+            (6.9, 1.1, 0.2),
+        ):
+            start = int(start_sec * sample_rate)
+            samples[start : start + int(seconds * sample_rate)] += gain * rng.standard_normal(
+                int(seconds * sample_rate)
+            )
+        pcm16 = to_pcm16(samples)
+        audio = AudioSegment(
+            data=pcm16.tobytes(), sample_width=2, frame_rate=sample_rate, channels=1
+        )
+        silence_thresh = audio.dBFS - 14
+
+        assert dbfs(pcm16) == audio.dBFS
+        ranges = detect_nonsilent_ranges(
+            pcm16, sample_rate, min_silence_len=400, silence_thresh=silence_thresh
+        )
+        assert ranges == detect_nonsilent(audio, min_silence_len=400, silence_thresh=silence_thresh)
+        assert len(ranges) == 4
+
+        chunks = split_on_silence(
+            audio, min_silence_len=400, silence_thresh=silence_thresh, keep_silence=150
+        )
+        assert [end - start for start, end in pad_ranges(ranges, 150, len(audio))] == [
+            len(chunk) for chunk in chunks
+        ]
+
+
+def test_segment_cache_reuses_transcripts_for_re_encoded_audio(tmp_path):
+    import numpy as np
+    import soxr
+
+    from app.modules.ai_exam.segment_cache import SegmentTranscriptCache
+    from app.modules.ai_exam.service import ReazonTranscriber
+
+    sample_rate = 16000
+
+    def speech(duration_ms: int, pitch: float):
+        t = np.arange(duration_ms * sample_rate // 1000) / sample_rate
+        phase = 2 * np.pi * pitch * (t + 0.02 * np.sin(2 * np.pi * 4 * t))
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 6)) * (
+            0.6 + 0.4 * np.sin(2 * np.pi * 5 * t)
+        )
+        return (0.2 * voiced).astype(np.float32)
+
+    def silence():
+        return np.zeros(800 * sample_rate // 1000, dtype=np.float32)
+
+    segment_a = np.concatenate(
+        [silence(), speech(600, 140), silence(), speech(1000, 210), silence()]
+    )
+    segment_b = np.concatenate(
+        [silence(), speech(1400, 120), silence(), speech(500, 230), silence()]
+    )
+    cache = SegmentTranscriptCache(tmp_path / "segments.sqlite3")
+
+    transcriber = ReazonTranscriber(batch_size=8, segment_cache=cache)
+    transcriber._model = _FakeK2Model()
+    transcriber._gender_classifier_attempted = True
+    first = transcriber.transcribe_batch(
+        [(segment_a, sample_rate, 10000), (segment_b, sample_rate, 70000)]
+    )
+    assert transcriber._model.batch_sizes == [4]
+    assert cache.stats()["entries"] == 2
+
+    # Re-encoding: different sample rate and a little noise.
+    reencoded_b = soxr.resample(segment_b, sample_rate, 22050)
+    reencoded_b += (
+        np.random.default_rng(3).standard_normal(len(reencoded_b)).astype(np.float32) * 1e-3
+    )
+    again = transcriber.transcribe_batch(
+        [(reencoded_b, 22050, 90000), (segment_a, sample_rate, 10000)]
+    )
+
+    assert transcriber._model.batch_sizes == [4]
+    assert cache.stats()["hits"] == 2
+    assert again[1] == first[0]
+    assert again[0]["raw_text"] == first[1]["raw_text"]
+    assert again[0]["timestamped_raw_text"].startswith("01:30: ")
+
+    off = transcriber.transcribe_batch([(segment_a, sample_rate, 10000)], gender_mode="off")
+    assert transcriber._model.batch_sizes == [4, 2]
+    assert off[0]["raw_text"] == first[0]["raw_text"]
+
+
+def test_segment_cache_evicts_least_recently_used_entries(tmp_path):
+    import numpy as np
+
+    from app.modules.ai_exam.segment_cache import SegmentTranscriptCache, segment_fingerprint
+
+    rng = np.random.default_rng(5)
+    fingerprints = [
+        segment_fingerprint(rng.standard_normal(8000 * 3).astype(np.float32), 8000)
+        for _ in range(3)
+    ]
+    cache = SegmentTranscriptCache(tmp_path / "segments.sqlite3", max_bytes=4_000)
+    for index, fingerprint in enumerate(fingerprints[:2]):
+        cache.put(fingerprint, "v", [(f"text{index}" * 300, "男", 0)])
+    assert cache.get(fingerprints[0], "v") is not None
+    assert cache.get(fingerprints[2], "v") is None
+
+    cache.put(fingerprints[2], "v", [("text2" * 300, "女", 0)])
+
+    assert cache.stats()["size_bytes"] <= 4_000
+    assert cache.get(fingerprints[1], "v") is None
+    assert cache.get(fingerprints[0], "v")[0][0].startswith("text0")
+    assert cache.get(fingerprints[2], "v")[0][1] == "女"
+
+
+def test_split_samples_returns_views_into_the_decoded_buffer():
+    import numpy as np
+
+    sample_rate = 8000
+    samples = np.zeros(sample_rate * 6, dtype=np.float32)
+    splitter = BellAudioSplitter(min_segment_length_ms=500, trim_before_next_bell_ms=100)
+    splitter.find_question_starts_in_samples = lambda _samples, _sr: [1000, 3500]
+
+    segments = splitter.split_samples(samples, sample_rate)
+
+    assert [(segment.start_ms, segment.end_ms) for segment in segments] == [
+        (1000, 3400),
+        (3500, 6000),
+    ]
+    assert all(np.shares_memory(segment.samples, samples) for segment in segments)
+    assert len(segments[0].samples) == 2400 * sample_rate // 1000
+    assert all(segment.audio_bytes == b"" for segment in segments)
+
+
+def test_streaming_bell_detection_matches_full_length_correlation():
+    import numpy as np
+
+    from app.modules.ai_exam.service import decode_audio
+
+    bell1, sample_rate = decode_audio(BELL_SOUND_PATH.read_bytes())
+    bell2, _ = decode_audio(BELL_2BAKU_PATH.read_bytes())
+    rng = np.random.default_rng(0)
+
+    def speech(seconds: float):
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        voice = 0.2 * np.sin(2 * np.pi * 300 * t) * np.sin(2 * np.pi * 3 * t)
+        return (voice + 0.02 * rng.standard_normal(len(t))).astype(np.float32)
+
+    parts = [speech(3)]
+    for index in range(8):
+        parts += [bell2 if index in (2, 5) else bell1, speech(14 + index)]
+    full_audio = np.concatenate(parts)
+
+    for block_sec in (30.0, 2.0):
+        splitter = BellAudioSplitter(detection_block_sec=block_sec)
+        reference = splitter._find_question_starts_full_length(full_audio, sample_rate)
+        streamed = splitter.find_question_starts_in_samples(full_audio, sample_rate)
+
+        assert len(reference) == 6
+        assert len(streamed) == len(reference)
+        assert all(abs(left - right) <= 5 for left, right in zip(streamed, reference))
+
+
+def test_bell_template_cache_reuses_templates_and_spectra_across_detections():
+    import numpy as np
+
+    from app.modules.ai_exam.bell_detection import BellTemplateCache
+    from app.modules.ai_exam.service import decode_audio
+
+    bell1, sample_rate = decode_audio(BELL_SOUND_PATH.read_bytes())
+    bell2, _ = decode_audio(BELL_2BAKU_PATH.read_bytes())
+    noise = 0.02 * np.random.default_rng(1).standard_normal(sample_rate * 12).astype(np.float32)
+    full_audio = np.concatenate(
+        [noise[: sample_rate * 2], bell1, noise, bell2, noise, bell1, noise]
+    )
+
+    cache = BellTemplateCache()
+    splitter = BellAudioSplitter(template_cache=cache)
+    first = splitter.find_question_starts_in_samples(full_audio, sample_rate)
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["misses"] == 2
+
+    second = splitter.find_question_starts_in_samples(full_audio, sample_rate)
+    stats = splitter.template_cache_stats()
+    assert second == first
+    assert len(first) == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["sample_rates"] == [splitter.detection_sample_rate]
+
+
+def test_process_pool_workers_can_start_without_the_segment_cache(monkeypatch):
+    from app.modules.ai_exam import service, transcription_pool
+
+    cache = object()
+    monkeypatch.setattr(service, "_load_segment_cache", lambda: cache)
+    monkeypatch.setattr(service.ReazonTranscriber, "_load_model", lambda self: None)
+    for name in transcription_pool.THREAD_ENV_VARS:
+        monkeypatch.setenv(name, "1")
+
+    transcription_pool._init_worker("reazonspeech-k2-v2", 4, 1, True)
+    assert transcription_pool._worker_transcriber.segment_cache is cache
+    transcription_pool._init_worker("reazonspeech-k2-v2", 4, 1, False)
+    assert transcription_pool._worker_transcriber.segment_cache is None
+    monkeypatch.setattr(transcription_pool, "_worker_transcriber", None)
+
+
+def test_process_pool_packs_segments_into_shared_memory_and_restores_order(monkeypatch):
+    import numpy as np
+
+    from app.modules.ai_exam import transcription_pool
+
+    class _EchoTranscriber:
+        def transcribe_batch(self, segments, gender_mode=None):
+            return [
+                {"raw_text": f"{len(samples)}@{sample_rate}+{offset}:{float(samples.sum()):.1f}"}
+                for samples, sample_rate, offset in segments
+            ]
+
+    monkeypatch.setattr(transcription_pool, "_worker_transcriber", _EchoTranscriber())
+    segments = [
+        (np.full(length, 0.5, dtype=np.float32), 16000, index * 1000)
+        for index, length in enumerate([30, 500, 70, 200])
+    ]
+
+    groups = transcription_pool.partition_by_length([len(samples) for samples, _, _ in segments], 2)
+    assert sorted(index for group in groups for index in group) == [0, 1, 2, 3]
+    assert groups == [[1], [0, 2, 3]]
+
+    shm, descriptors = transcription_pool.pack_segments(segments)
+    try:
+        results = [None] * len(segments)
+        for group in groups:
+            chunk = [descriptors[index] for index in group]
+            indexed_results, gender_delta = transcription_pool._transcribe_shared(shm.name, chunk)
+            assert gender_delta == dict.fromkeys(transcription_pool.GENDER_COUNTERS, 0)
+            for index, result in indexed_results:
+                results[index] = result
+    finally:
+        shm.close()
+        shm.unlink()
+
+    assert [result["raw_text"] for result in results] == [
+        "30@16000+0:15.0",
+        "500@16000+1000:250.0",
+        "70@16000+2000:35.0",
+        "200@16000+3000:100.0",
+    ]
+
+
+def test_enqueued_jobs_read_their_own_blob_and_leave_shared_content_alone(tmp_path, monkeypatch):
+    import hashlib
+    from types import SimpleNamespace
+
+    from app.core.celery_app import celery_app
+    from app.modules.ai_exam import tasks
+    from app.shared.blob_store import LocalBlobStore
+
+    store = LocalBlobStore(tmp_path)
+    monkeypatch.setattr(tasks, "get_blob_store", lambda: store)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+    upload = b"ID3 fake mp3 upload"
+    content_hash = hashlib.sha256(upload).hexdigest()
+    store.put(upload, key=content_hash)  # e.g. kept by another job or the clip cache
+    seen = []
+
+    async def fake_upload(path, filename, public_id=None):
+        seen.append(("upload", path))
+        return {"public_id": public_id, "format": "mp3"}
+
+    class _Service:
+        def generate(self, audio, filename, jlpt_level, *args, **kwargs):
+            seen.append(("generate", jlpt_level, audio.read()))
+            return SimpleNamespace(questions=[object()])
+
+    statuses = []
+
+    async def fake_update(cache_id, **fields):
+        statuses.append((cache_id, fields.get("status")))
+
+    monkeypatch.setattr(tasks, "upload_audio_bytes", fake_upload)
+    monkeypatch.setattr(tasks, "get_service", lambda: _Service())
+    monkeypatch.setattr(tasks, "_update_cache_status", fake_update)
+
+    for job_id, level in (("job-n3", "N3"), ("job-n2", "N2")):
+        tasks.enqueue_generate_exam(
+            upload,
+            job_id=job_id,
+            cache_id=f"cache-{job_id}",
+            content_hash=content_hash,
+            filename="listening.mp3",
+            jlpt_level=level,
+        )
+
+    uploads = [entry[1] for entry in seen if entry[0] == "upload"]
+    assert uploads == [
+        str(store.path(f"{content_hash}-job-n3")),
+        str(store.path(f"{content_hash}-job-n2")),
+    ]
+    assert [entry[1:] for entry in seen if entry[0] == "generate"] == [
+        ("N3", upload),
+        ("N2", upload),
+    ]
+    assert statuses[-1] == ("cache-job-n2", "completed")
+    assert not store.exists(f"{content_hash}-job-n3") and not store.exists(f"{content_hash}-job-n2")
+    assert store.exists(content_hash)
+
+    # The blob goes even when recording the failure fails too.
+    class _BrokenService:
+        def generate(self, *args, **kwargs):
+            raise RuntimeError("decode failed")
+
+    async def failing_update(cache_id, **fields):
+        if fields.get("status") == "failed":
+            raise RuntimeError("database is down")
+
+    monkeypatch.setattr(tasks, "get_service", lambda: _BrokenService())
+    monkeypatch.setattr(tasks, "_update_cache_status", failing_update)
+    tasks.enqueue_generate_exam(
+        upload,
+        job_id="job-broken",
+        cache_id="cache-job-broken",
+        content_hash=content_hash,
+        filename="listening.mp3",
+        jlpt_level="N1",
+    )
+    assert not store.exists(f"{content_hash}-job-broken")
+
+
+async def test_generate_cuts_question_clips_locally_and_merges_read_them_from_disk(
+    tmp_path, monkeypatch
+):
+    import httpx
+    import numpy as np
+
+    from urllib.parse import parse_qs, urlsplit
+
+    import cloudinary
+
+    from app.modules.ai_exam.clips import ClipMaterializer
+    from app.shared import audio_utils, clip_store
+    from app.shared.blob_store import LocalBlobStore
+
+    store = LocalBlobStore(tmp_path)
+    monkeypatch.setattr(clip_store, "get_clip_store", lambda: store)
+    monkeypatch.setattr(audio_utils, "get_clip_store", lambda: store)
+    monkeypatch.setattr(cloudinary.config(), "cloud_name", "demo", raising=False)
+
+    sample_rate = 16000
+    tone = (0.2 * np.sin(np.arange(sample_rate * 4) * 2 * np.pi * 440 / sample_rate)).astype(
+        np.float32
+    )
+    segments = _FakeSplitter().split_audio(b"")
+    for segment in segments:
+        segment.samples, segment.sample_rate = (
+            tone[: (segment.end_ms - segment.start_ms) * 16],
+            sample_rate,
+        )
+
+    splitter = _FakeSplitter()
+    splitter.split_audio = lambda audio_bytes, suffix=".mp3": segments
+    service = AIExamService.__new__(AIExamService)
+    service._splitter = splitter
+    service._reazon = _FakeReazon()
+    service._clip_materializer = ClipMaterializer(store, workers=2)
+    encoded = []
+    original_encode = service._clip_materializer.encode_mp3
+    service._clip_materializer.encode_mp3 = lambda *args: encoded.append(1) or original_encode(
+        *args
+    )
+
+    result = service.generate(
+        audio_bytes=b"full-audio", filename="sample.mp3", cloudinary_public_id="exam/abc"
+    )
+
+    urls = [question.audio_url for question in result.questions]
+    keys = [clip_store.local_clip_key(url) for url in urls]
+    assert all(urls) and all(keys)
+    # Stored host-relative, with the Cloudinary offset URL kept for the trimmer.
+    assert all(url.startswith("/api/ai/clips/") for url in urls)
+    sources = [parse_qs(urlsplit(url).query)["source"][0] for url in urls]
+    assert all("cloudinary.com" in source and "so_" in source for source in sources)
+    # Both segments hold the same samples, so they share one stored clip.
+    assert len(set(keys)) == 1 and len(encoded) == 1
+    rerun = service.generate(audio_bytes=b"full-audio", filename="sample.mp3")
+    assert len(encoded) == 1
+    assert all("?" not in question.audio_url for question in rerun.questions)
+
+    def no_network(request):
+        raise AssertionError(f"unexpected download of {request.url}")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(no_network)) as client:
+        merged = await audio_utils.merge_audio_files(urls, silence_duration=1, client=client)
+    pcm = await audio_utils.decode_to_pcm(merged)
+    assert abs(len(pcm) / (2 * audio_utils.MERGE_SAMPLE_RATE) - 9.0) < 0.5
@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.modules.ai_exam.models import AIExamCache
+from app.modules.ai_feedback.models import AIFeedback
+from app.modules.analytics.models import (
+    AnalyticsDailyLevel,
+    AnalyticsDailyQuality,
+    AnalyticsDailyRating,
+    AnalyticsRollupState,
+)
+from app.modules.analytics.rollup import refresh_daily_rollups
+from app.modules.analytics.service import AnalyticsService
+from app.modules.exam.models import Exam
+from app.modules.result.models import UserResult
+from app.modules.system_feedback.models import SystemFeedback
+from app.modules.users.models import User
+
+ROLLUP_MODELS = (
+    AnalyticsDailyLevel,
+    AnalyticsDailyRating,
+    AnalyticsDailyQuality,
+    AnalyticsRollupState,
+)
+
+
+async def _clear_rollups(db):
+    for model in ROLLUP_MODELS:
+        await db.execute(delete(model))
+    await db.commit()
+
+
+async def test_overview_reads_rollups_refreshed_incrementally_and_tops_up_today(db_session):
+    await _clear_rollups(db_session)
+    day1, day2 = datetime(2001, 3, 1, 9, 30), datetime(2001, 3, 2, 18, 0)
+    user = User(email="rollup@example.com", username="rollup", hashed_password="x")
+    n3 = Exam(title="[N3] rollup", is_published=True, created_at=day1)
+    n5 = Exam(title="[N5] rollup", is_published=True, created_at=day2)
+    draft = Exam(title="[N3] rollup draft", is_published=False, created_at=day2)
+    db_session.add_all([user, n3, n5, draft])
+    await db_session.flush()
+    cache = AIExamCache(
+        cache_key=f"rollup-{uuid4().hex}",
+        content_hash="r" * 64,
+        jlpt_level="N3",
+        ai_model="test",
+        pipeline_version="test",
+        status="completed",
+        result_json='{"confidence_error_score": 0.25}',
+        created_at=day1,
+    )
+    db_session.add_all(
+        [
+            UserResult(user_id=user.id, exam_id=n3.exam_id, completed_at=day1),
+            UserResult(user_id=user.id, exam_id=None, completed_at=day1),
+            UserResult(user_id=user.id, exam_id=n5.exam_id, completed_at=day2),
+            AIFeedback(content_id=uuid4(), user_id=user.id, rating_score=5, created_at=day1),
+            AIFeedback(content_id=uuid4(), user_id=user.id, rating_score=2, created_at=day2),
+            SystemFeedback(user_id=user.id, rating_score=4, created_at=day2),
+            cache,
+        ]
+    )
+    await db_session.commit()
+    user_id, exam_ids, cache_id = user.id, [n3.exam_id, n5.exam_id, draft.exam_id], cache.cache_id
+
+    factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    service = AnalyticsService()
+    start, end = datetime(2001, 3, 1), datetime(2001, 3, 3, 12, 0)
+    try:
+        live = await service.get_overview(db_session, start, end)
+        assert live.interaction_stats.total_takes == 3
+        assert live.exam_stats.total == 2
+
+        first = await refresh_daily_rollups(factory)
+        assert first.rebuilt and first.days >= 2
+        rolled = await db_session.get(AnalyticsDailyLevel, (day1.date(), "N3"))
+        assert (rolled.exams_published, rolled.takes) == (1, 1)
+        assert await db_session.get(AnalyticsDailyLevel, (day1.date(), "-")) is not None
+
+        # Whole days come from the rollups and give the same overview as the raw tables.
+        assert (
+            await service.get_overview(db_session, start, end)
+        ).model_dump() == live.model_dump()
+        n3_only = await service.get_overview(db_session, start, end, level_filter="N3")
+        assert (n3_only.exam_stats.total, n3_only.interaction_stats.total_takes) == (1, 1)
+        # A range starting mid-day reads that partial day live.
+        partial = await service.get_overview(db_session, datetime(2001, 3, 1, 12, 0), end)
+        assert (partial.interaction_stats.total_takes, partial.ai_quality_stats.average_rating) == (
+            1,
+            2.0,
+        )
+
+        # Edits show up once the next refresh re-rolls the touched day.
+        n5.is_published = False
+        await db_session.commit()
+        stale = await service.get_overview(db_session, start, end)
+        assert stale.exam_stats.total == 2
+        second = await refresh_daily_rollups(factory)
+        assert not second.rebuilt
+        assert (
+            await db_session.get(AnalyticsDailyLevel, (day2.date(), "N5"), populate_existing=True)
+        ).exams_unpublished == 1
+        fresh = await service.get_overview(db_session, start, end)
+        assert fresh.exam_stats.total == 1
+        assert {point.name: point.value for point in fresh.exam_stats.by_status}[
+            "Ngừng hoạt động"
+        ] == 2
+
+        # Retitling an exam moves its past takes, on other days than its creation, to the new level.
+        older = Exam(title="[N2] rollup", is_published=True, created_at=datetime(2001, 1, 15))
+        db_session.add(older)
+        await db_session.flush()
+        exam_ids.append(older.exam_id)
+        # A day holding nothing else, so only the exam's own results can re-roll it.
+        taken, later_end = datetime(2001, 3, 4, 10, 0), datetime(2001, 3, 5, 12, 0)
+        db_session.add(UserResult(user_id=user_id, exam_id=older.exam_id, completed_at=taken))
+        await db_session.commit()
+        await refresh_daily_rollups(factory, rebuild=True)
+        assert (
+            await service.get_overview(db_session, start, later_end, level_filter="N2")
+        ).interaction_stats.total_takes == 1
+        older.title = "[N1] rollup"
+        await db_session.commit()
+        await refresh_daily_rollups(factory)
+        for level, takes in (("N2", 0), ("N1", 1)):
+            overview = await service.get_overview(db_session, start, later_end, level_filter=level)
+            assert overview.interaction_stats.total_takes == takes
+
+        # Today is never rolled up; it is read live.
+        now = (await db_session.execute(select(func.localtimestamp()))).scalar_one()
+        window = (now - timedelta(days=2), now + timedelta(minutes=1))
+        before = (await service.get_overview(db_session, *window)).interaction_stats.total_takes
+        db_session.add(UserResult(user_id=user_id, exam_id=exam_ids[0]))
+        await db_session.commit()
+        after = await service.get_overview(db_session, *window)
+        assert after.interaction_stats.total_takes == before + 1
+        assert after.interaction_stats.over_time[-1].value >= 1
+    finally:
+        await db_session.rollback()
+        await _clear_rollups(db_session)
+        await db_session.execute(delete(AIExamCache).where(AIExamCache.cache_id == cache_id))
+        await db_session.execute(delete(UserResult).where(UserResult.user_id == user_id))
+        await db_session.execute(delete(Exam).where(Exam.exam_id.in_(exam_ids)))
+        await db_session.execute(delete(User).where(User.id == user_id))
+        await db_session.commit()
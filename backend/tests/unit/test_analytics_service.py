@@ -0,0 +1,128 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import delete
+
+from app.modules.ai_exam.models import AIExamCache
+from app.modules.ai_feedback.models import AIFeedback
+from app.modules.analytics.service import AnalyticsService
+from app.modules.exam.models import Exam
+from app.modules.result.models import UserResult
+from app.modules.system_feedback.models import SystemFeedback
+from app.modules.users.models import User
+
+
+def _points(points):
+    return {point.name: point.value for point in points}
+
+
+async def test_overview_is_aggregated_per_day_and_level(db_session):
+    # A window far from anything else the suite writes.
+    day1, day2 = datetime(2001, 3, 1, 9, 30), datetime(2001, 3, 2, 23, 59)
+    start, end = datetime(2001, 3, 1), datetime(2001, 3, 3)
+    user = User(email="analytics@example.com", username="analytics", hashed_password="x")
+    n3 = Exam(title="[N3] listening", is_published=True, created_at=day1)
+    n3_draft = Exam(title="N3 draft", is_published=False, created_at=day2)
+    n5 = Exam(title="Basics", description="for N5", is_published=True, created_at=day2)
+    other = Exam(title="Mixed practice", is_published=True, created_at=day2)
+    outside = Exam(title="[N3] old", is_published=True, created_at=datetime(2001, 2, 1))
+    db_session.add_all([user, n3, n3_draft, n5, other, outside])
+    await db_session.flush()
+
+    results = [
+        UserResult(user_id=user.id, exam_id=n3.exam_id, score=10, completed_at=day1),
+        UserResult(user_id=user.id, exam_id=n3.exam_id, score=20, completed_at=day2),
+        UserResult(user_id=user.id, exam_id=n5.exam_id, score=30, completed_at=day2),
+        UserResult(user_id=user.id, exam_id=None, score=40, completed_at=day1),
+        UserResult(
+            user_id=user.id, exam_id=n3.exam_id, score=50, completed_at=datetime(2001, 4, 1)
+        ),
+    ]
+    ai_feedback = [
+        AIFeedback(content_id=uuid4(), user_id=user.id, rating_score=score, created_at=day1)
+        for score in (5, 4, 4, 0)
+    ]
+    system_feedback = [
+        SystemFeedback(user_id=user.id, rating_score=score, created_at=day2) for score in (3, 5)
+    ]
+    caches = []
+    for index, (status, payload) in enumerate(
+        [
+            ("completed", {"confidence_error_score": 0.2}),
+            ("completed", {"confidence_error_score": "0.4"}),
+            ("completed", {"questions": []}),
+            ("completed", None),
+            ("failed", {"confidence_error_score": 0.9}),
+        ]
+    ):
+        cache = AIExamCache(
+            cache_key=f"analytics-{uuid4().hex}",
+            content_hash=f"{index:064d}",
+            jlpt_level="N3",
+            ai_model="test",
+            pipeline_version="test",
+            status=status,
+            created_at=day1,
+        )
+        cache.result_json = json.dumps(payload) if payload is not None else None
+        caches.append(cache)
+    db_session.add_all([*results, *ai_feedback, *system_feedback, *caches])
+    await db_session.commit()
+    user_id, exam_ids = user.id, [exam.exam_id for exam in (n3, n3_draft, n5, other, outside)]
+    cache_ids = [cache.cache_id for cache in caches]
+
+    try:
+        assert [cache.confidence_error_score for cache in caches] == [0.2, 0.4, None, None, 0.9]
+        service = AnalyticsService()
+
+        overview = await service.get_overview(db_session, start, end)
+        assert overview.exam_stats.total == 3
+        assert _points(overview.exam_stats.by_level) == {"N3": 1, "N5": 1, "Other": 1}
+        assert _points(overview.exam_stats.by_status) == {"Đang hoạt động": 3, "Ngừng hoạt động": 1}
+        assert _points(overview.exam_stats.created_over_time) == {
+            "2001-03-01": 1,
+            "2001-03-02": 2,
+            "2001-03-03": 0,
+        }
+        assert overview.interaction_stats.total_takes == 4
+        assert _points(overview.interaction_stats.over_time) == {
+            "2001-03-01": 2,
+            "2001-03-02": 2,
+            "2001-03-03": 0,
+        }
+
+        ai = overview.ai_quality_stats
+        assert ai.average_rating == 3.25  # the out-of-range rating still counts in the denominator
+        assert _points(ai.rating_distribution) == {
+            "1 Sao": 0,
+            "2 Sao": 0,
+            "3 Sao": 0,
+            "4 Sao": 2,
+            "5 Sao": 1,
+        }
+        assert ai.confidence_error == 0.3
+        assert ai.reliability_score == round(0.7 * 0.7 + 3.25 / 5 * 0.3, 4)
+        system = overview.system_quality_stats
+        assert (system.total_feedbacks, system.average_rating) == (2, 4.0)
+
+        filtered = await service.get_overview(db_session, start, end, level_filter="N3")
+        assert _points(filtered.exam_stats.by_level) == {"N3": 1}
+        assert _points(filtered.exam_stats.by_status) == {"Đang hoạt động": 1, "Ngừng hoạt động": 1}
+        assert filtered.interaction_stats.total_takes == 2
+
+        empty = await service.get_overview(
+            db_session, datetime(1999, 1, 1), datetime(1999, 1, 1, 12)
+        )
+        assert empty.exam_stats.by_level == [] and empty.interaction_stats.total_takes == 0
+        assert (
+            empty.ai_quality_stats.confidence_error,
+            empty.ai_quality_stats.reliability_score,
+        ) == (0.1, 0.9)
+    finally:
+        await db_session.rollback()
+        await db_session.execute(delete(AIExamCache).where(AIExamCache.cache_id.in_(cache_ids)))
+        await db_session.execute(delete(UserResult).where(UserResult.user_id == user_id))
+        await db_session.execute(delete(Exam).where(Exam.exam_id.in_(exam_ids)))
+        await db_session.execute(delete(User).where(User.id == user_id))
+        await db_session.commit()
@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import delete
+
+from app.modules.arena.leaderboard import ContestLeaderboard
+from app.modules.arena.models import Contest, ContestParticipant
+from app.modules.arena.service import ArenaService
+from app.modules.exam.models import Exam
+from app.modules.questions.models import Answer, Question
+from app.modules.result.models import UserResult
+from app.modules.users.models import User
+
+
+async def test_leaderboard_pages_and_ranks_from_the_materialized_index(db_session):
+    from app.modules.test.schemas import TestSubmissionAnswer, TestSubmitRequest
+
+    now = datetime.utcnow()
+    users = [
+        User(
+            email=f"arena{index}@example.com",
+            username=f"arena{index}",
+            hashed_password="x",
+            first_name=f"U{index}",
+        )
+        for index in range(6)
+    ]
+    exam = Exam(title="[N3] arena")
+    question = Question(question_number=1, difficulty=3)
+    question.answers = [
+        Answer(content="right", is_correct=True),
+        Answer(content="wrong", is_correct=False),
+    ]
+    exam.questions.append(question)
+    contest = Contest(
+        title="Weekly",
+        time_limit=30,
+        start_time=now - timedelta(hours=1),
+        end_time=now + timedelta(hours=1),
+        exam=exam,
+    )
+    other = Contest(
+        title="Other",
+        time_limit=30,
+        start_time=now - timedelta(hours=1),
+        end_time=now + timedelta(hours=1),
+        exam=exam,
+    )
+    db_session.add_all([*users, exam, contest, other])
+    await db_session.flush()
+
+    # (score, completed minutes ago); users[4] joined but has not submitted yet.
+    submitted = {0: (40.0, 5), 1: (55.5, 3), 2: (40.0, 9), 3: (12.25, 1), 5: (40.0, 9)}
+    for index, user in enumerate(users):
+        participant = ContestParticipant(
+            contest=contest, user_id=user.id, joined_at=now - timedelta(minutes=30 - index)
+        )
+        if index in submitted:
+            score, minutes = submitted[index]
+            participant.score, participant.completed_at = score, now - timedelta(minutes=minutes)
+        db_session.add(participant)
+    db_session.add(
+        ContestParticipant(contest=other, user_id=users[0].id, score=1.0, completed_at=now)
+    )
+    await db_session.commit()
+    ids = [user.id for user in users]
+    exam_id, contest_ids = exam.exam_id, [contest.contest_id, other.contest_id]
+
+    try:
+        board = ContestLeaderboard(db_session)
+        # Ties on score go to the earlier finisher, then the earlier joiner.
+        expected = [ids[1], ids[2], ids[5], ids[0], ids[3]]
+
+        assert [
+            entry.user_id for entry in await board.page(contest.contest_id, limit=10)
+        ] == expected
+        second_page = await board.page(contest.contest_id, limit=2, offset=2)
+        assert [(entry.user_id, entry.rank) for entry in second_page] == [(ids[5], 3), (ids[0], 4)]
+        assert second_page[0].display_name == "U5"
+        assert await board.size(contest.contest_id) == 5
+
+        for rank, user_id in enumerate(expected, start=1):
+            assert (await board.rank_of(contest.contest_id, user_id)).rank == rank
+        assert await board.rank_of(contest.contest_id, ids[4]) is None
+
+        tops = await board.top_many([contest.contest_id, other.contest_id], limit=2)
+        assert [entry.user_id for entry in tops[contest.contest_id]] == expected[:2]
+        assert [(entry.user_id, entry.rank) for entry in tops[other.contest_id]] == [(ids[0], 1)]
+        mine = await board.rank_many([contest.contest_id, other.contest_id], ids[0])
+        assert {contest_id: entry.rank for contest_id, entry in mine.items()} == {
+            contest.contest_id: 4,
+            other.contest_id: 1,
+        }
+
+        # Submitting places the participant on the board without reloading it.
+        service = ArenaService(db_session)
+        payload = TestSubmitRequest(
+            answers=[
+                TestSubmissionAnswer(
+                    question_id=question.question_id, answer_id=question.answers[0].answer_id
+                )
+            ]
+        )
+        response, submission = await service.submit_contest(contest.contest_id, payload, users[4])
+        assert submission.score == 60.0
+        assert response.leaderboard[0].user_id == ids[4]
+        assert response.my_entry.rank == 1
+        page = await service.get_leaderboard(contest.contest_id, users[3], offset=4, limit=5)
+        assert page.total == 6
+        assert [entry.rank for entry in page.entries] == [5, 6]
+        assert page.my_entry == page.entries[-1]
+    finally:
+        await db_session.rollback()
+        await db_session.execute(delete(Contest).where(Contest.contest_id.in_(contest_ids)))
+        await db_session.execute(delete(UserResult).where(UserResult.exam_id == exam_id))
+        await db_session.execute(delete(Exam).where(Exam.exam_id == exam_id))
+        await db_session.execute(delete(User).where(User.id.in_(ids)))
+        await db_session.commit()
+
+
+async def test_contest_paths_use_aggregates_and_load_the_exam_only_when_needed(db_session):
+    import pytest
+    from fastapi import HTTPException
+    from sqlalchemy import event, insert
+
+    from app.modules.test.schemas import TestExamDetailResponse, TestSubmitRequest
+
+    now = datetime.utcnow()
+    owner = User(email="arena-owner@example.com", username="arena-owner", hashed_password="x")
+    exam = Exam(title="[N2] profiles")
+    for number in range(1, 11):
+        question = Question(question_number=number, difficulty=2)
+        question.answers = [Answer(content=str(index), is_correct=index == 0) for index in range(4)]
+        exam.questions.append(question)
+    contest = Contest(
+        title="Big",
+        time_limit=30,
+        start_time=now,
+        end_time=now + timedelta(hours=1),
+        exam=exam,
+        max_participants=202,
+    )
+    db_session.add_all([owner, exam, contest])
+    await db_session.flush()
+    crowd = (
+        (
+            await db_session.execute(
+                insert(User).returning(User.id),
+                [
+                    {
+                        "email": f"crowd{n}@example.com",
+                        "username": f"crowd{n}",
+                        "hashed_password": "x",
+                    }
+                    for n in range(200)
+                ],
+            )
+        )
+        .scalars()
+        .all()
+    )
+    await db_session.execute(
+        insert(ContestParticipant).returning(ContestParticipant.user_id),
+        [{"contest_id": contest.contest_id, "user_id": user_id} for user_id in crowd],
+    )
+    await db_session.commit()
+    contest_id, exam_id, user_ids = contest.contest_id, exam.exam_id, [owner.id, *crowd]
+
+    statements = []
+    engine = db_session.bind.sync_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    service = ArenaService(db_session)
+    try:
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            summary = await service.get_contest(contest_id, owner)
+            summary_statements, statements[:] = list(statements), []
+            with pytest.raises(HTTPException) as not_joined:
+                await service.get_contest_exam_detail(contest_id, owner)
+            joined = await service.join_contest(contest_id, owner)
+            _, exam_payload = await service.get_contest_exam_detail(contest_id, owner)
+            statements[:] = []
+            _, cached_payload = await service.get_contest_exam_detail(contest_id, owner)
+            take_statements = list(statements)
+            _, submission = await service.submit_contest(contest_id, TestSubmitRequest(), owner)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert summary.participant_count == 200 and not summary.joined
+        assert not any(
+            "FROM questions" in sql or "FROM answers" in sql for sql in summary_statements
+        )
+        assert len(summary_statements) <= 5
+        assert not_joined.value.status_code == 403
+        assert joined.joined and joined.participant_count == 201
+        exam_detail = TestExamDetailResponse.model_validate_json(exam_payload)
+        assert len(exam_detail.questions) == 10 and exam_detail.time_limit == 30
+        assert cached_payload is exam_payload
+        assert not any("FROM questions" in sql or "FROM answers" in sql for sql in take_statements)
+        assert submission.total_questions == 10 and submission.score == 0.0
+
+        with pytest.raises(HTTPException) as missing:
+            await service.submit_contest(uuid4(), TestSubmitRequest(), owner)
+        assert missing.value.status_code == 404
+        with pytest.raises(HTTPException) as again:
+            await service.submit_contest(contest_id, TestSubmitRequest(), owner)
+        assert again.value.status_code == 400
+
+        late = User(email="arena-late@example.com", username="arena-late", hashed_password="x")
+        later = User(email="arena-later@example.com", username="arena-later", hashed_password="x")
+        db_session.add_all([late, later])
+        await db_session.commit()
+        user_ids += [late.id, later.id]
+        assert (await service.join_contest(contest_id, late)).participant_count == 202
+        with pytest.raises(HTTPException) as full:
+            await service.join_contest(contest_id, later)
+        assert full.value.detail == "Contest is full"
+    finally:
+        await db_session.rollback()
+        await db_session.execute(delete(Contest).where(Contest.contest_id == contest_id))
+        await db_session.execute(delete(UserResult).where(UserResult.exam_id == exam_id))
+        await db_session.execute(delete(Exam).where(Exam.exam_id == exam_id))
+        await db_session.execute(delete(User).where(User.id.in_(user_ids)))
+        await db_session.commit()
@@ -0,0 +1,123 @@
+import asyncio
+import io
+import wave
+
+import httpx
+import numpy as np
+import pytest
+
+from app.shared.audio_utils import MERGE_SAMPLE_RATE, decode_to_pcm, merge_audio_files
+
+
+def _wav_clip(seconds: float, sample_rate: int, frequency: float) -> bytes:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    samples = (0.3 * np.sin(2 * np.pi * frequency * t) * 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+async def test_merge_audio_files_downloads_concurrently_and_keeps_clip_order():
+    clips = {
+        "https://cdn.test/a.wav": _wav_clip(1.0, 16000, 440),
+        "https://cdn.test/b.wav": _wav_clip(0.5, 22050, 880),
+        "https://cdn.test/c.wav": _wav_clip(0.75, 44100, 220),
+    }
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(200, content=clips[str(request.url)])
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        merged = await merge_audio_files(
+            list(clips), silence_duration=1, client=client, max_concurrent_downloads=2
+        )
+
+    assert peak == 2
+    pcm = np.frombuffer(await decode_to_pcm(merged), dtype=np.int16)
+    assert abs(len(pcm) / MERGE_SAMPLE_RATE - (1.0 + 1 + 0.5 + 1 + 0.75)) < 0.1
+
+    # Gaps sit between clips in request order.
+    frame = MERGE_SAMPLE_RATE // 10
+    energy = [float(np.abs(pcm[i : i + frame]).mean()) for i in range(0, len(pcm) - frame, frame)]
+    silent = [value < 50 for value in energy]
+    assert not any(silent[1:9])
+    assert all(silent[11:19])
+    assert not any(silent[21:24])
+
+
+async def test_merge_audio_files_fails_when_a_clip_cannot_be_downloaded():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/missing.wav":
+            return httpx.Response(404)
+        return httpx.Response(200, content=_wav_clip(0.2, 16000, 440))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await merge_audio_files(
+                ["https://cdn.test/ok.wav", "https://cdn.test/missing.wav"],
+                client=client,
+            )
+
+
+async def test_merge_audio_files_reuses_cached_clips_and_skips_failed_ones(tmp_path):
+    from app.shared.clip_cache import PcmClipCache
+
+    clips = {
+        "https://cdn.test/a.wav": _wav_clip(0.5, 16000, 440),
+        "https://cdn.test/b.wav": _wav_clip(0.5, 16000, 660),
+    }
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        content = clips.get(str(request.url))
+        return httpx.Response(200, content=content) if content else httpx.Response(404)
+
+    cache = PcmClipCache(tmp_path)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        first = await merge_audio_files(
+            list(clips), silence_duration=1, client=client, clip_cache=cache
+        )
+        edited = ["https://cdn.test/a.wav", "https://cdn.test/gone.wav", "https://cdn.test/b.wav"]
+        second = await merge_audio_files(
+            edited,
+            silence_duration=1,
+            client=client,
+            clip_cache=cache,
+            output_format="mp3",
+            skip_failed=True,
+        )
+
+    assert requested == list(clips) + ["https://cdn.test/gone.wav"]
+    assert cache.stats()["hits"] == 2
+    first_pcm = await decode_to_pcm(first)
+    second_pcm = await decode_to_pcm(second)
+    assert abs(len(first_pcm) - len(second_pcm)) < MERGE_SAMPLE_RATE * 2 * 0.1
+
+
+def test_clip_cache_evicts_least_recently_used_clips(tmp_path):
+    from app.shared.clip_cache import PcmClipCache
+
+    cache = PcmClipCache(tmp_path, max_bytes=2500)
+    cache.put("https://cdn.test/a", b"a" * 1000)
+    cache.put("https://cdn.test/b", b"b" * 1000)
+    assert cache.get("https://cdn.test/a") == b"a" * 1000
+    cache.put("https://cdn.test/c", b"c" * 1000)
+
+    assert cache.get("https://cdn.test/b") is None
+    assert cache.stats()["size_bytes"] == 2000
+
+    reopened = PcmClipCache(tmp_path, max_bytes=2500)
+    assert reopened.stats()["entries"] == 2
+    assert reopened.get("https://cdn.test/c") == b"c" * 1000
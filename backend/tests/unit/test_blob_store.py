@@ -0,0 +1,32 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from app.modules.ai_exam.service import decode_audio, encode_wav
+from app.shared.blob_store import LocalBlobStore
+
+
+def test_blob_store_round_trips_uploads_through_a_memory_map(tmp_path):
+    samples = np.sin(np.linspace(0, 200, 8000, dtype=np.float32)) * 0.5
+    wav_bytes = encode_wav(samples, 8000)
+    store = LocalBlobStore(tmp_path)
+
+    key = store.put(wav_bytes)
+    assert key == hashlib.sha256(wav_bytes).hexdigest()
+    assert store.path(key) == tmp_path / key[:2] / key
+    assert store.put(b"ignored", key=key) == key
+    assert store.path(key).read_bytes() == wav_bytes
+
+    with store.open_mmap(key) as mapped:
+        decoded, sample_rate = decode_audio(mapped, ".wav")
+    assert sample_rate == 8000
+    assert np.allclose(decoded, samples, atol=1e-4)
+
+    with pytest.raises(ValueError):
+        store.path("../escape")
+    assert store.put(b"per job", key=f"{key}-job-1") == f"{key}-job-1"
+    store.delete(f"{key}-job-1")
+    assert store.path(key).read_bytes() == wav_bytes
+    store.delete(key)
+    assert not store.exists(key)
@@ -0,0 +1,40 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings, get_settings
+from app.modules.test import schemas as test_schemas
+from app.shared import clip_store
+
+KEY = "ab" * 32
+
+
+def test_local_clips_require_a_public_api_url():
+    with pytest.raises(ValidationError, match="PUBLIC_API_URL"):
+        Settings(AI_EXAM_LOCAL_CLIPS=True, PUBLIC_API_URL="")
+    assert Settings(AI_EXAM_LOCAL_CLIPS=True, PUBLIC_API_URL="https://api.test").AI_EXAM_LOCAL_CLIPS
+
+
+def test_clip_urls_are_stored_relative_and_served_absolute(monkeypatch):
+    monkeypatch.setattr(get_settings(), "PUBLIC_API_URL", "https://api.test/")
+    path = clip_store.clip_url(
+        KEY, source="https://res.cloudinary.com/x/video/upload/so_1.0,eo_2.0/a.mp3"
+    )
+    assert path.startswith(f"/api/ai/clips/{KEY}.mp3?source=https%3A%2F%2Fres.cloudinary.com")
+
+    public = clip_store.public_clip_url(path)
+    assert public == f"https://api.test{path}"
+    assert clip_store.local_clip_key(path) == clip_store.local_clip_key(public) == KEY
+    assert clip_store.local_clip_key(f"https://elsewhere.test/api/ai/clips/{KEY}.mp3") is None
+
+    # Clients get absolute URLs and send them back; the stored value stays relative.
+    question = test_schemas.TestQuestionResponse(
+        question_id=uuid.uuid4(), audio_clip_url=public, answers=[]
+    )
+    assert question.audio_clip_url == path
+    assert question.model_dump()["audio_clip_url"] == path
+    assert question.model_dump(mode="json")["audio_clip_url"] == public
+
+    other = "https://res.cloudinary.com/x/video/upload/a.mp3"
+    assert clip_store.public_clip_url(other) == clip_store.stored_clip_url(other) == other
@@ -0,0 +1,116 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, event
+
+from app.modules.exam.models import Exam
+from app.modules.questions.models import Answer, Question
+from app.modules.test.exam_cache import ExamPayloadCache, get_exam_payload_cache
+from app.modules.users.models import User
+
+
+async def test_cold_entries_are_built_once_for_concurrent_readers():
+    cache = ExamPayloadCache(max_bytes=64)
+    exam_id = uuid4()
+    calls = []
+
+    async def build():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b'{"v": 1}'
+
+    payloads = await asyncio.gather(*(cache.get_or_build(exam_id, "r1", build) for _ in range(20)))
+    assert payloads == [b'{"v": 1}'] * 20
+    assert len(calls) == 1
+    assert await cache.get_or_build(exam_id, "r1", build) == b'{"v": 1}'
+    assert await cache.get_or_build(exam_id, "r2", build) == b'{"v": 1}'
+    assert cache.stats()["builds"] == 2
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(cache.get_or_build(exam_id, "r3", failing) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await cache.get_or_build(exam_id, "r3", build) == b'{"v": 1}'
+
+    # Bounded by bytes: the oldest entry goes first.
+    for index in range(10):
+        cache.put(uuid4(), None, b"x" * 16)
+    assert cache.stats()["bytes"] <= 64
+    assert cache.get(exam_id, "r3") is None
+
+
+async def test_exam_payload_is_served_from_cache_until_a_question_or_answer_changes(db_session):
+    from app.modules.test.service import TestService
+
+    admin = User(
+        email="payload-admin@example.com",
+        username="payload-admin",
+        hashed_password="x",
+        role="admin",
+    )
+    learner = User(
+        email="payload-learner@example.com", username="payload-learner", hashed_password="x"
+    )
+    exam = Exam(title="[N4] payload", is_published=True)
+    for number in (2, 1):
+        question = Question(
+            mondai_group="Mondai 1", question_number=number, question_text=f"Q{number}"
+        )
+        question.answers = [
+            Answer(content=f"A{index}", is_correct=index == 0, order_index=index)
+            for index in range(3)
+        ]
+        exam.questions.append(question)
+    db_session.add_all([admin, learner, exam])
+    await db_session.commit()
+    exam_id, user_ids = exam.exam_id, [admin.id, learner.id]
+
+    service = TestService(db_session)
+    statements = []
+    engine = db_session.bind.sync_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    try:
+        first = await service.get_exam_detail_json(exam_id, learner)
+        body = json.loads(first)
+        assert [q["question_number"] for q in body["questions"]] == [1, 2]
+        assert "is_correct" not in body["questions"][0]["answers"][0]
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            assert await service.get_exam_detail_json(exam_id, learner) is first
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) == 1
+
+        answer = exam.questions[0].answers[1]
+        answer.content = "edited"
+        await db_session.commit()
+        edited = json.loads(await service.get_exam_detail_json(exam_id, learner))
+        assert "edited" in [a["content"] for q in edited["questions"] for a in q["answers"]]
+
+        exam.questions.append(Question(mondai_group="Mondai 2", question_number=1))
+        await db_session.commit()
+        grown = json.loads(await service.get_exam_detail_json(exam_id, learner))
+        assert grown["total_questions"] == 3
+
+        exam.is_published = False
+        await db_session.commit()
+        with pytest.raises(HTTPException) as forbidden:
+            await service.get_exam_detail_json(exam_id, learner)
+        assert forbidden.value.status_code == 403
+        assert (
+            json.loads(await service.get_exam_detail_json(exam_id, admin))["is_published"] is False
+        )
+        assert get_exam_payload_cache().stats()["entries"] >= 1
+    finally:
+        await db_session.rollback()
+        await db_session.execute(delete(Exam).where(Exam.exam_id == exam_id))
+        await db_session.execute(delete(User).where(User.id.in_(user_ids)))
+        await db_session.commit()
@@ -14,3 +14,93 @@ def test_irt_score_rewards_harder_correct_answers():
     assert harder > easier
     assert 0.0 <= easier <= 60.0
     assert 0.0 <= harder <= 60.0
+
+
+def test_vectorized_scorer_matches_the_scalar_reference_and_memoizes():
+    from tests.irt_reference import legacy_calculate_irt_score, random_submissions
+
+    from app.modules.test.irt import IRTScorer, response_signature
+
+    submissions = random_submissions(300, 25, seed=7) + [[], [(9, 1), (0, 0)], [(3, 1)] * 4]
+    scorer = IRTScorer()
+
+    batched = scorer.score_many(submissions)
+    assert batched == [legacy_calculate_irt_score(responses) for responses in submissions]
+    assert [scorer.score(responses) for responses in submissions] == batched
+
+    distinct = len({response_signature(responses) for responses in submissions})
+    assert scorer.cache_info()["entries"] == distinct
+    assert scorer.cache_info()["misses"] == distinct
+    # Order of responses does not matter, only the per-difficulty counts.
+    assert response_signature([(1, 1), (5, 0), (1, 0)]) == response_signature(
+        [(1, 0), (5, 0), (1, 1)]
+    )
+
+
+async def test_rescore_results_streams_and_updates_only_changed_scores(db_session):
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.modules.exam.models import Exam
+    from app.modules.questions.models import Answer, Question
+    from app.modules.result.models import UserResult
+    from app.modules.test.rescoring import rescore_results
+
+    exam = Exam(title="[N3] rescoring")
+    for number, difficulty in enumerate((1, 3, 5, 2), start=1):
+        question = Question(question_number=number, difficulty=difficulty)
+        question.answers = [
+            Answer(content="right", is_correct=True),
+            Answer(content="wrong", is_correct=False),
+        ]
+        exam.questions.append(question)
+    exam.questions.append(
+        Question(question_number=0, difficulty=5, answers=[Answer(is_correct=True)])
+    )
+    db_session.add(exam)
+    await db_session.flush()
+
+    scored = [q for q in exam.questions if q.question_number]
+    picks = [(1, 1, 0, 0), (0, 0, 1, 1), (1, 0, 1, None), (0, 0, 0, 0)]
+    results = []
+    for pick in picks:
+        answers = {
+            str(q.question_id): str(q.answers[choice].answer_id)
+            for q, choice in zip(scored, pick)
+            if choice is not None
+        }
+        results.append(UserResult(exam_id=exam.exam_id, score=-1.0, user_answers=answers))
+    # Legacy list-of-pairs format
+    results[1].user_answers = [
+        {"question_id": k, "answer_id": v} for k, v in results[1].user_answers.items()
+    ]
+    results[3].score = 60.0
+    db_session.add_all(results)
+    await db_session.commit()
+
+    expected = [
+        calculate_irt_score([(q.difficulty, int(choice == 0)) for q, choice in zip(scored, pick)])
+        for pick in picks
+    ]
+    factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    try:
+        dry = await rescore_results(factory, batch_size=2, exam_id=exam.exam_id, dry_run=True)
+        assert dry.as_dict() == {"scanned": 4, "rescored": 4, "changed": 3, "skipped": 0}
+        rows = (
+            await db_session.execute(
+                select(UserResult.score).where(UserResult.exam_id == exam.exam_id)
+            )
+        ).scalars()
+        assert sorted(rows) == [-1.0, -1.0, -1.0, 60.0]
+
+        stats = await rescore_results(factory, batch_size=2, exam_id=exam.exam_id)
+        assert stats.changed == 3
+        for result, score in zip(results, expected):
+            await db_session.refresh(result)
+            assert result.score == score
+        assert (await rescore_results(factory, batch_size=2, exam_id=exam.exam_id)).changed == 0
+    finally:
+        for result in results:
+            await db_session.delete(result)
+        await db_session.delete(exam)
+        await db_session.commit()
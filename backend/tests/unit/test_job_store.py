@@ -0,0 +1,65 @@
+import pytest
+
+from app.db.session import engine
+from app.modules.ai_exam.schemas import AIJobStatusResponse
+from app.modules.random_exam.schemas import RandomExamJobStatusResponse
+from app.shared import job_store
+from app.shared.job_store import JobRegistry, PostgresJobBackend
+
+
+async def test_job_registry_memory_backend_evicts_by_ttl_and_lru(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(job_store.time, "monotonic", lambda: clock[0])
+    backend = job_store.MemoryJobBackend(max_entries=2)
+    jobs = job_store.JobRegistry("ai_exam", AIJobStatusResponse, backend=backend, ttl_seconds=60)
+    photos = job_store.JobRegistry(
+        "ai_photos", AIJobStatusResponse, backend=backend, ttl_seconds=600
+    )
+
+    await jobs.put("a", AIJobStatusResponse(job_id="a", status="pending"))
+    stored = await jobs.get("a")
+    stored.status = "processing"
+    assert (await jobs.get("a")).status == "pending"
+    await jobs.put("a", stored)
+    assert (await jobs.get("a")).status == "processing"
+    assert await photos.get("a") is None
+
+    await photos.put("b", AIJobStatusResponse(job_id="b", status="pending"))
+    await jobs.get("a")
+    await photos.put("c", AIJobStatusResponse(job_id="c", status="pending"))
+    assert len(backend) == 2
+    assert await photos.get("b") is None
+    assert await jobs.get("a") is not None
+
+    clock[0] += 61
+    assert await jobs.get("a") is None
+    assert (await photos.get("c")).job_id == "c"
+    await photos.delete("c")
+    assert len(backend) == 0
+
+
+async def test_job_registry_postgres_backend_round_trips_and_expires():
+    if engine.url.get_backend_name() != "postgresql":
+        pytest.skip("Postgres job backend needs a PostgreSQL test database.")
+
+    backend = PostgresJobBackend(purge_every=2)
+    jobs = JobRegistry("random_exam", RandomExamJobStatusResponse, backend=backend, ttl_seconds=60)
+    job = RandomExamJobStatusResponse(
+        exam_id="e", job_id="j", status="processing", title="t", level="N3", total_questions=0
+    )
+    try:
+        await jobs.put("j", job)
+        job.status = "done"
+        job.mondai_summary = {"Mondai 1": 3}
+        await jobs.put("j", job)
+        assert (await jobs.get("j")).mondai_summary == {"Mondai 1": 3}
+
+        expired = JobRegistry(
+            "random_exam", RandomExamJobStatusResponse, backend=backend, ttl_seconds=-1
+        )
+        await expired.put("old", job)
+        assert await jobs.get("old") is None
+        await jobs.delete("j")
+        assert await jobs.get("j") is None
+    finally:
+        await engine.dispose()
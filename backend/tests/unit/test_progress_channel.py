@@ -0,0 +1,92 @@
+import threading
+
+import redis
+import redis.asyncio as aioredis
+
+from app.shared.progress_channel import (
+    InProcessProgressChannel,
+    RedisProgressChannel,
+    stream_job_events,
+)
+
+
+async def test_progress_channel_streams_thread_published_events_until_terminal():
+    channel = InProcessProgressChannel()
+    channel.publish("job-1", {"job_id": "job-1", "status": "pending", "progress_message": "queued"})
+
+    def run_pipeline():
+        for step in range(1, 4):
+            channel.publish(
+                "job-1",
+                {"job_id": "job-1", "status": "processing", "progress_message": f"Step {step}"},
+            )
+        channel.publish("job-1", {"job_id": "job-1", "status": "done", "progress_message": "Done!"})
+
+    received = []
+    pipeline = threading.Thread(target=run_pipeline)
+    async for event in stream_job_events(channel, "job-1", heartbeat_seconds=0.05):
+        if event is None:
+            if pipeline.ident is None:
+                pipeline.start()
+            continue
+        received.append(event["progress_message"])
+
+    assert received == ["queued", "Step 1", "Step 2", "Step 3", "Done!"]
+    assert channel.latest("job-1")["status"] == "done"
+    assert channel._subscribers == {}
+
+    async def load_snapshot():
+        return {"job_id": "job-2", "status": "failed", "progress_message": "Pipeline failed."}
+
+    events = [event async for event in stream_job_events(channel, "job-2", load_snapshot)]
+    assert [event["status"] for event in events] == ["failed"]
+
+
+async def test_redis_progress_channel_uses_the_async_client_on_the_event_loop(monkeypatch):
+    class _BlockingClient:
+        def __getattr__(self, name):
+            raise AssertionError(f"sync Redis call {name!r} on the event loop")
+
+    store = {}
+
+    class _AsyncPipeline:
+        def __init__(self):
+            self.commands = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def set(self, key, value, ex=None):
+            self.commands.append(("set", key, value))
+
+        def publish(self, channel, value):
+            self.commands.append(("publish", channel, value))
+
+        async def execute(self):
+            for command, key, value in self.commands:
+                if command == "set":
+                    store[key] = value.encode()
+
+    class _AsyncClient:
+        def pipeline(self):
+            return _AsyncPipeline()
+
+        async def get(self, key):
+            return store.get(key)
+
+    opened = []
+    monkeypatch.setattr(redis.Redis, "from_url", staticmethod(lambda url: _BlockingClient()))
+    monkeypatch.setattr(
+        aioredis.Redis, "from_url", staticmethod(lambda url: opened.append(url) or _AsyncClient())
+    )
+
+    channel = RedisProgressChannel("redis://example:6379/0")
+    assert await channel.latest_async("job-1") is None
+    await channel.publish_async(
+        "job-1", {"job_id": "job-1", "status": "processing", "progress_message": "Step 2"}
+    )
+    assert (await channel.latest_async("job-1"))["progress_message"] == "Step 2"
+    assert opened == ["redis://example:6379/0"]  # one client per event loop
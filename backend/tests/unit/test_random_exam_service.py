@@ -0,0 +1,187 @@
+import pytest
+
+from app.modules.exam.models import Exam, detect_jlpt_level
+from app.modules.questions.models import Answer, Question
+from app.modules.random_exam.question_bank import QuestionBankIndex
+from app.modules.random_exam.service import RandomExamService
+
+
+def test_detect_jlpt_level_reads_title_then_description():
+    assert detect_jlpt_level("JLPT [n2] 聴解 2023") == "N2"
+    assert detect_jlpt_level("(N3) Mock test", "N1 material") == "N3"
+    assert detect_jlpt_level("Mock test", "Level: N5") == "N5"
+    assert detect_jlpt_level("N10 A2N3 JN4", None) is None
+
+    exam = Exam(title="Listening N4")
+    assert exam.jlpt_level == "N4"
+    exam.title = "Listening"
+    exam.description = "for [N1]"
+    assert exam.jlpt_level == "N1"
+
+
+async def test_question_pool_is_filtered_and_grouped_in_sql(db_session):
+    def exam(title, published=True):
+        return Exam(title=title, is_published=published)
+
+    n3_a, n3_b, n2, draft = (
+        exam("Đề [N3] số 1"),
+        exam("(n3) mock"),
+        exam("N2 mock"),
+        exam("N3 draft", False),
+    )
+    questions = []
+    for source, groups in (
+        (n3_a, ["Mondai 1", "Mondai 1", "Mondai 2"]),
+        (n3_b, ["Mondai 1", None]),
+        (n2, ["Mondai 1"]),
+        (draft, ["Mondai 1"]),
+    ):
+        for number, group in enumerate(groups, start=1):
+            question = Question(
+                exam=source,
+                mondai_group=group,
+                question_number=number,
+                question_text=f"{source.title} {number}",
+            )
+            question.answers = [Answer(content="a", is_correct=True, order_index=0)]
+            questions.append(question)
+    db_session.add_all([n3_a, n3_b, n2, draft])
+    await db_session.flush()
+
+    service = RandomExamService(question_bank=QuestionBankIndex())
+    try:
+        assert await service.count_available_questions(db_session, "n3") == {
+            "Mondai 1": 3,
+            "Mondai 2": 1,
+            "Unknown": 1,
+        }
+        available = await service.get_available_questions(db_session, "N3")
+        assert {group: len(rows) for group, rows in available.items()} == {
+            "Mondai 1": 3,
+            "Mondai 2": 1,
+            "Unknown": 1,
+        }
+        assert {row.exam_id for row in available["Mondai 1"]} == {n3_a.exam_id, n3_b.exam_id}
+
+        ids = [questions[2].question_id, questions[0].question_id]
+        loaded = await service.load_questions(db_session, ids)
+        assert [q.question_id for q in loaded] == ids
+        assert [a.content for a in loaded[0].answers] == ["a"]
+
+        result = await service.generate_random_exam(
+            db_session,
+            "t",
+            None,
+            "N3",
+            [{"mondai_id": 1, "count": 2}, {"mondai_id": 2, "count": 1}],
+        )
+        assert result["mondai_summary"] == {"Mondai 1": 2, "Mondai 2": 1}
+        assert all(isinstance(q, Question) for q in result["questions"])
+
+        with pytest.raises(ValueError):
+            await service.generate_random_exam(
+                db_session, "t", None, "N3", [{"mondai_id": 2, "count": 2}]
+            )
+    finally:
+        await db_session.rollback()
+
+
+async def test_question_bank_index_applies_committed_writes_incrementally(db_session):
+    from sqlalchemy import delete
+
+    bank = QuestionBankIndex(ttl_seconds=3600)
+    service = RandomExamService(question_bank=bank)
+    first, second = Exam(title="[N1] A", is_published=True), Exam(title="[N1] B", is_published=True)
+    first.questions = [Question(mondai_group="Mondai 1", question_number=n) for n in (1, 2, 3)]
+    second.questions = [Question(mondai_group="Mondai 1", question_number=n) for n in (1, 2)]
+    db_session.add_all([first, second])
+    await db_session.commit()
+    try:
+        level = await bank.level(db_session, "N1")
+        assert level.counts == {"Mondai 1": 5}
+
+        first.questions.append(Question(mondai_group="Mondai 2", question_number=1))
+        await db_session.commit()
+        assert await bank.level(db_session, "n1") is level
+        assert level.counts == {"Mondai 1": 5, "Mondai 2": 1}
+
+        second.title = "[N2] B"
+        await db_session.commit()
+        assert await service.count_available_questions(db_session, "N1") == {
+            "Mondai 1": 3,
+            "Mondai 2": 1,
+        }
+        assert await service.count_available_questions(db_session, "N2") == {"Mondai 1": 2}
+
+        snapshot = {
+            number: {exam: list(refs) for exam, refs in by_exam.items()}
+            for number, by_exam in level.groups["Mondai 1"].items()
+        }
+        picked = service._select_from_buckets(level.groups["Mondai 1"], 10)
+        assert sorted(ref.question_number for ref in picked) == [1, 2, 3]
+        assert level.groups["Mondai 1"] == snapshot
+
+        await db_session.execute(
+            delete(Question).where(Question.exam_id == first.exam_id, Question.question_number == 3)
+        )
+        await db_session.commit()
+        rebuilt = await bank.level(db_session, "N1")
+        assert rebuilt is not level
+        assert rebuilt.counts == {"Mondai 1": 2, "Mondai 2": 1}
+    finally:
+        await db_session.delete(first)
+        await db_session.delete(second)
+        await db_session.commit()
+
+
+async def test_insert_exam_questions_writes_all_rows_in_two_statements(db_session):
+    from sqlalchemy import event, select
+    from sqlalchemy.orm import selectinload
+
+    from app.modules.questions.bulk import AnswerDraft, QuestionDraft, insert_exam_questions
+
+    exam = Exam(title="[N4] bulk")
+    db_session.add(exam)
+    await db_session.flush()
+    drafts = [
+        QuestionDraft(
+            mondai_group="Mondai 1",
+            question_number=number,
+            question_text=f"Q{number}",
+            answers=[AnswerDraft(content=f"A{index}", is_correct=index == 1) for index in range(4)],
+        )
+        for number in range(1, 51)
+    ]
+    drafts[0].answers[0].order_index = 7
+
+    statements = []
+    engine = db_session.bind.sync_engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        question_ids = await insert_exam_questions(db_session, exam.exam_id, drafts)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    try:
+        assert len(statements) == 2
+        assert len(question_ids) == 50
+        questions = (
+            (
+                await db_session.execute(
+                    select(Question)
+                    .where(Question.exam_id == exam.exam_id)
+                    .options(selectinload(Question.answers))
+                )
+            )
+            .scalars()
+            .all()
+        )
+        by_id = {q.question_id: q for q in questions}
+        assert [by_id[qid].question_number for qid in question_ids] == list(range(1, 51))
+        first = by_id[question_ids[0]]
+        assert sorted(a.order_index for a in first.answers) == [1, 2, 3, 7]
+        assert [a.is_correct for a in by_id[question_ids[1]].answers] == [False, True, False, False]
+        assert first.hide_question_text is False
+    finally:
+        await db_session.rollback()
@@ -21,6 +21,7 @@ export interface ArenaContest {
   joined_at?: string | null
   result_id?: string | null
   leaderboard: ArenaLeaderboardEntry[]
+  my_entry?: ArenaLeaderboardEntry | null
   created_at: string
   updated_at: string
 }
@@ -35,6 +36,15 @@ export interface ArenaLeaderboardEntry {
   joined_at: string
 }
 
+export interface ArenaLeaderboardPage {
+  contest_id: string
+  total: number
+  offset: number
+  limit: number
+  entries: ArenaLeaderboardEntry[]
+  my_entry?: ArenaLeaderboardEntry | null
+}
+
 export interface ArenaContestCreatePayload {
   title: string
   description?: string
@@ -107,6 +117,11 @@ export const arenaClient = {
       handleResponse<ArenaContest>(response)
     ),
 
+  getLeaderboard: (contestId: string, offset = 0, limit = 50) =>
+    apiFetch(`${API_BASE}/api/arena/contests/${contestId}/leaderboard?offset=${offset}&limit=${limit}`).then(
+      (response) => handleResponse<ArenaLeaderboardPage>(response)
+    ),
+
   createContest: (payload: ArenaContestCreatePayload) =>
     apiFetch(`${API_BASE}/api/arena/contests`, {
       method: 'POST',
@@ -34,6 +34,7 @@ import { examClient } from './api/examClient'
 import AIPhotoGenerator from './components/AIPhotoGenerator'
 import { AIFeedbackModal } from '@/components/AIFeedbackModal'
 import { toast } from '@/hooks/use-toast'
+import { clipSourceUrl } from '@/lib/utils'
 import { useAuth } from '@/context/AuthContext'
 
 // ─── Types ──────────────────────────────────────────────────────────────────
@@ -880,7 +881,7 @@ function Step3Review({ editableQuestions, setEditableQuestions, audioFile }: Ste
     }
 
     // Try replace so_ and eo_ in Cloudinary URLs
-    let newUrl = q.audio_url
+    let newUrl = clipSourceUrl(q.audio_url)
     if (newUrl.includes('cloudinary.com')) {
       if (/so_[\d.]+/.test(newUrl)) {
         newUrl = newUrl.replace(/so_[\d.]+/, `so_${start}`)
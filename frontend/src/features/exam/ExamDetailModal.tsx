@@ -7,6 +7,7 @@ import {
 import { examClient, ExamResponse, QuestionResponse, AnswerResponse } from './api/examClient'
 import AIPhotoGenerator from './components/AIPhotoGenerator'
 import { toast } from '@/hooks/use-toast'
+import { clipSourceUrl } from '@/lib/utils'
 import { useAuthState } from '@/context/AuthContext'
 
 interface Props {
@@ -85,9 +86,11 @@ function InlineAudioTrimmer({
  onSave: (url: string) => void;
  onCancel: () => void;
 }) {
+ const sourceUrl = initialUrl ? clipSourceUrl(initialUrl) : null;
+
  const getBaseUrl = () => {
- if (!initialUrl) return null;
- let base = initialUrl;
+ if (!sourceUrl) return null;
+ let base = sourceUrl;
  base = base.replace(/so_[\d.]+,?/, '');
  base = base.replace(/eo_[\d.]+,?/, '');
  base = base.replace('upload//', 'upload/');
@@ -95,8 +98,8 @@ function InlineAudioTrimmer({
  }
 
  const extractTime = (type: 'so' | 'eo') => {
- if (!initialUrl) return 0;
- const match = initialUrl.match(new RegExp(`${type}_([\\d.]+)`));
+ if (!sourceUrl) return 0;
+ const match = sourceUrl.match(new RegExp(`${type}_([\\d.]+)`));
  return match ? parseFloat(match[1]) : 0;
  }
 
@@ -161,11 +164,11 @@ function InlineAudioTrimmer({
  toast({ title: 'Lỗi', description: 'Audio gốc không hợp lệ', variant: 'destructive' });
  return;
  }
- let newUrl = baseUrl;
- if (newUrl.includes('cloudinary.com')) {
- newUrl = newUrl.replace('/upload/', `/upload/eo_${end},so_${start}/`);
+ if (!baseUrl.includes('cloudinary.com')) {
+ toast({ title: 'Thất bại', description: 'Tính năng cắt âm thanh chỉ hỗ trợ audio Cloudinary.', variant: 'destructive' });
+ return;
  }
- onSave(newUrl);
+ onSave(baseUrl.replace('/upload/', `/upload/eo_${end},so_${start}/`));
  }
 
  return (
@@ -4,3 +4,13 @@ import { twMerge } from 'tailwind-merge'
 export function cn(...inputs: ClassValue[]) {
  return twMerge(clsx(inputs))
 }
+
+// Locally cut AI clips keep the Cloudinary offset URL they replace as `?source=`.
+export function clipSourceUrl(url: string): string {
+ if (!url.includes('/ai/clips/')) return url
+ try {
+ return new URL(url, window.location.origin).searchParams.get('source') || url
+ } catch {
+ return url
+ }
+}